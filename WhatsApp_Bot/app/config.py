@@ -9,6 +9,18 @@ SYSTEM_PROMPT_PATH = BASE_DIR / "system_role.md"
 DEFAULT_MODEL = "openai/gpt-4o-mini"
 DEFAULT_TEMPERATURE = 0.4
 DEFAULT_META_API_VERSION = "v19.0"
+DEFAULT_META_GRAPH_BASE_URL = "https://graph.facebook.com"
+DEFAULT_OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_WORKER_COUNT = 4
+DEFAULT_MAX_QUEUED = 1000
+DEFAULT_MAX_QUEUED_PER_SENDER = 20
+DEFAULT_CONTEXT_STORE = "memory"
+DEFAULT_CONTEXT_DB_PATH = BASE_DIR / "bot_state.sqlite3"
+DEFAULT_CONTEXT_MAX_ENTRIES = 10000
+DEFAULT_CONTEXT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_CONTEXT_SWEEP_SECONDS = 60
+# Meta keeps retrying an unacknowledged webhook for up to seven days.
+DEFAULT_DEDUP_WINDOW_SECONDS = 7 * 24 * 3600
 
 
 def _read_system_prompt(file_path: Path) -> str:
@@ -66,5 +78,76 @@ def get_meta_api_version() -> str:
     return version
 
 
+def get_meta_graph_base_url() -> str:
+    # Overridable so load tests can point the bot at a local mock of the Graph API.
+    return (os.getenv("META_GRAPH_BASE_URL", "").strip() or DEFAULT_META_GRAPH_BASE_URL).rstrip("/")
+
+
+def get_openrouter_base_url() -> str:
+    return (os.getenv("OPENROUTER_BASE_URL", "").strip() or DEFAULT_OPENROUTER_BASE_URL).rstrip("/")
+
+
+def _read_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return max(0, int(raw))
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer") from exc
+
+
+def get_worker_count() -> int:
+    """Threads processing webhook messages; 0 processes them inline before acking."""
+    return _read_int("BOT_WORKERS", DEFAULT_WORKER_COUNT)
+
+
+def get_max_queued() -> int:
+    return _read_int("BOT_MAX_QUEUED", DEFAULT_MAX_QUEUED)
+
+
+def get_max_queued_per_sender() -> int:
+    return _read_int("BOT_MAX_QUEUED_PER_SENDER", DEFAULT_MAX_QUEUED_PER_SENDER)
+
+
+def get_context_store_backend() -> str:
+    backend = (os.getenv("BOT_CONTEXT_STORE", "").strip() or DEFAULT_CONTEXT_STORE).lower()
+    if backend not in {"memory", "sqlite"}:
+        raise ValueError("BOT_CONTEXT_STORE must be 'memory' or 'sqlite'")
+    return backend
+
+
+def get_context_db_path() -> str:
+    return os.getenv("BOT_CONTEXT_DB_PATH", "").strip() or str(DEFAULT_CONTEXT_DB_PATH)
+
+
+def get_context_max_entries() -> int:
+    return _read_int("BOT_CONTEXT_MAX_ENTRIES", DEFAULT_CONTEXT_MAX_ENTRIES)
+
+
+def get_context_ttl_seconds() -> int:
+    return _read_int("BOT_CONTEXT_TTL_SECONDS", DEFAULT_CONTEXT_TTL_SECONDS)
+
+
+def get_context_sweep_seconds() -> int:
+    """Seconds between idle-context sweeps; 0 disables the sweeper."""
+    return _read_int("BOT_CONTEXT_SWEEP_SECONDS", DEFAULT_CONTEXT_SWEEP_SECONDS)
+
+
+def get_dedup_store_backend() -> str:
+    backend = (os.getenv("BOT_DEDUP_STORE", "").strip() or get_context_store_backend()).lower()
+    if backend not in {"memory", "sqlite"}:
+        raise ValueError("BOT_DEDUP_STORE must be 'memory' or 'sqlite'")
+    return backend
+
+
+def get_dedup_db_path() -> str:
+    return os.getenv("BOT_DEDUP_DB_PATH", "").strip() or get_context_db_path()
+
+
+def get_dedup_window_seconds() -> int:
+    return _read_int("BOT_DEDUP_WINDOW_SECONDS", DEFAULT_DEDUP_WINDOW_SECONDS)
+
+
 def get_meta_verify_token() -> Optional[str]:
     return os.getenv("META_WHATSAPP_VERIFY_TOKEN")
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+Factory = Callable[[], Any]
+Encoder = Callable[[Any], bytes]
+Decoder = Callable[[bytes], Any]
+
+# Contexts measured per sweep to estimate the memory they hold.
+SIZE_SAMPLE = 200
+
+
+def approximate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Bytes held by `obj` and everything it references (containers, dataclasses)."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_size(key, seen) + approximate_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(approximate_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += approximate_size(vars(obj), seen)
+    return size
+
+
+def _estimate_size(contexts: List[Any]) -> int:
+    if not contexts:
+        return 0
+    sample = random.sample(contexts, min(SIZE_SAMPLE, len(contexts)))
+    try:
+        measured = sum(approximate_size(context) for context in sample)
+    except RuntimeError:
+        # A worker resized a context's dict mid-walk; the next sweep measures again.
+        return -1
+    return measured * len(contexts) // len(sample)
+
+
+class ContextStore(Protocol):
+    def get(self, sender: str) -> Any: ...
+
+    def save(self, sender: str, context: Any) -> None: ...
+
+    def __len__(self) -> int: ...
+
+    def sweep(self) -> None: ...
+
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class MemoryContextStore:
+    """Live contexts in process memory, least recently used first out.
+
+    A context not touched for `ttl_seconds` is dropped and the sender starts over.
+    """
+
+    def __init__(self, factory: Factory, max_entries: int = 10000, ttl_seconds: float = 7 * 86400) -> None:
+        self._factory = factory
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evicted = 0
+        self._memory_bytes = 0
+
+    def get(self, sender: str) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(sender)
+            if entry is None or now - entry[1] > self.ttl_seconds:
+                context = self._factory()
+            else:
+                context = entry[0]
+            self._entries[sender] = (context, now)
+            self._entries.move_to_end(sender)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evicted += 1
+        return context
+
+    def save(self, sender: str, context: Any) -> None:
+        with self._lock:
+            self._entries[sender] = (context, time.monotonic())
+            self._entries.move_to_end(sender)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sweep(self) -> None:
+        """Drop contexts idle past the TTL (oldest first) and re-measure memory use."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        with self._lock:
+            while self._entries:
+                sender, (_, touched) = next(iter(self._entries.items()))
+                if touched > cutoff:
+                    break
+                del self._entries[sender]
+                self._evicted += 1
+            live = [context for context, _ in self._entries.values()]
+        size = _estimate_size(live)
+        if size >= 0:
+            self._memory_bytes = size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "contexts": len(self._entries),
+            "max_contexts": self.max_entries,
+            "evicted": self._evicted,
+            "memory_bytes": self._memory_bytes,
+        }
+
+
+class SqliteContextStore:
+    """Serialized contexts in a SQLite file shared by every bot process on the host.
+
+    Survives restarts and lets gunicorn workers pick up each other's conversations.
+    Decoded contexts are kept in a read-through LRU of `max_cached` senders; a cached
+    one is reused only while its row version is unchanged, so an update written by
+    another worker is reloaded. Rows older than `ttl_seconds` are treated as absent.
+    Database and encoding errors are logged and degrade to the cached (or a fresh)
+    context; `save` never raises, so a failed write cannot drop the replies.
+
+    Writes are not coordinated between processes: the work queue serializes each
+    sender within a worker, but if two workers handle the same sender at once,
+    the later `save` wins and the other turn's context changes are lost.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        factory: Factory,
+        encode: Encoder,
+        decode: Decoder,
+        max_cached: int = 1000,
+        ttl_seconds: float = 7 * 86400,
+    ) -> None:
+        self._factory = factory
+        self._encode = encode
+        self._decode = decode
+        self.max_cached = max(1, max_cached)
+        self.ttl_seconds = ttl_seconds
+        # sender -> (context, row version, last used on the monotonic clock)
+        self._cache: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._path = path
+        self._expired = 0
+        self._memory_bytes = 0
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_contexts (
+                sender TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                version INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS user_contexts_updated_at ON user_contexts (updated_at)")
+
+    def get(self, sender: str) -> Any:
+        with self._lock:
+            cached = self._cache.get(sender)
+            try:
+                # Only ship the blob when the cached copy is missing or outdated.
+                row = self._conn.execute(
+                    """
+                    SELECT version, updated_at, CASE WHEN version = ? THEN NULL ELSE data END
+                    FROM user_contexts WHERE sender = ?
+                    """,
+                    (cached[1] if cached else -1, sender),
+                ).fetchone()
+            except sqlite3.Error as exc:
+                logger.warning("Context store read failed for %s: %s", sender, exc)
+                return cached[0] if cached else self._remember(sender, self._factory(), 0)
+
+            if row is None and cached is not None and cached[1] == 0:
+                # Created here and not saved yet.
+                return cached[0]
+            if row is None or time.time() - row[1] > self.ttl_seconds:
+                return self._remember(sender, self._factory(), 0)
+            version, _, data = row
+            if data is None:
+                return self._remember(sender, cached[0], version)
+            try:
+                context = self._decode(bytes(data))
+            except (ValueError, TypeError, KeyError) as exc:
+                logger.warning("Discarding unreadable context for %s: %s", sender, exc)
+                context, version = self._factory(), 0
+            return self._remember(sender, context, version)
+
+    def save(self, sender: str, context: Any) -> None:
+        try:
+            data = self._encode(context)
+        except (TypeError, ValueError) as exc:
+            logger.warning("Context for %s could not be encoded, not saved: %s", sender, exc)
+            return
+        with self._lock:
+            try:
+                self._conn.execute(
+                    """
+                    INSERT INTO user_contexts (sender, data, version, updated_at) VALUES (?, ?, 1, ?)
+                    ON CONFLICT (sender) DO UPDATE SET
+                        data = excluded.data,
+                        version = user_contexts.version + 1,
+                        updated_at = excluded.updated_at
+                    """,
+                    (sender, sqlite3.Binary(data), time.time()),
+                )
+                version = self._conn.execute(
+                    "SELECT version FROM user_contexts WHERE sender = ?", (sender,)
+                ).fetchone()[0]
+            except sqlite3.Error as exc:
+                logger.warning("Context store write failed for %s: %s", sender, exc)
+                return
+            self._remember(sender, context, version)
+
+    def __len__(self) -> int:
+        try:
+            with self._lock:
+                return self._conn.execute("SELECT COUNT(*) FROM user_contexts").fetchone()[0]
+        except sqlite3.Error:
+            return len(self._cache)
+
+    def sweep(self) -> None:
+        """Delete rows idle past the TTL, drop idle decoded copies and re-measure the rest."""
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    "DELETE FROM user_contexts WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Context store sweep failed: %s", exc)
+        else:
+            self._expired += max(cursor.rowcount, 0)
+        cutoff = time.monotonic() - self.ttl_seconds
+        with self._lock:
+            while self._cache and next(iter(self._cache.values()))[2] <= cutoff:
+                self._cache.popitem(last=False)
+            live = [entry[0] for entry in self._cache.values()]
+        size = _estimate_size(live)
+        if size >= 0:
+            self._memory_bytes = size
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            db_bytes: Optional[int] = os.path.getsize(self._path)
+        except OSError:
+            db_bytes = None
+        return {
+            "backend": "sqlite",
+            "contexts": len(self),
+            "cached_contexts": len(self._cache),
+            "max_cached": self.max_cached,
+            "expired": self._expired,
+            "memory_bytes": self._memory_bytes,
+            "db_bytes": db_bytes,
+        }
+
+    def _remember(self, sender: str, context: Any, version: int) -> Any:
+        self._cache[sender] = (context, version, time.monotonic())
+        self._cache.move_to_end(sender)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return context
+
+
+def start_sweeper(store: ContextStore, interval_seconds: float) -> threading.Event:
+    """Sweep `store` every `interval_seconds` on a daemon thread until the returned event is set."""
+    stop = threading.Event()
+
+    def run() -> None:
+        while not stop.wait(interval_seconds):
+            try:
+                store.sweep()
+            except Exception:
+                logger.exception("Context sweep failed")
+
+    threading.Thread(target=run, name="bot-context-sweeper", daemon=True).start()
+    return stop
+
+
+def build_context_store(
+    backend: str,
+    factory: Factory,
+    encode: Encoder,
+    decode: Decoder,
+    *,
+    max_entries: int,
+    ttl_seconds: float,
+    path: Optional[str] = None,
+) -> ContextStore:
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("a database path is required for the sqlite context store")
+        return SqliteContextStore(path, factory, encode, decode, max_cached=max_entries, ttl_seconds=ttl_seconds)
+    return MemoryContextStore(factory, max_entries=max_entries, ttl_seconds=ttl_seconds)
+
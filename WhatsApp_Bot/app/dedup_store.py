@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Expired ids are purged from SQLite once every this many claims.
+PURGE_EVERY = 1000
+
+
+class DedupStore(Protocol):
+    def claim(self, message_id: str) -> bool:
+        """Record `message_id`; True only for the first caller within the window."""
+        ...
+
+    def release(self, message_id: str) -> None:
+        """Forget a claim so a redelivery of the message is processed."""
+        ...
+
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class MemoryDedupStore:
+    """Message ids seen by this process in the last `window_seconds`, at most `max_entries`."""
+
+    def __init__(self, window_seconds: float = 7 * 86400, max_entries: int = 50000) -> None:
+        self.window_seconds = window_seconds
+        self.max_entries = max(1, max_entries)
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, message_id: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            # Insertion order is claim order, so expired ids are at the front.
+            cutoff = now - self.window_seconds
+            while self._seen and (len(self._seen) >= self.max_entries or next(iter(self._seen.values())) < cutoff):
+                self._seen.popitem(last=False)
+            if message_id in self._seen:
+                return False
+            self._seen[message_id] = now
+            return True
+
+    def release(self, message_id: str) -> None:
+        with self._lock:
+            self._seen.pop(message_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "tracked_ids": len(self._seen)}
+
+
+class SqliteDedupStore:
+    """Message ids in a SQLite file shared by every bot process on the host.
+
+    A claim is a single upsert on the primary key, so two workers receiving the
+    same Meta retry cannot both win it, and ids survive restarts. If the database
+    is unavailable, claims fall back to a per-process memory store rather than
+    dropping messages.
+    """
+
+    def __init__(self, path: str, window_seconds: float = 7 * 86400) -> None:
+        self.window_seconds = window_seconds
+        self._fallback = MemoryDedupStore(window_seconds)
+        self._lock = threading.Lock()
+        self._claims = 0
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS processed_messages (
+                message_id TEXT PRIMARY KEY,
+                seen_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS processed_messages_seen_at ON processed_messages (seen_at)")
+
+    def claim(self, message_id: str) -> bool:
+        now = time.time()
+        cutoff = now - self.window_seconds
+        try:
+            with self._lock:
+                # Inserts a new id, or takes over one whose window has passed.
+                cursor = self._conn.execute(
+                    """
+                    INSERT INTO processed_messages (message_id, seen_at) VALUES (?, ?)
+                    ON CONFLICT (message_id) DO UPDATE SET seen_at = excluded.seen_at
+                    WHERE processed_messages.seen_at < ?
+                    """,
+                    (message_id, now, cutoff),
+                )
+                self._claims += 1
+                if self._claims % PURGE_EVERY == 0:
+                    self._conn.execute("DELETE FROM processed_messages WHERE seen_at < ?", (cutoff,))
+        except sqlite3.Error as exc:
+            logger.warning("Dedup store unavailable, using in-process ids: %s", exc)
+            return self._fallback.claim(message_id)
+        return cursor.rowcount == 1
+
+    def release(self, message_id: str) -> None:
+        self._fallback.release(message_id)
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM processed_messages WHERE message_id = ?", (message_id,))
+        except sqlite3.Error as exc:
+            logger.warning("Dedup store release failed for %s: %s", message_id, exc)
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            with self._lock:
+                tracked: Optional[int] = self._conn.execute("SELECT COUNT(*) FROM processed_messages").fetchone()[0]
+        except sqlite3.Error:
+            tracked = None
+        return {"backend": "sqlite", "tracked_ids": tracked}
+
+
+def build_dedup_store(backend: str, *, window_seconds: float, path: Optional[str] = None) -> DedupStore:
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("a database path is required for the sqlite dedup store")
+        return SqliteDedupStore(path, window_seconds)
+    return MemoryDedupStore(window_seconds)
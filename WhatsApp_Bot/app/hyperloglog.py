@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import hashlib
+import math
+
+
+class HyperLogLog:
+    """Approximate distinct counter in a fixed `2 ** precision` bytes.
+
+    The default precision (12) uses 4 KiB however many phone numbers are added,
+    with a typical error around 1.6%.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self._size = 1 << precision
+        self._registers = bytearray(self._size)
+        self._alpha = 0.7213 / (1 + 1.079 / self._size)
+
+    def add(self, item: str) -> None:
+        hashed = int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def count(self) -> int:
+        registers = self._registers
+        estimate = self._alpha * self._size * self._size / sum(2.0 ** -value for value in registers)
+        zeros = registers.count(0)
+        if estimate <= 2.5 * self._size and zeros:
+            # Small cardinalities: linear counting over the empty registers is exact-ish.
+            estimate = self._size * math.log(self._size / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
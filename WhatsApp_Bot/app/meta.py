@@ -5,6 +5,7 @@ import httpx
 from .config import (
     get_meta_access_token,
     get_meta_api_version,
+    get_meta_graph_base_url,
     get_meta_phone_number_id,
 )
 
@@ -19,7 +20,7 @@ class MetaWhatsAppClient:
         self._access_token = get_meta_access_token()
         self._phone_number_id = get_meta_phone_number_id()
         self._api_version = get_meta_api_version()
-        base = f"https://graph.facebook.com/{self._api_version}"
+        base = f"{get_meta_graph_base_url()}/{self._api_version}"
         self._messages_url = f"{base}/{self._phone_number_id}/messages"
         self._graph_base = base
 
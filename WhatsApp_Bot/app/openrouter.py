@@ -3,7 +3,13 @@ from __future__ import annotations
 import httpx
 from typing import Iterable, Mapping
 
-from .config import get_model_name, get_openrouter_api_key, get_system_prompt, get_temperature
+from .config import (
+    get_model_name,
+    get_openrouter_api_key,
+    get_openrouter_base_url,
+    get_system_prompt,
+    get_temperature,
+)
 
 Message = Mapping[str, str]
 
@@ -15,7 +21,7 @@ class OpenRouterError(RuntimeError):
 class OpenRouterClient:
     def __init__(self, *, timeout: float = 30.0) -> None:
         self._timeout = timeout
-        self._base_url = "https://openrouter.ai/api/v1/chat/completions"
+        self._base_url = f"{get_openrouter_base_url()}/chat/completions"
 
     def build_messages(self, user_messages: Iterable[Message]) -> list[Message]:
         system_message = {"role": "system", "content": get_system_prompt()}
@@ -9,7 +9,7 @@ from typing import Any, Optional
 
 import httpx
 
-from .config import get_model_name, get_openrouter_api_key
+from .config import get_model_name, get_openrouter_api_key, get_openrouter_base_url
 
 
 @dataclass
@@ -27,7 +27,6 @@ class DishVisionError(RuntimeError):
     pass
 
 
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 DEFAULT_MODEL = "openai/gpt-4o"
 TEMPERATURE = 0.2
 NON_VEG_PATTERN = re.compile(
@@ -178,7 +177,7 @@ def _is_valid_output(result: dict[str, Any]) -> bool:
 class DishVision:
     def __init__(self, *, timeout: float = 40.0) -> None:
         self._timeout = timeout
-        self._api_url = OPENROUTER_URL
+        self._api_url = f"{get_openrouter_base_url()}/chat/completions"
 
     def _call_openrouter(self, messages: list[dict[str, Any]], model: str) -> str:
         headers = {
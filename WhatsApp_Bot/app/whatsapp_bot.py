@@ -1,21 +1,39 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import re
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from urllib.parse import quote_plus
 from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
-from collections import defaultdict, deque
+from collections import deque
 
 from flask import Flask, Response, jsonify, request
 
-from .config import get_meta_verify_token
+from .config import (
+    get_context_db_path,
+    get_context_max_entries,
+    get_context_store_backend,
+    get_context_sweep_seconds,
+    get_dedup_db_path,
+    get_dedup_store_backend,
+    get_dedup_window_seconds,
+    get_context_ttl_seconds,
+    get_max_queued,
+    get_max_queued_per_sender,
+    get_meta_verify_token,
+    get_worker_count,
+)
+from .context_store import build_context_store, start_sweeper
+from .dedup_store import build_dedup_store
+from .hyperloglog import HyperLogLog
 from .meta import MetaWhatsAppClient, MetaWhatsAppError
 from .nearby import NearbySearchError, fetch_nearby_restaurants
 from .openrouter import OpenRouterClient, OpenRouterError
 from .vision import DishVision, DishVisionError, DishVisionResult
+from .work_queue import LaneExecutor
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -122,6 +140,9 @@ GLOBAL_EXIT_BUTTONS = [
 # ----- Data structures ----------------------------------------------------------
 
 
+LLM_HISTORY_TURNS = 10
+
+
 @dataclass
 class Preferences:
     diet: Optional[str] = None
@@ -140,7 +161,7 @@ class UserContext:
     preferences: Preferences = field(default_factory=Preferences)
     last_dish: Optional[str] = None
     last_swap_summary: Optional[str] = None
-    llm_history: Deque[dict[str, str]] = field(default_factory=lambda: deque(maxlen=10))
+    llm_history: Deque[dict[str, str]] = field(default_factory=lambda: deque(maxlen=LLM_HISTORY_TURNS))
     last_interaction: datetime = field(default_factory=datetime.utcnow)
     wizard_last_photo_id: Optional[str] = None
     wizard_last_dish: Optional[str] = None
@@ -152,6 +173,49 @@ class UserContext:
     wizard_cuisine: str = ""
 
 
+def _compact_fields(obj: Any, defaults: Any) -> Dict[str, Any]:
+    """JSON-ready fields of a dataclass, leaving out those still at their default."""
+    out: Dict[str, Any] = {}
+    for item in fields(obj):
+        value = getattr(obj, item.name)
+        if value == getattr(defaults, item.name):
+            continue
+        if isinstance(value, Preferences):
+            value = _compact_fields(value, Preferences())
+        elif isinstance(value, set):
+            value = sorted(value)
+        elif isinstance(value, deque):
+            value = list(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        out[item.name] = value
+    return out
+
+
+def _encode_context(context: UserContext) -> bytes:
+    defaults = UserContext(last_interaction=context.last_interaction)
+    data = _compact_fields(context, defaults)
+    data["last_interaction"] = context.last_interaction.isoformat()
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _decode_context(raw: bytes) -> UserContext:
+    data = json.loads(raw)
+    known = {item.name for item in fields(UserContext)}
+    context = UserContext(**{key: value for key, value in data.items() if key in known})
+    preferences = data.get("preferences") or {}
+    context.preferences = Preferences(
+        **{
+            **preferences,
+            "restrictions": set(preferences.get("restrictions") or ()),
+            "allergies": set(preferences.get("allergies") or ()),
+        }
+    )
+    context.llm_history = deque(data.get("llm_history") or (), maxlen=LLM_HISTORY_TURNS)
+    context.last_interaction = datetime.fromisoformat(data["last_interaction"])
+    return context
+
+
 @dataclass
 class OutgoingMessage:
     text: str
@@ -178,25 +242,32 @@ def create_app() -> Flask:
     client = OpenRouterClient()
     whatsapp = MetaWhatsAppClient()
     vision = DishVision()
-    contexts: Dict[str, UserContext] = defaultdict(UserContext)
-    processed_message_ids: Deque[str] = deque(maxlen=2000)
-    processed_message_index: set[str] = set()
-
-    def _mark_processed(message_id: str) -> None:
-        if not message_id:
-            return
-        if message_id in processed_message_index:
-            return
-        if len(processed_message_ids) == processed_message_ids.maxlen:
-            oldest = processed_message_ids[0]
-            processed_message_index.discard(oldest)
-        processed_message_ids.append(message_id)
-        processed_message_index.add(message_id)
+    contexts = build_context_store(
+        get_context_store_backend(),
+        UserContext,
+        _encode_context,
+        _decode_context,
+        max_entries=get_context_max_entries(),
+        ttl_seconds=get_context_ttl_seconds(),
+        path=get_context_db_path(),
+    )
+    sweep_seconds = get_context_sweep_seconds()
+    if sweep_seconds:
+        atexit.register(start_sweeper(contexts, sweep_seconds).set)
+    # Shared by all workers with the sqlite backend, so a Meta retry that lands on
+    # another worker, or arrives after a restart, is still recognised.
+    dedup = build_dedup_store(
+        get_dedup_store_backend(),
+        window_seconds=get_dedup_window_seconds(),
+        path=get_dedup_db_path(),
+    )
 
     stats = {
         "start_time": datetime.utcnow().isoformat() + "Z",
         "messages_processed": 0,
-        "active_users": set(),
+        "duplicate_messages": 0,
+        # Approximate: a fixed 4 KiB however many senders the process has seen.
+        "active_users": HyperLogLog(),
     }
 
     @app.get("/whatsapp")
@@ -211,70 +282,106 @@ def create_app() -> Flask:
         logger.warning("Webhook verification failed with mode=%s token=%s", mode, token)
         return Response("verification failed", status=403, mimetype="text/plain")
 
+    def _process_incoming(incoming: IncomingMessage) -> None:
+        context = contexts.get(incoming.sender)
+        context.last_interaction = datetime.utcnow()
+        try:
+            responses = _respond(incoming, context)
+        finally:
+            contexts.save(incoming.sender, context)
+
+        for response in responses:
+            _deliver_response(whatsapp, incoming.sender, response)
+
+    def _respond(incoming: IncomingMessage, context: UserContext) -> List[OutgoingMessage]:
+        if incoming.type == "button":
+            responses = _handle_button_press(
+                incoming,
+                context,
+                client,
+            )
+        elif incoming.type == "image":
+            responses = _handle_image_message(
+                incoming,
+                context,
+                client,
+                whatsapp,
+                vision,
+            )
+        else:
+            responses = _handle_text_message(
+                incoming,
+                context,
+                client,
+            )
+
+        if not responses:
+            responses = [_fallback_message(context)]
+
+        if _should_ai_rewrite(context):
+            rewritten: List[OutgoingMessage] = []
+            for response in responses:
+                try:
+                    rewritten.append(_ai_rewrite_response(client, context, response))
+                except Exception:  # fall back silently on rewrite failure
+                    rewritten.append(response)
+
+            responses = rewritten
+
+        return responses
+
+    # Meta retries webhooks that are slow to answer, so messages are acked once queued
+    # and the LLM, vision and send calls happen on the workers, one lane per sender.
+    worker_count = get_worker_count()
+    executor = (
+        LaneExecutor(worker_count, get_max_queued(), get_max_queued_per_sender()) if worker_count else None
+    )
+    if executor is not None:
+        atexit.register(executor.stop)
+
     @app.post("/whatsapp")
     def handle_message() -> Response:
-        payload = request.get_json(silent=True) or {}
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({"status": "ignored"})
 
         for incoming in _iterate_incoming_messages(payload):
-            if incoming.message_id and incoming.message_id in processed_message_index:
+            if incoming.message_id and not dedup.claim(incoming.message_id):
+                stats["duplicate_messages"] += 1
                 logger.info("Skipping duplicate webhook message id=%s", incoming.message_id)
                 continue
-            if incoming.message_id:
-                _mark_processed(incoming.message_id)
+
+            if executor is None:
+                _process_incoming(incoming)
+            elif not executor.submit(incoming.sender, lambda incoming=incoming: _process_incoming(incoming)):
+                # Forget it so Meta's retry of this payload delivers it again; messages
+                # queued before it are skipped as duplicates.
+                if incoming.message_id:
+                    dedup.release(incoming.message_id)
+                logger.warning("Work queue full; deferring message from %s", incoming.sender)
+                return jsonify({"status": "busy"}), 503
 
             stats["messages_processed"] += 1
             stats["active_users"].add(incoming.sender)
-            context = contexts[incoming.sender]
-            context.last_interaction = datetime.utcnow()
-
-            if incoming.type == "button":
-                responses = _handle_button_press(
-                    incoming,
-                    context,
-                    client,
-                )
-            elif incoming.type == "image":
-                responses = _handle_image_message(
-                    incoming,
-                    context,
-                    client,
-                    whatsapp,
-                    vision,
-                )
-            else:
-                responses = _handle_text_message(
-                    incoming,
-                    context,
-                    client,
-                )
-
-            if not responses:
-                responses = [_fallback_message(context)]
-
-            if _should_ai_rewrite(context):
-                rewritten: List[OutgoingMessage] = []
-                for response in responses:
-                    try:
-                        rewritten.append(_ai_rewrite_response(client, context, response))
-                    except Exception:  # fall back silently on rewrite failure
-                        rewritten.append(response)
-
-                responses = rewritten
-
-            for response in responses:
-                _deliver_response(whatsapp, incoming.sender, response)
 
         return jsonify({"status": "received"})
 
     @app.get("/")
     def show_stats() -> Response:
+        duplicates = stats["duplicate_messages"]
+        received = stats["messages_processed"] + duplicates
         return jsonify(
             {
                 "status": "ok",
                 "start_time": stats["start_time"],
                 "messages_processed": stats["messages_processed"],
-                "active_users": len(stats["active_users"]),
+                "duplicate_messages": duplicates,
+                "duplicate_rate": round(duplicates / received, 4) if received else 0.0,
+                "dedup": dedup.stats(),
+                "active_users": stats["active_users"].count(),
                 "cached_contexts": len(contexts),
+                "contexts": contexts.stats(),
+                "queue": executor.stats() if executor is not None else None,
             }
         )
 
@@ -1640,7 +1747,7 @@ def _show_restaurant_results(context: UserContext) -> List[OutgoingMessage]:
     cached_live = bool(context.pending.get("restaurant_results_live"))
     source_note: Optional[str] = None
     if (
-        cached_signature == signature
+        tuple(cached_signature or ()) == signature
         and isinstance(cached_results, list)
         and len(cached_results) >= target_count
         and cached_live
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+Task = Callable[[], None]
+
+
+class LaneExecutor:
+    """Runs webhook work with one ordered lane per key on a shared thread pool.
+
+    A key (a sender's phone number) has at most one task running at a time, so a
+    user's messages and context updates happen in arrival order; lanes of
+    different users run in parallel on any free worker. A busy user therefore
+    never holds up another user the way a fixed key-to-thread mapping would.
+
+    `submit` refuses work beyond `max_pending` queued tasks overall or
+    `max_per_lane` for one key, so the caller can push back on the sender.
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 1000, max_per_lane: int = 20) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.max_per_lane = max(1, max_per_lane)
+        # A key is in `_lanes` while it has queued work or a task running; it is in
+        # `_ready` while it waits for a worker.
+        self._lanes: Dict[str, Deque[Task]] = {}
+        self._ready: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._running = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._threads = [
+            threading.Thread(target=self._run, name=f"bot-worker-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, key: str, task: Task) -> bool:
+        with self._lock:
+            lane = self._lanes.get(key)
+            if self._pending >= self.max_pending or (lane is not None and len(lane) >= self.max_per_lane):
+                self._rejected += 1
+                return False
+            schedule = lane is None
+            if lane is None:
+                lane = self._lanes[key] = deque()
+            lane.append(task)
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+        if schedule:
+            self._ready.put(key)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "running": self._running,
+                "active_lanes": len(self._lanes),
+                "deepest_lane": max((len(lane) for lane in self._lanes.values()), default=0),
+                "peak_pending": self._peak_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Wait up to `timeout` seconds for queued work to finish, then stop the workers."""
+        with self._idle:
+            self._idle.wait_for(lambda: not self._lanes, timeout)
+        for _ in self._threads:
+            self._ready.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while (key := self._ready.get()) is not None:
+            with self._lock:
+                task = self._lanes[key].popleft()
+                self._pending -= 1
+                self._running += 1
+            try:
+                task()
+            except Exception:
+                logger.exception("Webhook message processing failed")
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                # One task per turn, then back of the line, so a chatty sender
+                # cannot starve the others.
+                reschedule = bool(self._lanes[key])
+                if not reschedule:
+                    del self._lanes[key]
+                    if not self._lanes:
+                        self._idle.notify_all()
+            if reschedule:
+                self._ready.put(key)
@@ -0,0 +1,7 @@
+"""Load-testing harness for plant-search and the WhatsApp bot.
+
+Starts plant-search on a generated fixture catalog and the bot against local
+mocks of the Meta Graph and OpenRouter APIs, replays weighted traffic mixes
+at increasing concurrency, and reports throughput, latency percentiles and
+error rates per stage. Standard library only; see `python -m loadtest -h`.
+"""
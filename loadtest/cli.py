@@ -0,0 +1,173 @@
+"""Command line entry point: `python -m loadtest {run,fixture,mocks}`."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .fixtures import generate_fixture, read_fixture_names
+from .mocks import MockLatency, MockUpstreams
+from .runner import find_saturation, format_stage, run_stage, summarize
+from .stack import ServiceProcess, start_bot, start_plant_search
+from .traffic import BOT, DEFAULT_MIXES, PLANT_SEARCH, SCENARIOS, TrafficContext, parse_mix
+
+
+def _levels(text: str) -> List[int]:
+    return [int(part) for part in text.split(",") if part.strip()]
+
+
+def _add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--meta-latency-ms", type=float, default=80.0)
+    parser.add_argument("--openrouter-latency-ms", type=float, default=900.0)
+
+
+def _start_mocks(args: argparse.Namespace, port: int = 0) -> MockUpstreams:
+    return MockUpstreams(
+        port=port,
+        meta_latency=MockLatency(args.meta_latency_ms, args.meta_latency_ms * 0.4),
+        openrouter_latency=MockLatency(args.openrouter_latency_ms, args.openrouter_latency_ms * 0.4),
+    ).start()
+
+
+def _cmd_fixture(args: argparse.Namespace) -> int:
+    names = generate_fixture(args.path, args.dishes, seed=args.seed)
+    print(f"[LOADTEST] wrote {sum(len(items) for items in names.values())} dishes to {args.path}")
+    return 0
+
+
+def _cmd_mocks(args: argparse.Namespace) -> int:
+    mocks = _start_mocks(args, port=args.port)
+    print(f"[LOADTEST] mock Meta Graph / OpenRouter on {mocks.base_url}; point the bot at it with:")
+    for key, value in mocks.env.items():
+        print(f"  export {key}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mocks.stop()
+    return 0
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    targets = [PLANT_SEARCH, BOT] if args.target == "all" else [args.target]
+    mix: Dict[str, float] = {}
+    if args.mix:
+        mix = parse_mix(args.mix)
+    else:
+        for target in targets:
+            mix.update(DEFAULT_MIXES[target])
+    mix = {name: weight for name, weight in mix.items() if SCENARIOS[name].target in targets}
+
+    log_dir = Path(args.log_dir or tempfile.mkdtemp(prefix="loadtest-"))
+    log_dir.mkdir(parents=True, exist_ok=True)
+    fixture = args.fixture
+    if fixture is None:
+        fixture = log_dir / "fixture.jsonl"
+        generate_fixture(fixture, args.dishes, seed=args.seed)
+    names_by_table = read_fixture_names(fixture)
+
+    services: List[ServiceProcess] = []
+    mocks: Optional[MockUpstreams] = None
+    base_urls: Dict[str, str] = {}
+    try:
+        if PLANT_SEARCH in targets:
+            if args.plant_search_url:
+                base_urls[PLANT_SEARCH] = args.plant_search_url.rstrip("/")
+            else:
+                services.append(start_plant_search(fixture, args.plant_search_port, args.plant_search_workers, log_dir))
+                base_urls[PLANT_SEARCH] = f"http://127.0.0.1:{args.plant_search_port}"
+        if BOT in targets:
+            if args.bot_url:
+                base_urls[BOT] = args.bot_url.rstrip("/")
+            else:
+                mocks = _start_mocks(args)
+                services.append(start_bot(args.bot_port, mocks.env, log_dir))
+                base_urls[BOT] = f"http://127.0.0.1:{args.bot_port}"
+
+        ctx = TrafficContext(
+            names_by_table=names_by_table,
+            senders=[f"9198{index:08d}" for index in range(args.senders)],
+        )
+        print(f"[LOADTEST] targets: {base_urls}; mix: {mix}; logs: {log_dir}")
+        if args.warmup > 0:
+            run_stage(base_urls, ctx, mix, min(_levels(args.concurrency)), args.warmup, seed=args.seed)
+
+        results = []
+        levels = _levels(args.concurrency)
+        for index, concurrency in enumerate(levels, start=1):
+            result = run_stage(base_urls, ctx, mix, concurrency, args.duration, seed=args.seed + index)
+            results.append(result)
+            print(format_stage(result, f"stage {index}/{len(levels)}"))
+            print()
+    finally:
+        for service in reversed(services):
+            service.stop()
+        if mocks is not None:
+            print(f"[LOADTEST] mock upstream calls: {dict(mocks.counts)}")
+            mocks.stop()
+
+    saturated = find_saturation(results)
+    if saturated is None:
+        print("[LOADTEST] throughput still scaling at the highest concurrency; try larger levels")
+    else:
+        summary = summarize(saturated.total(), saturated.elapsed)
+        print(
+            f"[LOADTEST] saturation near concurrency {saturated.concurrency}: "
+            f"{summary['rps']:.1f} rps, p99 {summary['p99_ms']:.1f} ms"
+        )
+
+    if args.json:
+        report = [
+            {
+                "concurrency": result.concurrency,
+                "elapsed": result.elapsed,
+                "scenarios": {name: summarize(stats, result.elapsed) for name, stats in result.scenarios.items()},
+                "total": summarize(result.total(), result.elapsed),
+            }
+            for result in results
+        ]
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Start the stack and replay traffic at increasing concurrency")
+    run.add_argument("--target", choices=[PLANT_SEARCH, BOT, "all"], default="all")
+    run.add_argument("--concurrency", default="4,8,16,32", help="Comma-separated concurrency per stage")
+    run.add_argument("--duration", type=float, default=20.0, help="Seconds per stage")
+    run.add_argument("--warmup", type=float, default=3.0, help="Unreported warm-up seconds")
+    run.add_argument("--mix", help="Scenario weights, e.g. autocomplete=50,search=30,dish=20")
+    run.add_argument("--fixture", type=Path, help="Existing fixture (default: generate one)")
+    run.add_argument("--dishes", type=int, default=3000, help="Dishes in the generated fixture")
+    run.add_argument("--senders", type=int, default=500, help="Distinct WhatsApp senders")
+    run.add_argument("--plant-search-url", help="Use a running plant-search instead of starting one")
+    run.add_argument("--plant-search-port", type=int, default=8701)
+    run.add_argument("--plant-search-workers", type=int, default=1)
+    run.add_argument("--bot-url", help="Use a running bot (already pointed at the mocks) instead of starting one")
+    run.add_argument("--bot-port", type=int, default=8702)
+    run.add_argument("--seed", type=int, default=7)
+    run.add_argument("--log-dir", help="Service logs and generated fixture (default: a temp dir)")
+    run.add_argument("--json", help="Also write the per-stage summary to this file")
+    _add_mock_arguments(run)
+    run.set_defaults(handler=_cmd_run)
+
+    fixture = commands.add_parser("fixture", help="Write a synthetic plant-search fixture")
+    fixture.add_argument("path", type=Path)
+    fixture.add_argument("--dishes", type=int, default=3000)
+    fixture.add_argument("--seed", type=int, default=7)
+    fixture.set_defaults(handler=_cmd_fixture)
+
+    mocks = commands.add_parser("mocks", help="Run only the Meta Graph / OpenRouter mocks")
+    mocks.add_argument("--port", type=int, default=8703)
+    _add_mock_arguments(mocks)
+    mocks.set_defaults(handler=_cmd_mocks)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
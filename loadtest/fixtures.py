@@ -0,0 +1,95 @@
+"""Deterministic synthetic dish catalog in the plant-search fixture format."""
+
+from __future__ import annotations
+
+import json
+import random
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+# (table, share of the catalog)
+TABLE_SHARES = (
+    ("dishes_non_vegan", 0.35),
+    ("dishes_vegan", 0.35),
+    ("dishes_veg", 0.15),
+    ("dishes_jain", 0.1),
+    ("dishes_keto", 0.05),
+)
+
+BASES = [
+    "paneer", "chicken", "mutton", "tofu", "chana", "rajma", "mushroom", "jackfruit", "soya", "egg",
+    "fish", "prawn", "dal", "aloo", "gobi", "bhindi", "palak", "kofta", "seitan", "tempeh",
+]
+STYLES = [
+    "tikka", "masala", "biryani", "curry", "korma", "kebab", "pulao", "butter", "vindaloo", "do pyaza",
+    "kathi roll", "sandwich", "burger", "wrap", "bowl", "stir fry", "65", "manchurian", "salad", "soup",
+]
+REGIONS = ["", "", "hyderabadi", "punjabi", "chettinad", "goan", "kolkata", "malabar", "lucknowi", "bombay"]
+INGREDIENTS = [
+    "onion", "tomato", "garlic", "ginger", "cumin", "coriander", "garam masala", "turmeric", "chilli",
+    "cream", "coconut milk", "cashew", "yogurt", "rice", "butter", "mustard oil", "curry leaves", "lemon",
+]
+LEVELS = ["low", "medium", "high"]
+PRICE_RANGES = ["$", "$$", "$$$"]
+TEXTURES = ["creamy", "crispy", "tender", "chewy", "soft", "crunchy", "juicy", "flaky"]
+EMOTIONS = ["comforting", "festive", "indulgent", "light", "nostalgic", "energizing"]
+FLAVORS = ["spicy", "savory", "tangy", "sweet", "smoky", "earthy", "herby"]
+
+
+def _dish_row(rng: random.Random, table: str, name: str) -> Dict[str, object]:
+    return {
+        "table": table,
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "name": name,
+        "price_range": rng.choice(PRICE_RANGES),
+        "availability": rng.choice(["common", "regional", "seasonal"]),
+        "taste_features": {
+            "umami_depth": {"level": rng.choice(LEVELS), "source": rng.sample(INGREDIENTS, 2)},
+            "seasoning_profile": {
+                "salt_level": rng.choice(LEVELS),
+                "sweet_level": rng.choice(LEVELS),
+                "sour_level": rng.choice(LEVELS),
+                "bitter_level": rng.choice(LEVELS),
+                "spice_heat": rng.choice(LEVELS),
+            },
+            "flavor_base": {"primary": rng.sample(FLAVORS, 2), "secondary": rng.sample(FLAVORS, 1)},
+            "taste_intensity": {"overall": rng.choice(LEVELS), "complexity": rng.choice(LEVELS)},
+            "aftertaste": {"type": rng.choice(FLAVORS), "duration": rng.choice(["short", "medium", "long"])},
+        },
+        "texture_features": rng.sample(TEXTURES, 2),
+        "emotion_features": rng.sample(EMOTIONS, 2),
+        "nutrition": {"protein": rng.choice(LEVELS), "energy": rng.choice(LEVELS), "fat": rng.choice(LEVELS)},
+        "data": {"ingredients": rng.sample(INGREDIENTS, rng.randint(4, 9))},
+    }
+
+
+def generate_fixture(path: Path, dishes: int, seed: int = 7) -> Dict[str, List[str]]:
+    """Write `dishes` rows to `path`; returns the dish names per table."""
+    rng = random.Random(seed)
+    names_by_table: Dict[str, List[str]] = {}
+    seen = set()
+    with Path(path).open("w", encoding="utf-8") as handle:
+        for table, share in TABLE_SHARES:
+            names = names_by_table.setdefault(table, [])
+            for _ in range(max(1, int(dishes * share))):
+                base_name = " ".join(
+                    part for part in (rng.choice(REGIONS), rng.choice(BASES), rng.choice(STYLES)) if part
+                ).title()
+                name, suffix = base_name, 2
+                while name.lower() in seen:
+                    name, suffix = f"{base_name} {suffix}", suffix + 1
+                seen.add(name.lower())
+                names.append(name)
+                handle.write(json.dumps(_dish_row(rng, table, name)) + "\n")
+    return names_by_table
+
+
+def read_fixture_names(path: Path) -> Dict[str, List[str]]:
+    names_by_table: Dict[str, List[str]] = {}
+    with Path(path).open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                row = json.loads(line)
+                names_by_table.setdefault(row["table"], []).append(row["name"])
+    return names_by_table
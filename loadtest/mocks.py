@@ -0,0 +1,169 @@
+"""Local stand-ins for the Meta Graph and OpenRouter APIs used by the bot.
+
+One threaded HTTP server answers both, under path prefixes:
+
+    {base}/graph        -> META_GRAPH_BASE_URL
+    {base}/openrouter   -> OPENROUTER_BASE_URL
+
+Each response waits for a configurable latency so the bot's outbound calls
+cost roughly what they do in production. `GET /_stats` returns request counts.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+MOCK_REPLY = (
+    "Great choice! Try a chana masala or a tofu tikka for the same smoky, spicy comfort. "
+    "Want me to find places nearby?"
+)
+
+
+class MockLatency:
+    def __init__(self, mean_ms: float, jitter_ms: float = 0.0) -> None:
+        self.mean = mean_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+
+    def wait(self) -> None:
+        delay = self.mean + (random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class MockUpstreams:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        meta_latency: Optional[MockLatency] = None,
+        openrouter_latency: Optional[MockLatency] = None,
+    ) -> None:
+        self.meta_latency = meta_latency or MockLatency(80, 30)
+        self.openrouter_latency = openrouter_latency or MockLatency(900, 400)
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._message_seq = 0
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def env(self) -> Dict[str, str]:
+        """Environment that points the bot at this server."""
+        return {
+            "META_GRAPH_BASE_URL": f"{self.base_url}/graph",
+            "OPENROUTER_BASE_URL": f"{self.base_url}/openrouter",
+            "META_WHATSAPP_TOKEN": "loadtest-token",
+            "META_WHATSAPP_PHONE_NUMBER_ID": "100000000000001",
+            "META_WHATSAPP_VERIFY_TOKEN": "loadtest-verify",
+            "OPENROUTER_API_KEY": "loadtest-key",
+        }
+
+    def start(self) -> "MockUpstreams":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-upstreams", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self, kind: str) -> None:
+        with self._lock:
+            self.counts[kind] += 1
+
+    def next_message_id(self) -> str:
+        with self._lock:
+            self._message_seq += 1
+            return f"wamid.mock{self._message_seq}"
+
+    def _handler_class(self):
+        mocks = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, Nagle's
+            # algorithm adds ~40ms of delayed-ACK wait to every keep-alive response.
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args) -> None:  # noqa: A002 - stdlib signature
+                pass
+
+            def _read_body(self) -> bytes:
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def _send(self, status: int, payload, content_type: str = "application/json") -> None:
+                body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                path = self.path.split("?", 1)[0]
+                if path == "/_stats":
+                    with mocks._lock:
+                        self._send(200, dict(mocks.counts))
+                    return
+                if path.startswith("/graph/media/"):
+                    mocks.count("meta.media_download")
+                    mocks.meta_latency.wait()
+                    self._send(200, b"\xff\xd8\xff\xe0mock-jpeg", "image/jpeg")
+                    return
+                match = re.fullmatch(r"/graph/v[\d.]+/([^/]+)", path)
+                if match:
+                    mocks.count("meta.media_url")
+                    mocks.meta_latency.wait()
+                    self._send(200, {"url": f"{mocks.base_url}/graph/media/{match.group(1)}"})
+                    return
+                self._send(404, {"error": "not found"})
+
+            def do_POST(self) -> None:
+                path = self.path.split("?", 1)[0]
+                body = self._read_body()
+                if re.fullmatch(r"/graph/v[\d.]+/[^/]+/messages", path):
+                    mocks.count("meta.send")
+                    mocks.meta_latency.wait()
+                    try:
+                        to = json.loads(body or b"{}").get("to", "")
+                    except ValueError:
+                        self._send(400, {"error": {"message": "invalid JSON"}})
+                        return
+                    self._send(
+                        200,
+                        {
+                            "messaging_product": "whatsapp",
+                            "contacts": [{"input": to, "wa_id": to}],
+                            "messages": [{"id": mocks.next_message_id()}],
+                        },
+                    )
+                    return
+                if path == "/openrouter/chat/completions":
+                    mocks.count("openrouter.completion")
+                    mocks.openrouter_latency.wait()
+                    self._send(
+                        200,
+                        {
+                            "id": "gen-mock",
+                            "object": "chat.completion",
+                            "choices": [{"index": 0, "message": {"role": "assistant", "content": MOCK_REPLY}}],
+                        },
+                    )
+                    return
+                self._send(404, {"error": "not found"})
+
+        return Handler
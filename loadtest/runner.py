@@ -0,0 +1,181 @@
+"""Closed-loop load generator and per-stage latency reporting."""
+
+from __future__ import annotations
+
+import http.client
+import math
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from .traffic import SCENARIOS, Step, TrafficContext
+
+PERCENTILES = (50, 90, 95, 99)
+# A stage counts as saturated when throughput grows less than this over the
+# previous stage, or when its error rate exceeds MAX_ERROR_RATE.
+MIN_THROUGHPUT_GAIN = 0.05
+MAX_ERROR_RATE = 0.01
+
+
+@dataclass
+class ScenarioStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    def merge(self, other: "ScenarioStats") -> None:
+        self.latencies.extend(other.latencies)
+        self.errors.update(other.errors)
+
+
+@dataclass
+class StageResult:
+    concurrency: int
+    elapsed: float
+    scenarios: Dict[str, ScenarioStats]
+
+    def total(self) -> ScenarioStats:
+        combined = ScenarioStats()
+        for stats in self.scenarios.values():
+            combined.merge(stats)
+        return combined
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(stats: ScenarioStats, elapsed: float) -> Dict[str, float]:
+    values = sorted(stats.latencies)
+    errors = sum(stats.errors.values())
+    summary = {
+        "requests": len(values),
+        "rps": len(values) / elapsed if elapsed else 0.0,
+        "error_rate": errors / len(values) if values else 0.0,
+        "max_ms": (values[-1] * 1000) if values else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = percentile(values, pct) * 1000
+    return summary
+
+
+class _Connections:
+    """One keep-alive connection per target for a single worker thread."""
+
+    def __init__(self, base_urls: Dict[str, str], timeout: float) -> None:
+        self.base_urls = base_urls
+        self.timeout = timeout
+        self._connections: Dict[str, http.client.HTTPConnection] = {}
+
+    def request(self, step: Step) -> int:
+        connection = self._connections.get(step.target)
+        if connection is None:
+            parts = urlsplit(self.base_urls[step.target])
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=self.timeout)
+            self._connections[step.target] = connection
+        try:
+            connection.request(step.method, step.path, body=step.body, headers=step.headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+
+    def close(self) -> None:
+        for connection in self._connections.values():
+            connection.close()
+
+
+def run_stage(
+    base_urls: Dict[str, str],
+    ctx: TrafficContext,
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    seed: int = 0,
+    timeout: float = 30.0,
+) -> StageResult:
+    names = [name for name in mix if mix[name] > 0]
+    weights = [mix[name] for name in names]
+    per_worker: List[Dict[str, ScenarioStats]] = [{} for _ in range(concurrency)]
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        connections = _Connections(base_urls, timeout)
+        results = per_worker[index]
+        try:
+            while time.perf_counter() < deadline:
+                scenario = SCENARIOS[rng.choices(names, weights)[0]]
+                stats = results.setdefault(scenario.name, ScenarioStats())
+                for step in scenario.build(rng, ctx):
+                    started = time.perf_counter()
+                    try:
+                        status = connections.request(step)
+                    except (OSError, http.client.HTTPException) as exc:
+                        stats.latencies.append(time.perf_counter() - started)
+                        stats.errors[type(exc).__name__] += 1
+                        break
+                    stats.latencies.append(time.perf_counter() - started)
+                    if status >= 400:
+                        stats.errors[str(status)] += 1
+        finally:
+            connections.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    merged: Dict[str, ScenarioStats] = {}
+    for results in per_worker:
+        for name, stats in results.items():
+            merged.setdefault(name, ScenarioStats()).merge(stats)
+    return StageResult(concurrency=concurrency, elapsed=elapsed, scenarios=merged)
+
+
+def format_stage(result: StageResult, label: str) -> str:
+    header = f"{'scenario':<20}{'reqs':>8}{'rps':>9}{'err%':>7}" + "".join(
+        f"{f'p{pct}':>9}" for pct in PERCENTILES
+    ) + f"{'max':>9}  (ms)"
+    lines = [f"== {label}: concurrency {result.concurrency}, {result.elapsed:.1f}s ==", header]
+    rows = sorted(result.scenarios.items()) + [("TOTAL", result.total())]
+    for name, stats in rows:
+        summary = summarize(stats, result.elapsed)
+        line = f"{name:<20}{summary['requests']:>8}{summary['rps']:>9.1f}{summary['error_rate'] * 100:>7.2f}"
+        line += "".join(f"{summary[f'p{pct}_ms']:>9.1f}" for pct in PERCENTILES)
+        line += f"{summary['max_ms']:>9.1f}"
+        if stats.errors:
+            line += "  " + ", ".join(f"{kind}x{count}" for kind, count in stats.errors.most_common(3))
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def find_saturation(results: Sequence[StageResult]) -> Optional[StageResult]:
+    """Return the last stage before throughput stopped scaling, if any stage stopped."""
+    previous: Optional[StageResult] = None
+    for result in results:
+        summary = summarize(result.total(), result.elapsed)
+        if previous is not None:
+            previous_rps = summarize(previous.total(), previous.elapsed)["rps"]
+            if summary["error_rate"] > MAX_ERROR_RATE or summary["rps"] < previous_rps * (1 + MIN_THROUGHPUT_GAIN):
+                return previous
+        elif summary["error_rate"] > MAX_ERROR_RATE:
+            return result
+        previous = result
+    return None
@@ -0,0 +1,83 @@
+"""Start and stop the services under test as subprocesses."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PLANT_SEARCH_DIR = REPO_ROOT / "plant-search"
+BOT_DIR = REPO_ROOT / "WhatsApp_Bot"
+
+
+class ServiceProcess:
+    def __init__(self, name: str, command: List[str], cwd: Path, env: Dict[str, str], log_path: Path) -> None:
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.log_path = log_path
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self, ready_url: str, timeout: float = 60.0) -> "ServiceProcess":
+        log = self.log_path.open("wb")
+        self.process = subprocess.Popen(
+            self.command,
+            cwd=self.cwd,
+            env={**os.environ, **self.env},
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        log.close()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"{self.name} exited with {self.process.returncode}; see {self.log_path}")
+            try:
+                with urllib.request.urlopen(ready_url, timeout=2) as response:
+                    if response.status < 500:
+                        return self
+            except (urllib.error.URLError, OSError):
+                pass
+            time.sleep(0.25)
+        self.stop()
+        raise RuntimeError(f"{self.name} was not ready within {timeout:.0f}s; see {self.log_path}")
+
+    def stop(self) -> None:
+        if self.process is None or self.process.poll() is not None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def start_plant_search(fixture: Path, port: int, workers: int, log_dir: Path) -> ServiceProcess:
+    command = [
+        sys.executable, "-m", "uvicorn", "api.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--no-access-log",
+    ]
+    env = {
+        "PLANT_SEARCH_DATA_SOURCE": "fixture",
+        "PLANT_SEARCH_FIXTURE_PATH": str(fixture.resolve()),
+        "CATALOG_CHANGE_FEED": "off",
+        "LOG_LEVEL": "WARNING",
+    }
+    service = ServiceProcess("plant-search", command, PLANT_SEARCH_DIR, env, log_dir / "plant-search.log")
+    return service.start(f"http://127.0.0.1:{port}/readyz")
+
+
+def start_bot(port: int, mock_env: Dict[str, str], log_dir: Path) -> ServiceProcess:
+    command = [
+        sys.executable, "-m", "flask", "--app", "main:app", "run",
+        "--host", "127.0.0.1", "--port", str(port), "--with-threads",
+    ]
+    service = ServiceProcess("whatsapp-bot", command, BOT_DIR, mock_env, log_dir / "whatsapp-bot.log")
+    return service.start(f"http://127.0.0.1:{port}/health")
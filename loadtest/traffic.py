@@ -0,0 +1,206 @@
+"""Traffic scenarios: each one builds the HTTP requests of a single user action."""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional
+from urllib.parse import quote, urlencode
+
+PLANT_SEARCH = "plant-search"
+BOT = "bot"
+
+BOT_TEXTS = [
+    "hi",
+    "hello",
+    "what can I eat instead of butter chicken?",
+    "suggest a vegan dinner",
+    "how does this work",
+    "I want something spicy and cheap",
+    "menu",
+]
+
+
+@dataclass
+class Step:
+    target: str
+    method: str
+    path: str
+    body: Optional[bytes] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class TrafficContext:
+    names_by_table: Dict[str, List[str]]
+    senders: List[str]
+    recent_messages: Deque[dict] = field(default_factory=lambda: deque(maxlen=500))
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _sequence: int = 0
+
+    @property
+    def source_names(self) -> List[str]:
+        return self.names_by_table.get("dishes_non_vegan") or self.all_names
+
+    @property
+    def all_names(self) -> List[str]:
+        return [name for names in self.names_by_table.values() for name in names]
+
+    def next_message_id(self) -> str:
+        with self._lock:
+            self._sequence += 1
+            return f"wamid.loadtest.{int(time.time())}.{self._sequence}"
+
+
+@dataclass
+class Scenario:
+    name: str
+    target: str
+    build: Callable[[random.Random, TrafficContext], List[Step]]
+
+
+def _json_step(target: str, path: str, payload: dict) -> Step:
+    return Step(target, "POST", path, json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"})
+
+
+# ----- plant-search ---------------------------------------------------------------
+
+
+def _autocomplete(rng: random.Random, ctx: TrafficContext) -> List[Step]:
+    # A user typing: one request per keystroke from the second character on.
+    name = rng.choice(ctx.all_names)
+    last = min(len(name), rng.randint(3, 9))
+    return [
+        Step(PLANT_SEARCH, "GET", "/dishes?" + urlencode({"name": name[:length], "limit": 10}))
+        for length in range(2, last + 1)
+    ]
+
+
+def _search(rng: random.Random, ctx: TrafficContext) -> List[Step]:
+    to = rng.choice(["vegan", "vegan", "veg", "jain"])
+    return [_json_step(PLANT_SEARCH, "/search", {"dish_name": rng.choice(ctx.source_names), "from": "non-vegan", "to": to})]
+
+
+def _dish(rng: random.Random, ctx: TrafficContext) -> List[Step]:
+    return [Step(PLANT_SEARCH, "GET", "/dish/" + quote(rng.choice(ctx.all_names), safe=""))]
+
+
+def _browse(rng: random.Random, ctx: TrafficContext) -> List[Step]:
+    dataset = rng.choice(sorted(ctx.names_by_table))
+    return [Step(PLANT_SEARCH, "GET", "/dishes?" + urlencode({"dataset": dataset, "limit": 50}))]
+
+
+# ----- WhatsApp bot ---------------------------------------------------------------
+
+
+def _text_message(ctx: TrafficContext, sender: str, text: str) -> dict:
+    return {
+        "from": sender,
+        "id": ctx.next_message_id(),
+        "timestamp": str(int(time.time())),
+        "type": "text",
+        "text": {"body": text},
+    }
+
+
+def _button_message(ctx: TrafficContext, sender: str, button_id: str, title: str) -> dict:
+    return {
+        "from": sender,
+        "id": ctx.next_message_id(),
+        "timestamp": str(int(time.time())),
+        "type": "interactive",
+        "interactive": {"type": "button_reply", "button_reply": {"id": button_id, "title": title}},
+    }
+
+
+def _webhook(messages: List[dict]) -> Step:
+    payload = {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "id": "loadtest-waba",
+                "changes": [
+                    {
+                        "field": "messages",
+                        "value": {
+                            "messaging_product": "whatsapp",
+                            "metadata": {"phone_number_id": "100000000000001"},
+                            "messages": messages,
+                        },
+                    }
+                ],
+            }
+        ],
+    }
+    return _json_step(BOT, "/whatsapp", payload)
+
+
+def _remember(ctx: TrafficContext, messages: List[dict]) -> None:
+    with ctx._lock:
+        ctx.recent_messages.extend(messages)
+
+
+def _webhook_single(rng: random.Random, ctx: TrafficContext) -> List[Step]:
+    message = _text_message(ctx, rng.choice(ctx.senders), rng.choice(BOT_TEXTS))
+    _remember(ctx, [message])
+    return [_webhook([message])]
+
+
+def _webhook_batch(rng: random.Random, ctx: TrafficContext) -> List[Step]:
+    senders = rng.sample(ctx.senders, min(len(ctx.senders), rng.randint(2, 5)))
+    messages = [_text_message(ctx, sender, rng.choice(BOT_TEXTS)) for sender in senders]
+    _remember(ctx, messages)
+    return [_webhook(messages)]
+
+
+def _webhook_duplicate(rng: random.Random, ctx: TrafficContext) -> List[Step]:
+    # Meta redelivers webhooks it did not see acknowledged in time.
+    with ctx._lock:
+        message = rng.choice(ctx.recent_messages) if ctx.recent_messages else None
+    if message is None:
+        return _webhook_single(rng, ctx)
+    return [_webhook([message])]
+
+
+def _conversation(rng: random.Random, ctx: TrafficContext) -> List[Step]:
+    sender = rng.choice(ctx.senders)
+    return [
+        _webhook([_text_message(ctx, sender, "hi")]),
+        _webhook([_button_message(ctx, sender, "BTN_REPLACE_DISH", "Replace a dish")]),
+        _webhook([_text_message(ctx, sender, rng.choice(ctx.source_names))]),
+    ]
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("autocomplete", PLANT_SEARCH, _autocomplete),
+        Scenario("search", PLANT_SEARCH, _search),
+        Scenario("dish", PLANT_SEARCH, _dish),
+        Scenario("browse", PLANT_SEARCH, _browse),
+        Scenario("webhook", BOT, _webhook_single),
+        Scenario("webhook_batch", BOT, _webhook_batch),
+        Scenario("webhook_duplicate", BOT, _webhook_duplicate),
+        Scenario("conversation", BOT, _conversation),
+    )
+}
+
+DEFAULT_MIXES: Dict[str, Dict[str, float]] = {
+    PLANT_SEARCH: {"autocomplete": 45, "search": 30, "dish": 20, "browse": 5},
+    BOT: {"webhook": 55, "webhook_batch": 25, "conversation": 15, "webhook_duplicate": 5},
+}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse `name=weight,name=weight` into a scenario mix."""
+    mix: Dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
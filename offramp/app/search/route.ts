@@ -89,7 +89,29 @@ const normalizeSearchRows = (value: unknown): unknown[] => {
     });
 };
 
-const runSearchBridge = async (payload: Record<string, unknown>): Promise<BridgeSuccess> => {
+// A long-running `search_bridge.py --serve` keeps its connection to plant-search warm
+// and skips interpreter startup; when it is unset or unreachable, spawn the one-shot CLI.
+const runSearchBridgeDaemon = async (
+  bridgeUrl: string,
+  payload: Record<string, unknown>
+): Promise<BridgeSuccess> => {
+  const timeoutSeconds = Number(process.env.SEARCH_BRIDGE_TIMEOUT_SECONDS) || 20;
+  const response = await fetch(`${bridgeUrl.replace(/\/$/, "")}/search`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    cache: "no-store",
+    body: JSON.stringify(payload),
+    signal: AbortSignal.timeout(timeoutSeconds * 1000),
+  });
+
+  const parsed = (await response.json().catch(() => null)) as (BridgeSuccess & { error?: string }) | null;
+  if (!response.ok || !parsed || typeof parsed !== "object") {
+    throw new Error(parsed?.error || `search bridge daemon failed (${response.status})`);
+  }
+  return parsed;
+};
+
+const runSearchBridgeProcess = async (payload: Record<string, unknown>): Promise<BridgeSuccess> => {
   const pythonBin = process.env.PYTHON_BIN?.trim() || "python";
   const bridgePath = path.join(process.cwd(), "services", "search_bridge.py");
 
@@ -140,6 +162,18 @@ const runSearchBridge = async (payload: Record<string, unknown>): Promise<Bridge
   });
 };
 
+const runSearchBridge = async (payload: Record<string, unknown>): Promise<BridgeSuccess> => {
+  const bridgeUrl = process.env.SEARCH_BRIDGE_URL?.trim();
+  if (bridgeUrl) {
+    try {
+      return await runSearchBridgeDaemon(bridgeUrl, payload);
+    } catch (daemonError) {
+      console.warn("search bridge daemon unavailable; falling back to the CLI bridge", daemonError);
+    }
+  }
+  return await runSearchBridgeProcess(payload);
+};
+
 const runSearchDirect = async (payload: Record<string, unknown>): Promise<BridgeSuccess> => {
   const baseUrl =
     process.env.PLANT_SEARCH_API_BASE_URL?.trim() ||
@@ -121,6 +121,16 @@ type GetAllDishesOptions = RequestOptions & {
   to?: string;
 };
 
+type GetDishesPageOptions = Omit<GetAllDishesOptions, "name"> & {
+  limit?: number;
+  cursor?: string | null;
+};
+
+export type PlantDishPage = {
+  dishes: PlantDishSummary[];
+  nextCursor: string | null;
+};
+
 const clampScore = (value: number | string | null | undefined) => {
   if (value === null || value === undefined) {
     return 0.85;
@@ -431,6 +441,33 @@ export const getAllDishes = async ({ category, protein, priceRange, name, from,
   return payload;
 };
 
+export const getDishesPage = async ({
+  category,
+  protein,
+  priceRange,
+  from,
+  to,
+  limit,
+  cursor,
+  signal,
+}: GetDishesPageOptions = {}): Promise<PlantDishPage> => {
+  const endpoint = buildUrl("/dishes", {
+    category,
+    protein,
+    price_range: priceRange,
+    from: from?.trim().toLowerCase(),
+    to: to?.trim().toLowerCase(),
+    limit: limit ? String(limit) : undefined,
+    cursor: cursor ?? undefined,
+  });
+
+  const response = await fetchFromPlantSearch(endpoint, { signal });
+  const nextCursor = response.headers.get("X-Next-Cursor");
+  const dishes = await handleResponse<PlantDishSummary[]>(response);
+  debugLog("/dishes page", { count: dishes.length, nextCursor });
+  return { dishes, nextCursor };
+};
+
 export const getDish = async (name: string, signal?: AbortSignal) => {
   const safeName = encodeURIComponent(name.trim());
   const endpoint = buildUrl(`/dish/${safeName}`);
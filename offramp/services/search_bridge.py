@@ -1,24 +1,80 @@
 #!/usr/bin/env python3
 """
 Thin bridge from OffRamp to plant-search.
-Reads JSON payload from stdin and writes JSON to stdout.
+
+One-shot mode (default): reads a JSON payload from stdin and writes JSON to stdout.
+
+plant-search answers `/search?shape=bridge` in the bridge's own response shape, so
+successful bodies are passed through (and cached) as bytes without being decoded.
+
+NDJSON mode (`--ndjson`): one request object per stdin line, one response per stdout
+line, in input order. Requests run concurrently over pooled keep-alive connections;
+an `id` field on a request is echoed on its response:
+
+    printf '{"id": 1, "dish_query": "butter chicken"}\n{"id": 2, "dish_query": "fish curry"}\n' \
+        | python services/search_bridge.py --ndjson
+
+Daemon mode (`--serve`): a local HTTP server speaking the same contracts on
+`POST /search` and `POST /search/batch` (NDJSON in, chunked NDJSON out), so callers
+skip interpreter startup and each worker thread keeps a keep-alive connection to
+plant-search:
+
+    python services/search_bridge.py --serve --port 8765
 """
 
 from __future__ import annotations
 
+import argparse
+import http.client
 import json
 import os
+import queue
+import sqlite3
+import subprocess
 import sys
-import urllib.error
-import urllib.request
-from typing import Any
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+from search_bridge_cache import (
+    DEFAULT_MAX_ENTRIES,
+    DEFAULT_SQLITE_PATH,
+    DEFAULT_STALE_SECONDS,
+    DEFAULT_TTL_SECONDS,
+    CachedSearch,
+    MemoryCache,
+    SqliteCache,
+    cache_key,
+)
+from search_bridge_replicas import DEFAULT_HEDGE_AFTER_MS, CircuitBreaker, Replica, ReplicaSet
 
 DEFAULT_BASE_URL = "http://127.0.0.1:8000"
 DEFAULT_TIMEOUT = 20
+DEFAULT_SERVE_HOST = "127.0.0.1"
+DEFAULT_SERVE_PORT = 8765
+DEFAULT_CONCURRENCY = 8
+MAX_PAYLOAD_BYTES = 64 * 1024
+MAX_BATCH_BYTES = 4 * 1024 * 1024
+
+
+class BridgeError(Exception):
+    """A request the bridge could not serve; `status` is the HTTP status to report."""
+
+    def __init__(self, message: str, status: int = 500, upstream_status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.upstream_status = upstream_status
 
+    def payload(self) -> dict[str, Any]:
+        body: dict[str, Any] = {"error": str(self)}
+        if self.upstream_status is not None:
+            body["status"] = self.upstream_status
+        return body
 
-def _read_payload() -> dict[str, Any]:
-    raw = sys.stdin.read()
+
+def _parse_payload(raw: str) -> dict[str, Any]:
     if not raw.strip():
         return {}
     data = json.loads(raw)
@@ -51,95 +107,392 @@ def _normalize_ingredients(value: Any) -> list[str]:
     return out
 
 
-def _post_search(base_url: str, payload: dict[str, Any], timeout_seconds: int) -> list[dict[str, Any]]:
-    endpoint = f"{base_url.rstrip('/')}/search"
-    body = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        endpoint,
-        data=body,
-        headers={"Content-Type": "application/json"},
-        method="POST",
+class PlantSearchClient:
+    """POSTs to plant-search over one keep-alive connection per thread."""
+
+    def __init__(self, base_url: str, timeout_seconds: float) -> None:
+        parts = urlsplit(base_url.strip().rstrip("/"))
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port
+        self.path_prefix = parts.path
+        self.timeout_seconds = timeout_seconds
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = conn_class(self.host, self.port, timeout=self.timeout_seconds)
+            self._local.conn = conn
+        return conn
+
+    def _discard(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _post(self, path: str, body: bytes) -> tuple[int, str, bytes]:
+        conn = self._connection()
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        try:
+            conn.request("POST", f"{self.path_prefix}{path}", body=body, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.reason, response.read()
+        except (OSError, http.client.HTTPException):
+            self._discard()
+            raise
+
+    def post(self, path: str, payload: dict[str, Any]) -> bytes:
+        body = json.dumps(payload).encode("utf-8")
+        reused = getattr(self._local, "conn", None) is not None
+        try:
+            status, reason, raw = self._post(path, body)
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            if not reused:
+                raise
+            # plant-search closed an idle keep-alive connection; retry once on a fresh one.
+            status, reason, raw = self._post(path, body)
+        if status >= 400:
+            message = raw.decode("utf-8", errors="replace")
+            raise BridgeError(message or reason, status=502, upstream_status=status)
+        return raw
+
+    def search_body(self, plant_payload: dict[str, Any]) -> bytes:
+        raw = self.post("/search?shape=bridge", plant_payload).strip()
+        if raw.startswith(b"{"):
+            return raw
+        # A plant-search that predates `shape=bridge` ignores it and returns bare rows.
+        parsed = json.loads(raw) if raw else []
+        rows = [item for item in parsed if isinstance(item, dict)] if isinstance(parsed, list) else []
+        return json.dumps(_bridge_response(plant_payload, plant_payload["dish_name"], rows)).encode("utf-8")
+
+
+def _search_payload(incoming: dict[str, Any]) -> dict[str, Any]:
+    dish_query = incoming.get("dish_query") or incoming.get("dish_name") or incoming.get("query")
+    if not isinstance(dish_query, str) or not dish_query.strip():
+        raise BridgeError("dish_query is required", status=400)
+
+    top_n = incoming.get("top_n") or 9
+    plant_payload: dict[str, Any] = {
+        "dish_name": dish_query.strip(),
+        "top_n": int(top_n),
+        "from_dataset": incoming.get("from_dataset"),
+        "to_dataset": incoming.get("to_dataset"),
+    }
+
+    # Pass through optional ranking hints if provided by OffRamp.
+    for key in ("from", "to", "from_category", "to_category", "protein_level", "price_level", "sort_by"):
+        value = incoming.get(key)
+        if value is not None:
+            plant_payload[key] = value
+    return plant_payload
+
+
+def _bridge_response(incoming: dict[str, Any], query: str, rows: list[dict[str, Any]]) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    for row in rows:
+        score = row.get("score")
+        similarity = row.get("similarity", score)
+        results.append(
+            {
+                "dish_id": row.get("dish_id"),
+                "name": row.get("name"),
+                "dish_name": row.get("name"),
+                "protein": row.get("protein"),
+                "price_range": row.get("price_range"),
+                "price": row.get("price_range"),
+                "availability": row.get("availability"),
+                "score": score,
+                "similarity": similarity,
+                "similarity_score": similarity,
+                "matched_ingredients": _normalize_ingredients(row.get("matched_ingredients")),
+                "reasons": _normalize_reasons(row.get("reasons")),
+                "from_dataset": row.get("from_dataset"),
+                "to_dataset": row.get("to_dataset"),
+            }
+        )
+
+    return {
+        "from_dataset": incoming.get("from_dataset"),
+        "to_dataset": incoming.get("to_dataset"),
+        "query": query,
+        "results": results,
+    }
+
+
+def search(client: Any, incoming: dict[str, Any]) -> bytes:
+    """Run one bridge request: validate, then fetch the encoded response (cached or not)."""
+    return client.search_body(_search_payload(incoming))
+
+
+def _base_urls_from_env() -> list[str]:
+    # PLANT_SEARCH_API_BASE_URLS lists replicas (comma-separated); the single URL still works.
+    raw = os.getenv("PLANT_SEARCH_API_BASE_URLS") or os.getenv("PLANT_SEARCH_API_BASE_URL") or DEFAULT_BASE_URL
+    return [url.strip() for url in raw.split(",") if url.strip()] or [DEFAULT_BASE_URL]
+
+
+def _client_from_env() -> ReplicaSet:
+    timeout_seconds = int(os.getenv("SEARCH_BRIDGE_TIMEOUT_SECONDS", str(DEFAULT_TIMEOUT)))
+    failure_threshold = int(os.getenv("SEARCH_BRIDGE_BREAKER_FAILURES", "5"))
+    reset_seconds = float(os.getenv("SEARCH_BRIDGE_BREAKER_RESET_SECONDS", "10"))
+    replicas = [
+        Replica(base_url, PlantSearchClient(base_url, timeout_seconds), CircuitBreaker(failure_threshold, reset_seconds))
+        for base_url in _base_urls_from_env()
+    ]
+    return ReplicaSet(
+        replicas,
+        hedge=(os.getenv("SEARCH_BRIDGE_HEDGE") or "on").strip().lower() != "off",
+        default_hedge_after_ms=float(os.getenv("SEARCH_BRIDGE_HEDGE_AFTER_MS", str(DEFAULT_HEDGE_AFTER_MS))),
     )
-    with urllib.request.urlopen(req, timeout=timeout_seconds) as response:
-        raw = response.read().decode("utf-8")
-    parsed = json.loads(raw) if raw else []
-    if isinstance(parsed, list):
-        return [item for item in parsed if isinstance(item, dict)]
-    return []
 
 
-def main() -> int:
+def _sqlite_cache_from_env() -> SqliteCache:
+    return SqliteCache(
+        os.getenv("SEARCH_BRIDGE_CACHE_PATH") or DEFAULT_SQLITE_PATH,
+        int(os.getenv("SEARCH_BRIDGE_CACHE_SIZE", str(DEFAULT_MAX_ENTRIES))),
+    )
+
+
+def _spawn_refresh(store: SqliteCache, key: str, plant_payload: dict[str, Any]) -> None:
+    # A one-shot process cannot refresh after it answers, so hand the stale key to a
+    # detached `--refresh-cache` process; the claim keeps it to one refresher per key.
+    if not store.claim_refresh(key):
+        return
+    child = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--refresh-cache"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    child.stdin.write(json.dumps(plant_payload).encode("utf-8"))
+    child.stdin.close()
+
+
+def _searcher_from_env(long_running: bool) -> Any:
+    """The plant-search replica set, wrapped in a cache unless SEARCH_BRIDGE_CACHE=off.
+
+    `auto` (default) keeps the cache in memory for long-running modes and in SQLite
+    for one-shot invocations, which share it across processes.
+    """
+    client = _client_from_env()
+    mode = (os.getenv("SEARCH_BRIDGE_CACHE") or "auto").strip().lower()
+    if mode == "off":
+        return client
+    if mode == "auto":
+        mode = "memory" if long_running else "sqlite"
+
+    ttl = float(os.getenv("SEARCH_BRIDGE_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS)))
+    stale = float(os.getenv("SEARCH_BRIDGE_CACHE_STALE_SECONDS", str(DEFAULT_STALE_SECONDS)))
+    if mode == "sqlite":
+        try:
+            store = _sqlite_cache_from_env()
+        except sqlite3.Error:
+            return client
+        refresh = None if long_running else (lambda key, payload: _spawn_refresh(store, key, payload))
+        return CachedSearch(client, store, ttl=ttl, stale=stale, refresh=refresh)
+    store = MemoryCache(int(os.getenv("SEARCH_BRIDGE_CACHE_SIZE", str(DEFAULT_MAX_ENTRIES))))
+    return CachedSearch(client, store, ttl=ttl, stale=stale)
+
+
+def refresh_cache_entry() -> int:
+    plant_payload = _parse_payload(sys.stdin.read())
+    cached = CachedSearch(_client_from_env(), _sqlite_cache_from_env())
+    cached.fetch(cache_key(plant_payload), plant_payload)
+    return 0
+
+
+def _search_line(client: Any, line: str) -> bytes:
+    request_id = None
     try:
-        incoming = _read_payload()
-        dish_query = incoming.get("dish_query") or incoming.get("dish_name") or incoming.get("query")
-        if not isinstance(dish_query, str) or not dish_query.strip():
-            print(json.dumps({"error": "dish_query is required"}))
-            return 2
-
-        from_dataset = incoming.get("from_dataset")
-        to_dataset = incoming.get("to_dataset")
-        top_n = incoming.get("top_n") or 9
-
-        plant_payload: dict[str, Any] = {
-            "dish_name": dish_query.strip(),
-            "top_n": int(top_n),
-            "from_dataset": from_dataset,
-            "to_dataset": to_dataset,
-        }
-
-        # Pass through optional ranking hints if provided by OffRamp.
-        for key in ("from", "to", "from_category", "to_category", "protein_level", "price_level", "sort_by"):
-            value = incoming.get(key)
-            if value is not None:
-                plant_payload[key] = value
-
-        base_url = (os.getenv("PLANT_SEARCH_API_BASE_URL") or DEFAULT_BASE_URL).strip()
-        timeout_seconds = int(os.getenv("SEARCH_BRIDGE_TIMEOUT_SECONDS", str(DEFAULT_TIMEOUT)))
-        rows = _post_search(base_url, plant_payload, timeout_seconds)
-
-        results: list[dict[str, Any]] = []
-        for row in rows:
-            score = row.get("score")
-            similarity = row.get("similarity", score)
-            results.append(
-                {
-                    "dish_id": row.get("dish_id"),
-                    "name": row.get("name"),
-                    "dish_name": row.get("name"),
-                    "protein": row.get("protein"),
-                    "price_range": row.get("price_range"),
-                    "price": row.get("price_range"),
-                    "availability": row.get("availability"),
-                    "score": score,
-                    "similarity": similarity,
-                    "similarity_score": similarity,
-                    "matched_ingredients": _normalize_ingredients(row.get("matched_ingredients")),
-                    "reasons": _normalize_reasons(row.get("reasons")),
-                    "from_dataset": row.get("from_dataset"),
-                    "to_dataset": row.get("to_dataset"),
-                }
-            )
-
-        print(
-            json.dumps(
-                {
-                    "from_dataset": from_dataset,
-                    "to_dataset": to_dataset,
-                    "query": dish_query.strip(),
-                    "results": results,
-                }
-            )
-        )
+        incoming = _parse_payload(line)
+        request_id = incoming.get("id")
+        body = search(client, incoming)
+    except BridgeError as exc:
+        return json.dumps({"id": request_id, **exc.payload()}).encode("utf-8")
+    except Exception as exc:
+        return json.dumps({"id": request_id, "error": str(exc)}).encode("utf-8")
+    # Splice the id in front of the upstream object rather than decoding it.
+    return b'{"id":' + json.dumps(request_id).encode("utf-8") + b"," + body[1:]
+
+
+def run_batch(
+    client: Any,
+    executor: ThreadPoolExecutor,
+    lines: Iterable[str],
+    emit: Callable[[bytes], None],
+    window: int,
+) -> None:
+    """Search every non-blank line concurrently and `emit` the responses in input order.
+
+    A writer thread emits each response as soon as it and all earlier ones are done,
+    so a caller that writes one line at a time gets answers without closing stdin.
+    At most `window` requests are in flight or waiting to be emitted.
+    """
+    in_order: "queue.Queue[Optional[Future]]" = queue.Queue(maxsize=window)
+
+    def writer() -> None:
+        broken = False
+        while (future := in_order.get()) is not None:
+            response = future.result()
+            if broken:
+                continue
+            try:
+                emit(response)
+            except OSError:
+                # The reader went away; keep draining so the producer never blocks.
+                broken = True
+
+    thread = threading.Thread(target=writer, name="search-bridge-writer", daemon=True)
+    thread.start()
+    try:
+        for line in lines:
+            if line.strip():
+                in_order.put(executor.submit(_search_line, client, line))
+    finally:
+        in_order.put(None)
+        thread.join()
+
+
+def run_ndjson(concurrency: int) -> int:
+    client = _searcher_from_env(long_running=True)
+
+    def emit(response: bytes) -> None:
+        sys.stdout.buffer.write(response + b"\n")
+        sys.stdout.buffer.flush()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="search-bridge") as executor:
+        run_batch(client, executor, sys.stdin, emit, window=concurrency * 2)
+    return 0
+
+
+def run_once() -> int:
+    try:
+        body = search(_searcher_from_env(long_running=False), _parse_payload(sys.stdin.read()))
+        sys.stdout.buffer.write(body + b"\n")
+        sys.stdout.buffer.flush()
         return 0
-    except urllib.error.HTTPError as exc:
-        message = exc.read().decode("utf-8", errors="replace")
-        print(json.dumps({"error": message or str(exc), "status": exc.code}))
-        return 1
+    except BridgeError as exc:
+        print(json.dumps(exc.payload()))
+        return 2 if exc.status == 400 else 1
     except Exception as exc:
         print(json.dumps({"error": str(exc)}))
         return 1
 
 
+def make_server(host: str, port: int, client: Any, concurrency: int) -> ThreadingHTTPServer:
+    # Shared by all batch requests, so its threads' keep-alive connections are reused.
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="search-bridge")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are separate writes; avoid the delayed-ACK stall on keep-alive.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+            pass
+
+        def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+            self._send_body(status, json.dumps(payload).encode("utf-8"))
+
+        def _send_body(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:  # noqa: N802 - stdlib hook name
+            if self.path == "/health":
+                upstream = getattr(client, "source", client)
+                self._send_json(
+                    200,
+                    {"status": "ok", "cache": getattr(client, "stats", None), "upstream": upstream.report()},
+                )
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def _send_batch(self, body: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def emit(response: bytes) -> None:
+                chunk = response + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+
+            run_batch(client, executor, body.splitlines(), emit, window=concurrency * 2)
+            self.wfile.write(b"0\r\n\r\n")
+
+        def do_POST(self) -> None:  # noqa: N802 - stdlib hook name
+            if self.path not in ("/search", "/search/batch"):
+                self._send_json(404, {"error": "not found"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            if self.path == "/search/batch":
+                if length > MAX_BATCH_BYTES:
+                    self.close_connection = True
+                    self._send_json(413, {"error": "payload too large"})
+                    return
+                self._send_batch(self.rfile.read(length).decode("utf-8"))
+                return
+            if length > MAX_PAYLOAD_BYTES:
+                self.close_connection = True
+                self._send_json(413, {"error": "payload too large"})
+                return
+            try:
+                incoming = _parse_payload(self.rfile.read(length).decode("utf-8"))
+                self._send_body(200, search(client, incoming))
+            except BridgeError as exc:
+                self._send_json(exc.status, exc.payload())
+            except ValueError as exc:
+                self._send_json(400, {"error": str(exc)})
+            except Exception as exc:
+                self._send_json(502, {"error": str(exc)})
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host: str, port: int, concurrency: int) -> int:
+    server = make_server(host, port, _searcher_from_env(long_running=True), concurrency)
+    print(f"search_bridge listening on http://{host}:{server.server_address[1]}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="OffRamp to plant-search search bridge.")
+    parser.add_argument("--serve", action="store_true", help="Run as a long-lived local HTTP server")
+    parser.add_argument("--ndjson", action="store_true", help="Read one request per stdin line until EOF")
+    parser.add_argument("--refresh-cache", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("SEARCH_BRIDGE_CONCURRENCY", str(DEFAULT_CONCURRENCY))),
+        help="Concurrent plant-search requests in NDJSON and batch mode",
+    )
+    parser.add_argument("--host", default=os.getenv("SEARCH_BRIDGE_HOST", DEFAULT_SERVE_HOST))
+    parser.add_argument("--port", type=int, default=int(os.getenv("SEARCH_BRIDGE_PORT", str(DEFAULT_SERVE_PORT))))
+    args = parser.parse_args(argv)
+    concurrency = max(1, args.concurrency)
+    if args.serve:
+        return serve(args.host, args.port, concurrency)
+    if args.ndjson:
+        return run_ndjson(concurrency)
+    if args.refresh_cache:
+        return refresh_cache_entry()
+    return run_once()
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
-
@@ -0,0 +1,209 @@
+"""
+Response cache for search_bridge.py.
+
+Entries are encoded bridge responses keyed by the normalized request payload.
+An entry is fresh for `ttl` seconds; for `stale` seconds after that it is still
+served, while a refresh runs in the background (stale-while-revalidate). Both
+stores are LRU-bounded to `max_entries`.
+
+- MemoryCache: in-process, for `--serve` and `--ndjson`.
+- SqliteCache: a small on-disk store shared by one-shot CLI invocations.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Protocol
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_STALE_SECONDS = 3600
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_SQLITE_PATH = os.path.join(tempfile.gettempdir(), "offramp_search_bridge_cache.sqlite3")
+
+
+def cache_key(plant_payload: dict[str, Any]) -> str:
+    """Canonical form of a `/search` payload: key order and nulls ignored.
+
+    The dish name is kept verbatim because the cached body echoes it as `query`.
+    """
+    normalized = {key: value for key, value in plant_payload.items() if value is not None}
+    return json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+
+
+class CacheStore(Protocol):
+    def get(self, key: str) -> Optional[tuple[bytes, float]]: ...
+
+    def put(self, key: str, body: bytes) -> None: ...
+
+
+class MemoryCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple[bytes, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (body, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqliteCache:
+    """Shared by concurrent CLI processes; a locked or unwritable file degrades to misses."""
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max(1, max_entries)
+        self._conn = sqlite3.connect(path, timeout=2, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                used_at REAL NOT NULL,
+                refreshing_at REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS search_responses_used_at ON search_responses (used_at)")
+
+    def get(self, key: str) -> Optional[tuple[bytes, float]]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT body, stored_at FROM search_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute("UPDATE search_responses SET used_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            return None
+        return bytes(row[0]), row[1]
+
+    def put(self, key: str, body: bytes) -> None:
+        now = time.time()
+        try:
+            self._put(key, body, now)
+        except sqlite3.Error:
+            pass
+
+    def _put(self, key: str, body: bytes, now: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_responses (key, body, stored_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(body), now, now),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM search_responses WHERE key IN (
+                    SELECT key FROM search_responses ORDER BY used_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def claim_refresh(self, key: str, lease_seconds: float = 30.0) -> bool:
+        """True for exactly one caller per key until the entry is rewritten or the lease ends."""
+        now = time.time()
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    """
+                    UPDATE search_responses SET refreshing_at = ?
+                    WHERE key = ? AND (refreshing_at IS NULL OR refreshing_at < ?)
+                    """,
+                    (now, key, now - lease_seconds),
+                )
+        except sqlite3.Error:
+            return False
+        return cursor.rowcount == 1
+
+
+class CachedSearch:
+    """Wraps a `search_body(payload)` source with a cache and background refreshes.
+
+    `refresh` schedules a refresh of a stale entry; by default it runs on a small
+    in-process pool, at most once per key at a time. Upstream errors are never
+    cached, and a failed refresh leaves the stale entry in place.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        store: CacheStore,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        stale: float = DEFAULT_STALE_SECONDS,
+        refresh: Optional[Callable[[str, dict[str, Any]], None]] = None,
+    ) -> None:
+        self.source = source
+        self.store = store
+        self.ttl = ttl
+        self.stale = stale
+        self.refresh = refresh or self._refresh_in_background
+        self.stats = {"hit": 0, "stale": 0, "miss": 0}
+        self._refreshing: set[str] = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def search_body(self, plant_payload: dict[str, Any]) -> bytes:
+        key = cache_key(plant_payload)
+        entry = self.store.get(key)
+        if entry is not None:
+            body, stored_at = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self._count("hit")
+                return body
+            if age < self.ttl + self.stale:
+                self._count("stale")
+                self.refresh(key, plant_payload)
+                return body
+        self._count("miss")
+        return self.fetch(key, plant_payload)
+
+    def _count(self, outcome: str) -> None:
+        # Concurrent `--serve` handlers share the counters.
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def fetch(self, key: str, plant_payload: dict[str, Any]) -> bytes:
+        body = self.source.search_body(plant_payload)
+        self.store.put(key, body)
+        return body
+
+    def _refresh_in_background(self, key: str, plant_payload: dict[str, Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-bridge-refresh")
+        self._executor.submit(self._refresh, key, plant_payload)
+
+    def _refresh(self, key: str, plant_payload: dict[str, Any]) -> None:
+        try:
+            self.fetch(key, plant_payload)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
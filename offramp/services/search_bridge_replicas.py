@@ -0,0 +1,236 @@
+"""
+Replica selection for search_bridge.py: latency tracking, circuit breaking, hedging.
+
+Each plant-search base URL gets a latency window and a circuit breaker. A request
+goes to the fastest replica whose breaker is closed; if it has not answered after
+that replica's p95 latency, the same request is sent to the next replica and the
+first successful answer wins. After `failure_threshold` consecutive failures a
+replica is skipped for `reset_seconds`, then tried again with a single request.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Optional
+
+DEFAULT_HEDGE_AFTER_MS = 250.0
+MIN_HEDGE_AFTER_MS = 20.0
+LATENCY_WINDOW = 200
+# Below this many samples the p95 is noise; use the configured default instead.
+MIN_LATENCY_SAMPLES = 20
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ReplicasUnavailable(RuntimeError):
+    pass
+
+
+def _is_replica_failure(exc: BaseException) -> bool:
+    """Whether `exc` counts against the replica: a 4xx is about the request instead."""
+    upstream_status = getattr(exc, "upstream_status", None)
+    return upstream_status is None or upstream_status >= 500
+
+
+def _all_open() -> ReplicasUnavailable:
+    return ReplicasUnavailable("all plant-search replicas are failing; circuit breakers open")
+
+
+class LatencyTracker:
+    """Latencies of the last `window` successful requests to one replica."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 10.0) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether `allow` would let a request through now; changes nothing."""
+        with self._lock:
+            return self.state == CLOSED or time.monotonic() - self.opened_at >= self.reset_seconds
+
+    def allow(self) -> bool:
+        """Whether a request may go out now; call it only right before sending one.
+
+        Once `reset_seconds` have passed since the breaker opened (or since the last
+        half-open trial began), one trial request is let through.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self.opened_at = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class Replica:
+    def __init__(self, base_url: str, client: Any, breaker: CircuitBreaker) -> None:
+        self.base_url = base_url
+        self.client = client
+        self.breaker = breaker
+        self.latency = LatencyTracker()
+
+    def search_body(self, plant_payload: dict[str, Any]) -> bytes:
+        started = time.monotonic()
+        try:
+            body = self.client.search_body(plant_payload)
+        except Exception as exc:
+            if _is_replica_failure(exc):
+                self.breaker.record_failure()
+            raise
+        self.latency.record(time.monotonic() - started)
+        self.breaker.record_success()
+        return body
+
+    def report(self) -> dict[str, Any]:
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+        return {
+            "base_url": self.base_url,
+            "state": self.breaker.state,
+            "failures": self.breaker.failures,
+            "p50_ms": None if p50 is None else round(p50 * 1000, 1),
+            "p95_ms": None if p95 is None else round(p95 * 1000, 1),
+        }
+
+
+class ReplicaSet:
+    """A `search_body` source spread over several plant-search replicas."""
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        hedge: bool = True,
+        default_hedge_after_ms: float = DEFAULT_HEDGE_AFTER_MS,
+        max_workers: int = 16,
+    ) -> None:
+        if not replicas:
+            raise ValueError("at least one plant-search base URL is required")
+        self.replicas = replicas
+        self.hedge = hedge and len(replicas) > 1
+        self.default_hedge_after = default_hedge_after_ms / 1000
+        self.hedged = 0
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-bridge-upstream")
+            if self.hedge
+            else None
+        )
+
+    def _candidates(self) -> list[Replica]:
+        # Fastest first by median latency; unmeasured replicas are shuffled in front
+        # so they collect samples. Breakers are only asked to `allow` right before a
+        # replica is actually tried, so ranking never uses up a half-open trial.
+        ranked = sorted(
+            self.replicas,
+            key=lambda replica: (replica.latency.percentile(50) or 0.0, random.random()),
+        )
+        return [replica for replica in ranked if replica.breaker.available()]
+
+    def _hedge_after(self, replica: Replica) -> float:
+        p95 = replica.latency.percentile(95)
+        return max(MIN_HEDGE_AFTER_MS / 1000, p95 if p95 is not None else self.default_hedge_after)
+
+    def search_body(self, plant_payload: dict[str, Any]) -> bytes:
+        candidates = self._candidates()
+        if not candidates:
+            raise _all_open()
+        if self._executor is None or len(candidates) == 1:
+            return self._sequential(candidates, plant_payload)
+        return self._hedged(candidates, plant_payload)
+
+    def _sequential(self, candidates: list[Replica], plant_payload: dict[str, Any]) -> bytes:
+        last_error: Optional[Exception] = None
+        for replica in candidates:
+            if not replica.breaker.allow():
+                continue
+            try:
+                return replica.search_body(plant_payload)
+            except Exception as exc:
+                if not _is_replica_failure(exc):
+                    raise
+                last_error = exc
+        raise last_error if last_error is not None else _all_open()
+
+    def _hedged(self, candidates: list[Replica], plant_payload: dict[str, Any]) -> bytes:
+        remaining = list(candidates)
+        pending: set[Future] = set()
+        last_error: Optional[Exception] = None
+        timeout: Optional[float] = None
+
+        def launch() -> bool:
+            nonlocal timeout
+            while remaining:
+                replica = remaining.pop(0)
+                if replica.breaker.allow():
+                    pending.add(self._executor.submit(replica.search_body, plant_payload))
+                    timeout = self._hedge_after(replica) if remaining else None
+                    return True
+            timeout = None
+            return False
+
+        launch()
+        while pending:
+            done, not_done = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            pending.clear()
+            pending.update(not_done)
+            for future in done:
+                exc = future.exception()
+                if exc is None:
+                    return future.result()
+                if not _is_replica_failure(exc):
+                    raise exc
+                last_error = exc
+            if not remaining:
+                timeout = None
+            elif not done:
+                # No answer within the replica's p95: hedge on the next one.
+                if launch():
+                    self.hedged += 1
+            elif not pending:
+                # Every attempt so far failed: fail over without waiting.
+                launch()
+        raise last_error if last_error is not None else _all_open()
+
+    def report(self) -> dict[str, Any]:
+        return {"hedged": self.hedged, "replicas": [replica.report() for replica in self.replicas]}
@@ -0,0 +1,108 @@
+"""Serialized-response caching and conditional request helpers."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Optional
+
+from fastapi import Request, Response, status
+
+DEFAULT_DISH_RESPONSE_CACHE_SIZE = 2048
+
+# Clients and shared caches may keep catalog responses but must revalidate
+# them; the ETag makes that a cheap 304 until the catalog changes.
+CATALOG_CACHE_CONTROL = os.getenv("CATALOG_CACHE_CONTROL", "public, max-age=0, must-revalidate")
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    body: bytes
+    etag: str
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag derived from the response bytes, identical on every replica."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def catalog_etag(version_tag: str, route_name: str, params: Iterable[tuple] = ()) -> str:
+    """Weak ETag for a catalog read: the catalog version plus the normalized query.
+
+    It can be computed before any work is done, so a matching `If-None-Match`
+    is answered without filtering or serializing anything.
+    """
+    query = "&".join(f"{key}={value}" for key, value in sorted(params) if value not in (None, ""))
+    digest = hashlib.blake2b(f"{route_name}?{query}".encode("utf-8"), digest_size=8).hexdigest()
+    return f'W/"{version_tag}-{digest}"'
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Evaluate `If-None-Match` against `etag` using weak comparison (RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+class RenderedResponseCache:
+    """LRU of serialized response bodies.
+
+    Keys include the catalog version, so entries rendered before a write are
+    never served afterwards; they simply age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_DISH_RESPONSE_CACHE_SIZE) -> None:
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[Hashable, RenderedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[RenderedResponse]:
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rendered
+
+    def put(self, key: Hashable, body: bytes) -> RenderedResponse:
+        rendered = RenderedResponse(body=body, etag=content_etag(body))
+        if self.max_entries == 0:
+            return rendered
+        with self._lock:
+            self._entries[key] = rendered
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rendered
+
+
+def dish_response_cache_from_env() -> RenderedResponseCache:
+    return RenderedResponseCache(int(os.getenv("DISH_RESPONSE_CACHE_SIZE", str(DEFAULT_DISH_RESPONSE_CACHE_SIZE))))
@@ -0,0 +1,154 @@
+"""SQL for the dish routes that go to PostgreSQL.
+
+Kept out of api.routes so that importing the API does not load psycopg2; the
+routes import this module the first time they touch the database.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from psycopg2 import sql
+from psycopg2.extras import Json, RealDictCursor, execute_values
+
+from db import get_db_connection
+
+
+def name_match_clause(indexed: bool) -> sql.Composable:
+    # A case-insensitive exact match always normalizes to the same value, so the
+    # stored `normalized_name` column alone covers both legacy predicates.
+    if indexed:
+        return sql.SQL("normalized_name = %s")
+    return sql.SQL(
+        "LOWER(name) = LOWER(%s) OR trim(regexp_replace(lower(name), '[^a-z0-9]+', ' ', 'g')) = %s"
+    )
+
+
+def name_match_params(indexed: bool, name: str, normalized_name: str) -> tuple:
+    if indexed:
+        return (normalized_name,)
+    return (name, normalized_name)
+
+
+def query_dish_from_unified_table(
+    cursor: RealDictCursor,
+    name: str,
+    normalized_name: str,
+    indexed: bool = False,
+):
+    query = sql.SQL(
+        """
+        SELECT id, name, category, price_range, availability,
+               taste_features, texture_features, emotion_features, nutrition,
+               created_at, data
+        FROM dishes
+        WHERE {match}
+        ORDER BY CASE WHEN LOWER(name) = LOWER(%s) THEN 0 ELSE 1 END, name
+        LIMIT 1
+        """
+    ).format(match=name_match_clause(indexed))
+    cursor.execute(query, (*name_match_params(indexed, name, normalized_name), name))
+    return cursor.fetchone()
+
+
+def query_dish_from_category_table(
+    cursor: RealDictCursor,
+    *,
+    table_name: str,
+    api_category: str,
+    name: str,
+    normalized_name: str,
+    indexed: bool = False,
+):
+    query = sql.SQL(
+        """
+        SELECT id, name, %s AS category, price_range, availability,
+               taste_features, texture_features, emotion_features, nutrition,
+               NOW() AS created_at, NULL::jsonb AS data
+        FROM {table_name}
+        WHERE {match}
+        ORDER BY CASE WHEN LOWER(name) = LOWER(%s) THEN 0 ELSE 1 END, name
+        LIMIT 1
+        """
+    ).format(table_name=sql.Identifier(table_name), match=name_match_clause(indexed))
+    cursor.execute(query, (api_category, *name_match_params(indexed, name, normalized_name), name))
+    return cursor.fetchone()
+
+
+DISH_INSERT_COLUMNS = """
+    id, name, category, price_range, availability,
+    data, taste_features, texture_features, emotion_features, nutrition,
+    created_at
+"""
+DISH_RETURNING_COLUMNS = """
+    id, name, category, price_range, availability,
+    taste_features, texture_features, emotion_features, nutrition,
+    created_at, data
+"""
+DISH_VALUES_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())"
+BULK_INSERT_PAGE_SIZE = 500
+# Advisory lock taken by inserts while `dishes` has no unique `normalized_name`.
+DISH_NAME_LOCK = "dishes.normalized_name"
+
+
+def dish_insert_values(dish_dict: Dict[str, Any]) -> tuple:
+    return (
+        dish_dict["id"],
+        dish_dict["name"],
+        dish_dict["category"],
+        dish_dict["price_range"],
+        dish_dict["availability"],
+        Json(dish_dict["data"]),
+        Json(dish_dict["taste_features"]),
+        Json(dish_dict["texture_features"]),
+        Json(dish_dict["emotion_features"]),
+        Json(dish_dict["nutrition"]),
+    )
+
+
+def insert_dishes(
+    cursor: RealDictCursor,
+    dish_dicts: List[Dict[str, Any]],
+    indexed: bool,
+) -> List[Dict[str, Any]]:
+    """Insert dishes, skipping existing names and ids; returns only the inserted rows.
+
+    Each page of rows is one `INSERT ... ON CONFLICT DO NOTHING RETURNING`, so a
+    row that collides on the primary key or on the `normalized_name` unique index
+    is skipped atomically. Without that index, existing names are filtered first,
+    under a transaction-level advisory lock so that concurrent API inserts cannot
+    pass the check together; the lock is released at commit.
+    """
+    if not indexed:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (DISH_NAME_LOCK,))
+        cursor.execute(
+            "SELECT LOWER(name) AS name FROM dishes WHERE LOWER(name) = ANY(%s)",
+            ([dish_dict["name"].lower() for dish_dict in dish_dicts],),
+        )
+        existing = {row["name"] for row in cursor.fetchall()}
+        dish_dicts = [dish_dict for dish_dict in dish_dicts if dish_dict["name"].lower() not in existing]
+        if not dish_dicts:
+            return []
+
+    return execute_values(
+        cursor,
+        f"""
+        INSERT INTO dishes ({DISH_INSERT_COLUMNS})
+        VALUES %s
+        ON CONFLICT DO NOTHING
+        RETURNING {DISH_RETURNING_COLUMNS}
+        """,
+        [dish_insert_values(dish_dict) for dish_dict in dish_dicts],
+        template=DISH_VALUES_TEMPLATE,
+        page_size=BULK_INSERT_PAGE_SIZE,
+        fetch=True,
+    )
+
+
+def create_dishes(dish_dicts: List[Dict[str, Any]], indexed: bool) -> List[Dict[str, Any]]:
+    """Insert and commit `dish_dicts` on one pooled connection (blocking)."""
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            inserted = [dict(row) for row in insert_dishes(cursor, dish_dicts, indexed=indexed)]
+            conn.commit()
+    return inserted
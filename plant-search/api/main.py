@@ -1,26 +1,58 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
+import secrets
 from pathlib import Path
+from typing import Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 
-from db import init_db_pool, close_db_pool, get_db_connection
-from engine.extractor import TRANSITION_CATEGORY_KEYS, load_feature_maps_from_db
-from search.dataset_loader import load_dataset_catalog_from_db
+from engine.extractor import TRANSITION_CATEGORY_KEYS
+from search.catalog_sync import CatalogSync
+from search.fixture_source import load_fixture_catalog
+from telemetry import REGISTRY, CallbackMetric, TimingMiddleware, configure_logging, shutdown_logging
 
+from .caching import dish_response_cache_from_env
+from .readiness import Readiness, ReadinessGate
 from .routes import router
 
 load_dotenv()
+configure_logging()
+
+logger = logging.getLogger(__name__)
 
 TOP_N_DEFAULT = int(os.getenv("TOP_N_DEFAULT", "10"))
+CATALOG_CHANGE_FEED = os.getenv("CATALOG_CHANGE_FEED", "listen").strip().lower()
+CATALOG_CHANGE_POLL_SECONDS = float(os.getenv("CATALOG_CHANGE_POLL_SECONDS", "2"))
+DB_PING_INTERVAL_SECONDS = float(os.getenv("DB_PING_INTERVAL_SECONDS", "10"))
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "off").strip().lower()
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").strip().lower() in {"1", "true", "yes"}
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").strip().lower() in {"1", "true", "yes"}
+# `postgres` (default) or `fixture`: a JSONL file, see search/fixture_source.py.
+DATA_SOURCE = os.getenv("PLANT_SEARCH_DATA_SOURCE", "postgres").strip().lower()
+FIXTURE_PATH = os.getenv("PLANT_SEARCH_FIXTURE_PATH", "").strip()
+# Admin endpoints are disabled unless a token is configured.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "").strip()
+# `false` for API-only deployments: no `/` page and no `/ui` static mount.
+SERVE_UI = os.getenv("SERVE_UI", "true").strip().lower() in {"1", "true", "yes"}
+# `background` binds immediately and loads the catalog behind the readiness gate;
+# `blocking` finishes loading before the server accepts connections.
+STARTUP_MODE = os.getenv("STARTUP_MODE", "background").strip().lower()
 UI_DIR = Path(__file__).resolve().parents[1] / "ui"
 
 app = FastAPI(title="Plant-Based Transition Engine", version="2.0.0")
+readiness = Readiness()
+app.state.readiness = readiness
+
+# Innermost, so early 503s still get CORS headers and are timed.
+app.add_middleware(ReadinessGate, readiness=readiness)
 
 # Add CORS middleware
 app.add_middleware(
@@ -29,61 +61,265 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Link"],
+)
+
+# Compression is opt-in: deployments behind a proxy or CDN usually compress there.
+if RESPONSE_COMPRESSION in {"br", "gzip"}:
+    from fastapi.middleware.gzip import GZipMiddleware
+
+    if RESPONSE_COMPRESSION == "br":
+        try:
+            from brotli_asgi import BrotliMiddleware
+
+            app.add_middleware(BrotliMiddleware, minimum_size=RESPONSE_COMPRESSION_MIN_BYTES, gzip_fallback=True)
+        except ImportError:
+            logger.warning("RESPONSE_COMPRESSION=br needs brotli-asgi; falling back to gzip")
+            app.add_middleware(GZipMiddleware, minimum_size=RESPONSE_COMPRESSION_MIN_BYTES)
+    else:
+        app.add_middleware(GZipMiddleware, minimum_size=RESPONSE_COMPRESSION_MIN_BYTES)
+
+# Outermost, so request timings include compression and CORS handling.
+if METRICS_ENABLED or SERVER_TIMING_ENABLED:
+    app.add_middleware(TimingMiddleware, server_timing=SERVER_TIMING_ENABLED)
+
+
+def _collect_cache_requests():
+    cache = getattr(app.state, "dish_response_cache", None)
+    if cache is None:
+        return []
+    return [
+        ({"cache": "dish_response", "result": "hit"}, cache.hits),
+        ({"cache": "dish_response", "result": "miss"}, cache.misses),
+    ]
+
+
+def _collect_pool_connections():
+    # The pool exists only once the postgres load path has imported `db`.
+    if getattr(app.state, "db_ping", None) is None:
+        return []
+    from db import pool_stats
+
+    return [({"state": key}, value) for key, value in (pool_stats() or {}).items()]
+
+
+REGISTRY.register(
+    CallbackMetric(
+        "plant_search_cache_requests_total",
+        "Response cache lookups by cache and result.",
+        "counter",
+        _collect_cache_requests,
+    )
 )
+REGISTRY.register(
+    CallbackMetric(
+        "plant_search_db_pool_connections",
+        "Pooled database connections by state.",
+        "gauge",
+        _collect_pool_connections,
+    )
+)
+REGISTRY.register(
+    CallbackMetric(
+        "plant_search_catalog_version",
+        "Last catalog change applied by this replica.",
+        "gauge",
+        lambda: [({}, getattr(getattr(app.state, "catalog_sync", None), "version", 0))],
+    )
+)
+
+
+if METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        """Prometheus text exposition of request, span and cache metrics."""
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+# The profiler (tracemalloc, frame walking) is only imported when it can be used;
+# without ADMIN_TOKEN the routes do not exist and answer 404.
+if ADMIN_TOKEN:
+    from telemetry.profiler import MAX_PROFILE_SECONDS, ProfilerBusy, allocation_diff, format_collapsed, sample_stacks
+
+    def _require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+        if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+            raise HTTPException(status.HTTP_403_FORBIDDEN, "Invalid admin token")
 
+    @app.get("/admin/profile/cpu", include_in_schema=False, dependencies=[Depends(_require_admin)])
+    async def profile_cpu(
+        seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS),
+        interval_ms: float = Query(5.0, ge=1, le=100),
+    ) -> PlainTextResponse:
+        """Sample this worker's stacks and return them in collapsed (flamegraph) format."""
+        try:
+            counts = await run_in_threadpool(sample_stacks, seconds, interval_ms / 1000)
+        except ProfilerBusy as exc:
+            raise HTTPException(status.HTTP_409_CONFLICT, str(exc))
+        return PlainTextResponse(
+            format_collapsed(counts),
+            headers={
+                "Content-Disposition": f'attachment; filename="plant-search-{os.getpid()}.collapsed"',
+                "X-Worker-Pid": str(os.getpid()),
+            },
+        )
 
-@app.get("/")
-async def serve_ui():
-    """Serve the main UI page at root."""
-    return FileResponse(UI_DIR / "index.html")
+    @app.get("/admin/profile/allocations", include_in_schema=False, dependencies=[Depends(_require_admin)])
+    async def profile_allocations(
+        seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS),
+        top: int = Query(25, ge=1, le=200),
+        frames: int = Query(1, ge=1, le=25),
+    ):
+        """Diff tracemalloc snapshots taken `seconds` apart on this worker."""
+        try:
+            report = await run_in_threadpool(allocation_diff, seconds, top, frames)
+        except ProfilerBusy as exc:
+            raise HTTPException(status.HTTP_409_CONFLICT, str(exc))
+        return {"pid": os.getpid(), "seconds": seconds, **report}
 
 
 app.include_router(router)
 
-# Mount static files (must be after routes to avoid conflicts)
-app.mount("/ui", StaticFiles(directory=str(UI_DIR)), name="ui")
+if SERVE_UI:
+    from fastapi.responses import FileResponse
+    from fastapi.staticfiles import StaticFiles
+
+    @app.get("/")
+    async def serve_ui():
+        """Serve the main UI page at root."""
+        return FileResponse(UI_DIR / "index.html")
+
+    # Mount static files (must be after routes to avoid conflicts)
+    app.mount("/ui", StaticFiles(directory=str(UI_DIR)), name="ui")
+
+
+def _load_fixture_state() -> None:
+    """Serve reads from a JSONL fixture; no database connection is opened."""
+    if not FIXTURE_PATH:
+        raise RuntimeError("PLANT_SEARCH_DATA_SOURCE=fixture needs PLANT_SEARCH_FIXTURE_PATH")
+    fixture = load_fixture_catalog(Path(FIXTURE_PATH))
+    app.state.catalog_sync = CatalogSync(app.state)
+    app.state.feature_maps = fixture.feature_maps
+    app.state.missing_feature_map_categories = set(fixture.missing_categories)
+    app.state.dataset_catalog = fixture.dataset_catalog
+    app.state.dish_store = fixture.dish_store
+    app.state.dish_response_cache = dish_response_cache_from_env()
+    app.state.normalized_name_tables = set()
+    logger.info(
+        "startup: loaded %d dishes, %d detail entries from fixture %s",
+        fixture.total_count,
+        len(fixture.dish_store),
+        FIXTURE_PATH,
+    )
+
+
+def _load_database_state() -> CatalogSync:
+    """Open the pool and load every in-memory map from PostgreSQL (blocking).
+
+    psycopg2 and the database loaders are imported here, so fixture deployments
+    never load them.
+    """
+    from db import NORMALIZED_NAME_COLUMN, DatabasePing, get_db_connection, init_db_pool, tables_with_column
+    from engine.extractor import load_feature_maps_from_db
+    from search.dataset_loader import load_dataset_catalog_from_db
+    from search.dish_store import dish_tables, load_dish_store_from_db
+
+    logger.info("startup: initializing AWS RDS PostgreSQL connection")
+
+    # Initialize database connection pool
+    init_db_pool(min_conn=2, max_conn=20)
+
+    # Test connection
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            logger.info("startup: connected to AWS RDS")
+
+    app.state.db_ping = DatabasePing(interval=DB_PING_INTERVAL_SECONDS)
+
+    catalog_sync = CatalogSync(app.state)
+    if CATALOG_CHANGE_FEED != "off":
+        catalog_sync.initialize()
+    app.state.catalog_sync = catalog_sync
+
+    logger.info("startup: loading feature maps into memory")
+    feature_maps, category_counts, total_count, missing_categories = load_feature_maps_from_db()
+    app.state.feature_maps = feature_maps
+    app.state.missing_feature_map_categories = set(missing_categories)
+    app.state.dataset_catalog = load_dataset_catalog_from_db()
+    app.state.dish_store = load_dish_store_from_db()
+    app.state.dish_response_cache = dish_response_cache_from_env()
+    app.state.normalized_name_tables = tables_with_column(dish_tables(), NORMALIZED_NAME_COLUMN)
+
+    logger.info(
+        "startup: loaded %d dishes, %d detail entries",
+        total_count,
+        len(app.state.dish_store),
+        extra={"category_counts": {key: category_counts.get(key, 0) for key in TRANSITION_CATEGORY_KEYS}},
+    )
+    missing_indexed = sorted(set(dish_tables()) - app.state.normalized_name_tables)
+    if missing_indexed:
+        logger.warning(
+            "startup: normalized_name missing or table absent: %s (run python -m db.migrate)",
+            ", ".join(missing_indexed),
+        )
+    return catalog_sync
+
+
+async def _load_catalog() -> None:
+    """Load the catalog off the event loop, then open the readiness gate."""
+    try:
+        if DATA_SOURCE == "fixture":
+            await run_in_threadpool(_load_fixture_state)
+        else:
+            catalog_sync = await run_in_threadpool(_load_database_state)
+            from search.catalog_listener import CatalogChangeListener
+
+            app.state.catalog_listener = CatalogChangeListener(
+                catalog_sync,
+                mode=CATALOG_CHANGE_FEED,
+                poll_interval=CATALOG_CHANGE_POLL_SECONDS,
+            )
+            await app.state.catalog_listener.start()
+            if catalog_sync.feed_enabled:
+                logger.info("startup: catalog change feed %s (version %d)", CATALOG_CHANGE_FEED, catalog_sync.version)
+            else:
+                logger.info("startup: catalog change feed disabled (off, or catalog_changes table missing)")
+    except Exception as exc:
+        readiness.mark_failed(exc)
+        logger.exception("startup: failed to load the catalog")
+        if STARTUP_MODE == "blocking":
+            raise
+        return
+
+    readiness.mark_ready()
+    logger.info("startup: ready in %.2fs", readiness.load_seconds)
 
 
 @app.on_event("startup")
 async def startup_event() -> None:
-    """Initialize database connection pool on startup."""
+    """Load the catalog, in the background unless STARTUP_MODE=blocking."""
     app.state.top_n_default = TOP_N_DEFAULT
-    
-    print("[STARTUP] Initializing AWS RDS PostgreSQL connection...")
-    
-    try:
-        # Initialize database connection pool
-        init_db_pool(min_conn=2, max_conn=20)
-        
-        # Test connection
-        with get_db_connection() as conn:
-            with conn.cursor() as cursor:
-                print(f"[STARTUP] Connected to AWS RDS successfully")
-
-        print("[STARTUP] Loading feature maps into memory for fast scoring...")
-        feature_maps, category_counts, total_count, missing_categories = load_feature_maps_from_db()
-        app.state.feature_maps = feature_maps
-        app.state.missing_feature_map_categories = set(missing_categories)
-        app.state.dataset_catalog = load_dataset_catalog_from_db()
-
-        print("[STARTUP] Category counts:")
-        for key in TRANSITION_CATEGORY_KEYS:
-            print(f"- {key}: {category_counts.get(key, 0)}")
-        print(f"[STARTUP] Total dishes: {total_count}")
-        
-        print("[STARTUP] System ready - using AWS RDS PostgreSQL database")
-        
-    except Exception as e:
-        print(f"[STARTUP ERROR] Failed to initialize database: {e}")
-        raise
+    if STARTUP_MODE == "blocking":
+        await _load_catalog()
+        return
+    app.state.catalog_loader = asyncio.get_running_loop().create_task(_load_catalog())
 
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
     """Close database connection pool on shutdown."""
-    print("[SHUTDOWN] Closing database connections...")
-    close_db_pool()
-    print("[SHUTDOWN] Database connections closed")
+    loader = getattr(app.state, "catalog_loader", None)
+    if loader is not None and not loader.done():
+        loader.cancel()
+    listener = getattr(app.state, "catalog_listener", None)
+    if listener is not None:
+        await listener.stop()
+    if DATA_SOURCE != "fixture":
+        from db import close_db_pool
+
+        logger.info("shutdown: closing database connections")
+        close_db_pool()
+    shutdown_logging()
 
 
 if __name__ == "__main__":
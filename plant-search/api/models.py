@@ -139,6 +139,12 @@ class HealthResponse(BaseModel):
     dish_count: int
 
 
+class BulkCreateResponse(BaseModel):
+    inserted: int
+    created_ids: List[str] = Field(default_factory=list)
+    skipped: List[str] = Field(default_factory=list, description="Names skipped as duplicates")
+
+
 class DeleteResponse(BaseModel):
     status: str
     deleted_id: str
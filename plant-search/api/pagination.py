@@ -0,0 +1,31 @@
+"""Opaque keyset cursors for paginated catalog listings."""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+from typing import Tuple
+
+DISHES_PAGE_SIZE = int(os.getenv("DISHES_PAGE_SIZE", "50"))
+DISHES_MAX_PAGE_SIZE = int(os.getenv("DISHES_MAX_PAGE_SIZE", "500"))
+# Rows serialized per chunk when streaming NDJSON.
+NDJSON_CHUNK_SIZE = 500
+
+
+def encode_cursor(key: Tuple[str, str]) -> str:
+    """Encode a catalog sort key as a URL-safe cursor."""
+    raw = json.dumps(list(key), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of `encode_cursor`; raises ValueError for anything it did not produce."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (UnicodeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(part, str) for part in key)):
+        raise ValueError("invalid cursor")
+    return key[0], key[1]
@@ -0,0 +1,73 @@
+"""Startup readiness: serve health checks while the catalog loads in the background."""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Dict, Optional
+
+STARTING = "starting"
+READY = "ready"
+FAILED = "failed"
+
+# Paths answered before the catalog is loaded; everything else gets 503.
+ALWAYS_AVAILABLE_PATHS = ("/health", "/livez", "/readyz", "/metrics", "/admin/", "/docs", "/openapi.json", "/ui", "/favicon.ico")
+
+
+class Readiness:
+    """Load state of one worker; written by the startup task, read per request."""
+
+    def __init__(self) -> None:
+        self.state = STARTING
+        self.error: Optional[str] = None
+        self.started_at = time.monotonic()
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def mark_ready(self) -> None:
+        self.load_seconds = time.monotonic() - self.started_at
+        self.state = READY
+
+    def mark_failed(self, exc: BaseException) -> None:
+        self.load_seconds = time.monotonic() - self.started_at
+        self.error = f"{type(exc).__name__}: {exc}"
+        self.state = FAILED
+
+
+class ReadinessGate:
+    """ASGI middleware returning 503 for data routes until `readiness` is ready.
+
+    Once the worker is ready this is a single attribute check per request.
+    """
+
+    def __init__(self, app: Any, readiness: Readiness, retry_after: int = 2) -> None:
+        self.app = app
+        self.readiness = readiness
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if (
+            self.readiness.ready
+            or scope["type"] != "http"
+            or scope["path"] == "/"
+            or scope["path"].startswith(ALWAYS_AVAILABLE_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": f"Service is {self.readiness.state}"}).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"retry-after", str(self.retry_after).encode("latin-1")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
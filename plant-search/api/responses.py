@@ -0,0 +1,51 @@
+"""Fast JSON responses for rows that are already shaped like the response model.
+
+Returning a `Response` from a route skips FastAPI's `response_model`
+validation and `jsonable_encoder` pass, so rows built by the search layer are
+serialized straight to bytes once. The declared `response_model` still
+documents the shape in OpenAPI.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+DEFAULT_FAST_RESPONSE_ROUTES = "search,dishes"
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize plain Python data (dicts, lists, str, numbers, datetimes) to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def _configured_routes() -> set[str]:
+    raw = os.getenv("FAST_RESPONSE_ROUTES", DEFAULT_FAST_RESPONSE_ROUTES)
+    return {item.strip().lower() for item in raw.split(",") if item.strip()}
+
+
+FAST_RESPONSE_ROUTES = _configured_routes()
+
+
+def fast_responses_enabled(route_name: str) -> bool:
+    """Whether `route_name` should skip response_model validation (FAST_RESPONSE_ROUTES)."""
+    return route_name in FAST_RESPONSE_ROUTES
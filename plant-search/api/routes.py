@@ -1,30 +1,47 @@
 from __future__ import annotations
 
 import logging
+import os
 import re
-import uuid
-from datetime import datetime
-from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Query, Request, status
-from psycopg2 import sql
-from psycopg2.extras import RealDictCursor, Json
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 
-from db import get_db_connection
 from engine.extractor import (
     CATEGORY_TABLES,
     TRANSITION_CATEGORY_KEYS,
     dict_to_dish_response,
-    dict_to_features,
+    dish_create_to_db_dict,
     normalize_transition_category,
 )
-from search.dataset_loader import DatasetCatalog, find_dish_in_dataset, load_dataset_catalog_from_db
+from search.catalog_sync import CatalogSync
+from search.dataset_loader import (
+    DatasetCatalog,
+    DatasetDish,
+    catalog_sort_key,
+    find_dish_in_dataset,
+    iter_catalog_dishes,
+)
+from search.dish_store import UNIFIED_TABLE, DishDetail, DishDetailStore
 from search.ranking_engine import rank_with_ingredients
-from search.result_formatter import build_search_results
+from search.result_formatter import build_bridge_results, build_search_results
 from search.suggestion_engine import rank_suggestions
-
+from telemetry import SEARCH_CANDIDATES, SOURCE_LOOKUPS, SampledLog, span, timed
+
+from .caching import (
+    RenderedResponseCache,
+    cache_headers,
+    catalog_etag,
+    dish_response_cache_from_env,
+    etag_matches,
+    not_modified,
+)
 from .models import (
+    BulkCreateResponse,
     DatasetResponse,
     DeleteResponse,
     DishCreate,
@@ -34,9 +51,23 @@ from .models import (
     SearchRequest,
     SearchResult,
 )
+from .pagination import DISHES_MAX_PAGE_SIZE, DISHES_PAGE_SIZE, NDJSON_CHUNK_SIZE, decode_cursor, encode_cursor
+from .readiness import FAILED, Readiness
+from .responses import FastJSONResponse, dumps, fast_responses_enabled
+
+# psycopg2, `db` and the SQL in .dish_queries are imported by the routes that
+# query PostgreSQL, so a fixture-backed API never loads them.
+if TYPE_CHECKING:
+    from db import DatabasePing
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
+# Source lookups run on every /search; log one in N misses/fallbacks per event.
+_lookup_log = SampledLog(logger, int(os.getenv("LOOKUP_LOG_SAMPLE_EVERY", "100")))
+# Dishes accepted by one POST /dishes/bulk; larger seeds go through db.import_catalog.
+DISHES_BULK_MAX = int(os.getenv("DISHES_BULK_MAX", "2000"))
+
+CATEGORY_TABLE_CATEGORIES = {table_name: category for category, table_name in CATEGORY_TABLES.items()}
 
 
 def _normalize_transition_value(value: Optional[str]) -> Optional[str]:
@@ -89,6 +120,48 @@ def _get_dataset_catalog(request: Request) -> Optional[DatasetCatalog]:
     return None
 
 
+def _get_catalog_sync(request: Request) -> CatalogSync:
+    sync = getattr(request.app.state, "catalog_sync", None)
+    if not isinstance(sync, CatalogSync):
+        sync = CatalogSync(request.app.state)
+        request.app.state.catalog_sync = sync
+    return sync
+
+
+def _get_dish_response_cache(request: Request) -> RenderedResponseCache:
+    cache = getattr(request.app.state, "dish_response_cache", None)
+    if not isinstance(cache, RenderedResponseCache):
+        cache = dish_response_cache_from_env()
+        request.app.state.dish_response_cache = cache
+    return cache
+
+
+def _get_normalized_name_tables(request: Request) -> set[str]:
+    tables = getattr(request.app.state, "normalized_name_tables", None)
+    if isinstance(tables, set):
+        return tables
+    return set()
+
+
+def _get_dish_store(request: Request) -> Optional[DishDetailStore]:
+    store = getattr(request.app.state, "dish_store", None)
+    if isinstance(store, DishDetailStore):
+        return store
+    return None
+
+
+def _get_readiness(request: Request) -> Optional[Readiness]:
+    readiness = getattr(request.app.state, "readiness", None)
+    if isinstance(readiness, Readiness):
+        return readiness
+    return None
+
+
+def _get_db_ping(request: Request) -> Optional[DatabasePing]:
+    # Only the postgres load path sets it, with a db.DatabasePing.
+    return getattr(request.app.state, "db_ping", None)
+
+
 def _normalize_dish_name(value: str) -> str:
     normalized = re.sub(r"[^a-z0-9]+", " ", value.strip().lower())
     normalized = re.sub(r"\s+", " ", normalized).strip()
@@ -119,16 +192,22 @@ def _resolve_dataset_name(
     return None
 
 
+@timed("find_source_feature")
 def _find_source_feature(source_map: Dict[str, Any], dish_name: str, source_category: str):
     normalized_target = _normalize_dish_name(dish_name)
     if not normalized_target:
-        logger.info(
-            "source lookup miss: requested='%s' normalized='%s' from='%s' fallback_used=false reason='empty-normalized'",
-            dish_name,
-            normalized_target,
-            source_category,
+        _lookup_log.info(
+            "source_lookup_miss",
+            "source lookup miss",
+            requested=dish_name,
+            normalized=normalized_target,
+            source_category=source_category,
+            fallback_used=False,
+            reason="empty-normalized",
         )
+        SOURCE_LOOKUPS.inc(result="miss")
         return None
+    from difflib import SequenceMatcher
 
     candidates: List[tuple[Any, str, str]] = []
     for feature in source_map.values():
@@ -140,6 +219,7 @@ def _find_source_feature(source_map: Dict[str, Any], dish_name: str, source_cate
 
     for feature, normalized_name, _ in candidates:
         if normalized_name == normalized_target:
+            SOURCE_LOOKUPS.inc(result="exact")
             return feature
 
     best_feature = None
@@ -158,15 +238,18 @@ def _find_source_feature(source_map: Dict[str, Any], dish_name: str, source_cate
                 best_method = "substring"
 
     if best_feature and best_score >= 0.70:
-        logger.info(
-            "source lookup fallback: requested='%s' normalized='%s' from='%s' fallback_used=true matched='%s' method='%s' score=%.3f",
-            dish_name,
-            normalized_target,
-            source_category,
-            best_name,
-            best_method,
-            best_score,
+        _lookup_log.info(
+            "source_lookup_fallback",
+            "source lookup fallback",
+            requested=dish_name,
+            normalized=normalized_target,
+            source_category=source_category,
+            fallback_used=True,
+            matched=best_name,
+            method=best_method,
+            score=round(best_score, 3),
         )
+        SOURCE_LOOKUPS.inc(result=best_method)
         return best_feature
 
     for feature, normalized_name, raw_name in candidates:
@@ -178,25 +261,31 @@ def _find_source_feature(source_map: Dict[str, Any], dish_name: str, source_cate
             best_method = "similarity"
 
     if best_feature and best_score >= 0.78:
-        logger.info(
-            "source lookup fallback: requested='%s' normalized='%s' from='%s' fallback_used=true matched='%s' method='%s' score=%.3f",
-            dish_name,
-            normalized_target,
-            source_category,
-            best_name,
-            best_method,
-            best_score,
+        _lookup_log.info(
+            "source_lookup_fallback",
+            "source lookup fallback",
+            requested=dish_name,
+            normalized=normalized_target,
+            source_category=source_category,
+            fallback_used=True,
+            matched=best_name,
+            method=best_method,
+            score=round(best_score, 3),
         )
+        SOURCE_LOOKUPS.inc(result=best_method)
         return best_feature
 
-    logger.info(
-        "source lookup miss: requested='%s' normalized='%s' from='%s' fallback_used=false best_method='%s' best_score=%.3f",
-        dish_name,
-        normalized_target,
-        source_category,
-        best_method or "none",
-        best_score,
+    _lookup_log.info(
+        "source_lookup_miss",
+        "source lookup miss",
+        requested=dish_name,
+        normalized=normalized_target,
+        source_category=source_category,
+        fallback_used=False,
+        method=best_method or "none",
+        score=round(best_score, 3),
     )
+    SOURCE_LOOKUPS.inc(result="miss")
     return None
 
 
@@ -216,114 +305,16 @@ def _transition_category_to_api_category(transition_category: str) -> str:
     return "vegan"
 
 
-def _query_dish_from_unified_table(cursor: RealDictCursor, name: str, normalized_name: str):
-    cursor.execute(
-        """
-        SELECT id, name, category, price_range, availability,
-               taste_features, texture_features, emotion_features, nutrition,
-               created_at, data
-        FROM dishes
-        WHERE LOWER(name) = LOWER(%s)
-           OR trim(regexp_replace(lower(name), '[^a-z0-9]+', ' ', 'g')) = %s
-        ORDER BY CASE WHEN LOWER(name) = LOWER(%s) THEN 0 ELSE 1 END, name
-        LIMIT 1
-        """,
-        (name, normalized_name, name),
-    )
-    return cursor.fetchone()
-
-
-def _query_dish_from_category_table(
-    cursor: RealDictCursor,
-    *,
-    table_name: str,
-    api_category: str,
-    name: str,
-    normalized_name: str,
-):
-    query = sql.SQL(
-        """
-        SELECT id, name, %s AS category, price_range, availability,
-               taste_features, texture_features, emotion_features, nutrition,
-               NOW() AS created_at, NULL::jsonb AS data
-        FROM {table_name}
-        WHERE LOWER(name) = LOWER(%s)
-           OR trim(regexp_replace(lower(name), '[^a-z0-9]+', ' ', 'g')) = %s
-        ORDER BY CASE WHEN LOWER(name) = LOWER(%s) THEN 0 ELSE 1 END, name
-        LIMIT 1
-        """
-    ).format(table_name=sql.Identifier(table_name))
-    cursor.execute(query, (api_category, name, normalized_name, name))
-    return cursor.fetchone()
-
-
-def _dish_to_db_dict(dish: DishCreate) -> Dict[str, Any]:
-    """Convert DishCreate model to dictionary for database insertion."""
-    dish_id = dish.id or str(uuid.uuid4())
-    
-    taste_features = {
-        "umami_depth": {
-            "level": dish.taste_features.umami_depth.level,
-            "source": dish.taste_features.umami_depth.source,
-        },
-        "seasoning_profile": {
-            "salt_level": dish.taste_features.seasoning_profile.salt_level,
-            "sweet_level": dish.taste_features.seasoning_profile.sweet_level,
-            "sour_level": dish.taste_features.seasoning_profile.sour_level,
-            "bitter_level": dish.taste_features.seasoning_profile.bitter_level,
-            "spice_heat": dish.taste_features.seasoning_profile.spice_heat,
-        },
-        "flavor_base": {
-            "primary": dish.taste_features.flavor_base.primary,
-            "secondary": dish.taste_features.flavor_base.secondary,
-        },
-        "taste_intensity": {
-            "overall": dish.taste_features.taste_intensity.overall,
-            "complexity": dish.taste_features.taste_intensity.complexity,
-        },
-        "aftertaste": {
-            "type": dish.taste_features.aftertaste.type,
-            "duration": dish.taste_features.aftertaste.duration,
-        },
-    }
-    
-    nutrition = {
-        "protein": dish.nutrition.protein,
-        "energy": dish.nutrition.energy,
-        "fat": dish.nutrition.fat,
-    }
-    
-    # Full data object (combines all fields)
-    data = {
-        "id": dish_id,
-        "name": dish.name,
-        "category": dish.category,
-        "taste_features": taste_features,
-        "texture_features": dish.texture_features,
-        "emotion_features": dish.emotion_features,
-        "nutrition": nutrition,
-        "price_range": dish.price_range,
-        "availability": dish.availability,
-        "created_at": datetime.now().isoformat(),
-    }
-    
-    return {
-        "id": dish_id,
-        "name": dish.name,
-        "category": dish.category,
-        "price_range": dish.price_range,
-        "availability": dish.availability,
-        "data": data,
-        "taste_features": taste_features,
-        "texture_features": dish.texture_features,
-        "emotion_features": dish.emotion_features,
-        "nutrition": nutrition,
-    }
+def _dish_detail_to_dict(store: DishDetailStore, entry: DishDetail) -> Dict[str, Any]:
+    dish = dict(entry.row)
+    if entry.table_name != UNIFIED_TABLE:
+        transition_category = CATEGORY_TABLE_CATEGORIES.get(entry.table_name, "")
+        dish["category"] = _transition_category_to_api_category(transition_category)
+    dish["data"] = store.load_data(entry)
+    return dish
 
 
-@router.post("/search", response_model=List[SearchResult])
-async def search_dishes(request: Request, payload: SearchRequest) -> List[SearchResult]:
-    """Search for vegan alternatives to a non-vegan dish using AWS RDS database."""
+def _rank_search(request: Request, payload: SearchRequest) -> List[Dict[str, Any]]:
     top_n_default = getattr(request.app.state, "top_n_default", 10)
     top_n = payload.top_n or top_n_default
     from_value = _normalize_transition_value(payload.from_category or payload.from_)
@@ -351,18 +342,19 @@ async def search_dishes(request: Request, payload: SearchRequest) -> List[Search
         source_category = dataset_catalog.dataset_to_category.get(from_dataset)
     source_category = source_category or "non-vegan"
 
-    source_map = _resolve_category_map(feature_maps, source_category)
-    if from_value and not source_map and from_value in missing_categories:
-        source_map = _resolve_category_map(feature_maps, "non-vegan")
-    source_features = _find_source_feature(source_map, payload.dish_name, source_category)
-    if not source_features:
-        return []
+    with span("resolve"):
+        source_map = _resolve_category_map(feature_maps, source_category)
+        if from_value and not source_map and from_value in missing_categories:
+            source_map = _resolve_category_map(feature_maps, "non-vegan")
+        source_features = _find_source_feature(source_map, payload.dish_name, source_category)
+        if not source_features:
+            return []
 
-    source_ingredients: List[str] = []
-    if dataset_catalog and from_dataset:
-        source_dish = find_dish_in_dataset(dataset_catalog, from_dataset, payload.dish_name)
-        if source_dish:
-            source_ingredients = source_dish.ingredients
+        source_ingredients: List[str] = []
+        if dataset_catalog and from_dataset:
+            source_dish = find_dish_in_dataset(dataset_catalog, from_dataset, payload.dish_name)
+            if source_dish:
+                source_ingredients = source_dish.ingredients
 
     if to_dataset and dataset_catalog:
         to_category = dataset_catalog.dataset_to_category.get(to_dataset, "")
@@ -396,6 +388,7 @@ async def search_dishes(request: Request, payload: SearchRequest) -> List[Search
 
     if not filtered_map:
         return []
+    SEARCH_CANDIDATES.observe(len(filtered_map))
     
     candidate_ingredients: Dict[str, List[str]] = {}
     if dataset_catalog and to_dataset:
@@ -411,15 +404,43 @@ async def search_dishes(request: Request, payload: SearchRequest) -> List[Search
 
     from_dataset_label = from_dataset or source_category
     to_dataset_label = to_dataset or (to_category or "all")
-    response_rows = build_search_results(
-        ranked_rows=ranked_full,
-        candidate_features=filtered_map,
-        source_name=source_features.name,
-        from_dataset=from_dataset_label,
-        to_dataset=to_dataset_label,
-        top_n=top_n,
-    )
-    return [SearchResult(**item) for item in response_rows]
+    with span("format"):
+        return build_search_results(
+            ranked_rows=ranked_full,
+            candidate_features=filtered_map,
+            source_name=source_features.name,
+            from_dataset=from_dataset_label,
+            to_dataset=to_dataset_label,
+            top_n=top_n,
+        )
+
+
+@router.post("/search", response_model=List[SearchResult])
+async def search_dishes(
+    request: Request,
+    payload: SearchRequest,
+    shape: str = Query("default", pattern="^(default|bridge)$"),
+) -> List[SearchResult]:
+    """Search for vegan alternatives to a non-vegan dish using AWS RDS database.
+
+    `shape=bridge` returns the envelope offramp's search bridge emits
+    (`from_dataset`, `to_dataset`, `query`, `results` with its field aliases), so
+    the bridge can pass the body through untouched.
+    """
+    response_rows = _rank_search(request, payload)
+    with span("serialize"):
+        if shape == "bridge":
+            return FastJSONResponse(
+                {
+                    "from_dataset": payload.from_dataset,
+                    "to_dataset": payload.to_dataset,
+                    "query": payload.dish_name.strip(),
+                    "results": build_bridge_results(response_rows),
+                }
+            )
+        if fast_responses_enabled("search"):
+            return FastJSONResponse(response_rows)
+        return [SearchResult(**item) for item in response_rows]
 
 
 @router.get("/dish/{name}", response_model=DishResponse)
@@ -429,11 +450,41 @@ async def get_dish(name: str, request: Request) -> DishResponse:
     if not normalized_name:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Dish not found")
 
-    dish = None
     missing_categories = _get_missing_feature_map_categories(request)
+    store = _get_dish_store(request)
+    if store is not None:
+        skip_tables = {CATEGORY_TABLES[category] for category in missing_categories if category in CATEGORY_TABLES}
+        entry = store.lookup(name, skip_tables)
+        if not entry:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Dish not found")
+
+        cache = _get_dish_response_cache(request)
+        cache_key = (entry.table_name, entry.dish_id, _get_catalog_sync(request).version_tag)
+        rendered = cache.get(cache_key)
+        if rendered is None:
+            dish_response = dict_to_dish_response(_dish_detail_to_dict(store, entry))
+            rendered = cache.put(cache_key, dumps(jsonable_encoder(dish_response)))
+
+        headers = cache_headers(rendered.etag)
+        if etag_matches(request, rendered.etag):
+            return not_modified(headers)
+        return FastJSONResponse(rendered.body, headers=headers)
+
+    from db import get_db_connection
+    from psycopg2.extras import RealDictCursor
+
+    from .dish_queries import query_dish_from_category_table, query_dish_from_unified_table
+
+    dish = None
+    indexed_tables = _get_normalized_name_tables(request)
     with get_db_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            dish = _query_dish_from_unified_table(cursor, name, normalized_name)
+            dish = query_dish_from_unified_table(
+                cursor,
+                name,
+                normalized_name,
+                indexed=UNIFIED_TABLE in indexed_tables,
+            )
 
             if not dish:
                 for transition_category in TRANSITION_CATEGORY_KEYS:
@@ -442,12 +493,13 @@ async def get_dish(name: str, request: Request) -> DishResponse:
                     table_name = CATEGORY_TABLES.get(transition_category)
                     if not table_name:
                         continue
-                    dish = _query_dish_from_category_table(
+                    dish = query_dish_from_category_table(
                         cursor,
                         table_name=table_name,
                         api_category=_transition_category_to_api_category(transition_category),
                         name=name,
                         normalized_name=normalized_name,
+                        indexed=table_name in indexed_tables,
                     )
                     if dish:
                         logger.info(
@@ -467,69 +519,81 @@ async def get_dish(name: str, request: Request) -> DishResponse:
 @router.post("/dish/add", response_model=DishResponse, status_code=status.HTTP_201_CREATED)
 async def add_dish(request: Request, payload: DishCreate) -> DishResponse:
     """Add a new dish to AWS RDS database."""
-    
-    # Check for duplicate name
-    with get_db_connection() as conn:
-        with conn.cursor() as cursor:
-            cursor.execute(
-                "SELECT COUNT(*) FROM dishes WHERE LOWER(name) = LOWER(%s)",
-                (payload.name,)
-            )
-            if cursor.fetchone()[0] > 0:
-                raise HTTPException(status.HTTP_409_CONFLICT, "Dish with that name already exists")
-    
+    from .dish_queries import create_dishes
+
     # Convert to database format
-    dish_dict = _dish_to_db_dict(payload)
-    
-    # Insert into database
-    with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute(
-                """
-                INSERT INTO dishes (
-                    id, name, category, price_range, availability,
-                    data, taste_features, texture_features, emotion_features, nutrition,
-                    created_at
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                RETURNING id, name, category, price_range, availability,
-                          taste_features, texture_features, emotion_features, nutrition,
-                          created_at, data
-                """,
-                (
-                    dish_dict["id"],
-                    dish_dict["name"],
-                    dish_dict["category"],
-                    dish_dict["price_range"],
-                    dish_dict["availability"],
-                    Json(dish_dict["data"]),
-                    Json(dish_dict["taste_features"]),
-                    Json(dish_dict["texture_features"]),
-                    Json(dish_dict["emotion_features"]),
-                    Json(dish_dict["nutrition"]),
-                ),
-            )
-            
-            new_dish = cursor.fetchone()
-            conn.commit()
+    dish_dict = dish_create_to_db_dict(payload)
     
-    # Update in-memory feature maps cache.
-    feature_maps = _get_feature_maps(request)
-    transition_category = normalize_transition_category(dish_dict["data"].get("diet") or dish_dict["category"])
-    feature_maps.setdefault(transition_category, {})
-    feature_maps[transition_category][dish_dict["id"]] = dict_to_features(
-        {**dish_dict, "category": transition_category}
+    # Duplicate check and insert share one connection; one statement once migrated.
+    inserted = await run_in_threadpool(
+        create_dishes,
+        [dish_dict],
+        UNIFIED_TABLE in _get_normalized_name_tables(request),
     )
-    request.app.state.feature_maps = feature_maps
-    request.app.state.dataset_catalog = load_dataset_catalog_from_db()
+
+    new_dish = inserted[0] if inserted else None
+    if not new_dish:
+        raise HTTPException(status.HTTP_409_CONFLICT, "Dish with that name or id already exists")
+    
+    await _get_catalog_sync(request).record_local_write(UNIFIED_TABLE, rows=[dict(new_dish)])
     
     return dict_to_dish_response(dict(new_dish))
 
 
+@router.post("/dishes/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def add_dishes_bulk(request: Request, payload: List[DishCreate]) -> BulkCreateResponse:
+    """Insert many dishes in batched statements, skipping names and ids that already exist.
+
+    At most `DISHES_BULK_MAX` dishes per request; the inserts run on a worker
+    thread so other requests keep being served.
+    """
+    if len(payload) > DISHES_BULK_MAX:
+        raise HTTPException(
+            status.HTTP_413_CONTENT_TOO_LARGE,
+            f"At most {DISHES_BULK_MAX} dishes per request; use python -m db.import_catalog for larger imports",
+        )
+    from .dish_queries import create_dishes
+
+    dish_dicts: List[Dict[str, Any]] = []
+    skipped: List[str] = []
+    seen_names: set[str] = set()
+    seen_ids: set[str] = set()
+    for item in payload:
+        normalized_name = _normalize_dish_name(item.name)
+        if normalized_name in seen_names or (item.id and item.id in seen_ids):
+            skipped.append(item.name)
+            continue
+        seen_names.add(normalized_name)
+        if item.id:
+            seen_ids.add(item.id)
+        dish_dicts.append(dish_create_to_db_dict(item))
+
+    inserted: List[Dict[str, Any]] = []
+    if dish_dicts:
+        inserted = await run_in_threadpool(
+            create_dishes,
+            dish_dicts,
+            UNIFIED_TABLE in _get_normalized_name_tables(request),
+        )
+
+    inserted_ids = {row["id"] for row in inserted}
+    skipped.extend(dish["name"] for dish in dish_dicts if dish["id"] not in inserted_ids)
+
+    if inserted:
+        await _get_catalog_sync(request).record_local_write(UNIFIED_TABLE, rows=inserted)
+
+    return BulkCreateResponse(
+        inserted=len(inserted),
+        created_ids=[row["id"] for row in inserted],
+        skipped=skipped,
+    )
+
+
 @router.delete("/dish/{dish_id}", response_model=DeleteResponse)
 async def delete_dish(dish_id: str, request: Request) -> DeleteResponse:
     """Delete a dish from AWS RDS database."""
-    
+    from db import get_db_connection
+
     with get_db_connection() as conn:
         with conn.cursor() as cursor:
             # Check if dish exists and get its category
@@ -543,20 +607,47 @@ async def delete_dish(dish_id: str, request: Request) -> DeleteResponse:
             cursor.execute("DELETE FROM dishes WHERE id = %s", (dish_id,))
             conn.commit()
     
-    # Remove from all in-memory feature maps cache entries.
-    feature_maps = _get_feature_maps(request)
-    for dataset in feature_maps.values():
-        if isinstance(dataset, dict):
-            dataset.pop(dish_id, None)
-    request.app.state.feature_maps = feature_maps
-    request.app.state.dataset_catalog = load_dataset_catalog_from_db()
+    await _get_catalog_sync(request).record_local_write(UNIFIED_TABLE, deleted_ids=[dish_id])
     
     return DeleteResponse(status="deleted", deleted_id=dish_id)
 
 
+def _dish_summary_row(dish: DatasetDish) -> Dict[str, str]:
+    return {
+        "id": dish.dish_id,
+        "name": dish.name,
+        "category": dish.category,
+        "price_range": dish.price_range,
+        "protein": dish.protein,
+    }
+
+
+async def _stream_dishes_ndjson(
+    catalog: DatasetCatalog,
+    datasets: List[str],
+    protein: Optional[str],
+    price_range: Optional[str],
+):
+    # Each chunk is read without yielding to the event loop and the next one
+    # resumes from the last key, so catalog writes between chunks are safe.
+    after = None
+    while True:
+        chunk = list(
+            islice(
+                iter_catalog_dishes(catalog, datasets, protein=protein, price_range=price_range, after=after),
+                NDJSON_CHUNK_SIZE,
+            )
+        )
+        if not chunk:
+            return
+        yield b"".join(dumps(_dish_summary_row(dish)) + b"\n" for dish in chunk)
+        after = catalog_sort_key(chunk[-1])
+
+
 @router.get("/dishes", response_model=List[DishSummary])
 async def list_dishes(
     request: Request,
+    response: Response,
     category: Optional[str] = Query(None),
     protein: Optional[str] = None,
     price_range: Optional[str] = None,
@@ -566,12 +657,30 @@ async def list_dishes(
     from_dataset: Optional[str] = Query(None),
     to_dataset: Optional[str] = Query(None),
     dataset: Optional[str] = Query(None),
+    limit: int = Query(DISHES_PAGE_SIZE, ge=1, le=DISHES_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    format_: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
 ) -> List[DishSummary]:
-    """List dishes with optional filtering from dataset catalog (autocomplete-safe)."""
+    """List dishes with optional filtering from dataset catalog (autocomplete-safe).
+
+    With `name`, returns the best `limit` suggestions. Otherwise dishes are listed
+    in name order, one page at a time: the `X-Next-Cursor` header of a page is the
+    `cursor` of the next. `format=ndjson` streams every matching dish instead; it
+    cannot be combined with `name`.
+    """
+    if name and format_ == "ndjson":
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "format=ndjson cannot be combined with name")
+
     catalog = _get_dataset_catalog(request)
     if not catalog:
         return []
 
+    headers = cache_headers(
+        catalog_etag(_get_catalog_sync(request).version_tag, "dishes", request.query_params.multi_items())
+    )
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+
     from_value = _normalize_transition_value(from_)
     to_value = _normalize_transition_value(to)
     active_dataset = (from_dataset or to_dataset or dataset or "").strip().lower()
@@ -579,42 +688,66 @@ async def list_dishes(
         active_dataset = _resolve_dataset_name(catalog, from_value or to_value, None, "") or ""
 
     if active_dataset and active_dataset in catalog.dishes_by_dataset:
-        pools = [catalog.dishes_by_dataset[active_dataset]]
+        datasets = [active_dataset]
     else:
-        pools = list(catalog.dishes_by_dataset.values())
-
-    dishes = [dish for pool in pools for dish in pool]
+        datasets = list(catalog.dishes_by_dataset)
 
     if category:
         normalized_category = _normalize_transition_value(category) or category.strip().lower()
-        dishes = [dish for dish in dishes if dish.category == normalized_category]
-    if protein:
-        dishes = [dish for dish in dishes if dish.protein == protein.strip().lower()]
-    if price_range:
-        dishes = [dish for dish in dishes if dish.price_range == price_range]
+        datasets = [item for item in datasets if catalog.dataset_to_category.get(item) == normalized_category]
+    protein_value = protein.strip().lower() if protein else None
+    price_range_value = price_range or None
 
     if name:
-        ranked = rank_suggestions(name, dishes, limit=50)
+        candidates = list(
+            iter_catalog_dishes(catalog, datasets, protein=protein_value, price_range=price_range_value)
+        )
+        ranked = rank_suggestions(name, candidates, limit=limit)
+    elif format_ == "ndjson":
+        return StreamingResponse(
+            _stream_dishes_ndjson(catalog, datasets, protein_value, price_range_value),
+            media_type="application/x-ndjson",
+            headers=headers,
+        )
     else:
-        ranked = sorted(dishes, key=lambda item: item.name.lower())[:50]
-
-    return [
-        DishSummary(
-            id=dish.dish_id,
-            name=dish.name,
-            category=dish.category,
-            price_range=dish.price_range,
-            protein=dish.protein,
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+        page = list(
+            islice(
+                iter_catalog_dishes(
+                    catalog,
+                    datasets,
+                    protein=protein_value,
+                    price_range=price_range_value,
+                    after=after,
+                ),
+                limit + 1,
+            )
         )
-        for dish in ranked
-    ]
+        ranked = page[:limit]
+        if len(page) > limit:
+            next_cursor = encode_cursor(catalog_sort_key(ranked[-1]))
+            headers["X-Next-Cursor"] = next_cursor
+            headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+
+    if fast_responses_enabled("dishes"):
+        return FastJSONResponse([_dish_summary_row(dish) for dish in ranked], headers=headers)
+    response.headers.update(headers)
+    return [DishSummary(**_dish_summary_row(dish)) for dish in ranked]
 
 
 @router.get("/datasets", response_model=List[DatasetResponse])
-async def list_datasets(request: Request) -> List[DatasetResponse]:
+async def list_datasets(request: Request, response: Response) -> List[DatasetResponse]:
     catalog = _get_dataset_catalog(request)
     if not catalog:
         return []
+
+    headers = cache_headers(catalog_etag(_get_catalog_sync(request).version_tag, "datasets"))
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+    response.headers.update(headers)
     return [
         DatasetResponse(
             category=item.category,
@@ -626,13 +759,67 @@ async def list_datasets(request: Request) -> List[DatasetResponse]:
     ]
 
 
+def _in_memory_dish_count(request: Request) -> int:
+    store = _get_dish_store(request)
+    if store is not None:
+        return len(store)
+    # The vegetarian map may alias the veg map, so count distinct ids.
+    return len({dish_id for dataset in _get_feature_maps(request).values() for dish_id in dataset})
+
+
 @router.get("/health", response_model=HealthResponse)
-async def health_check() -> HealthResponse:
-    """Health check endpoint with database dish count from AWS RDS."""
-    
-    with get_db_connection() as conn:
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT COUNT(*) FROM dishes")
-            total_count = cursor.fetchone()[0]
-    
-    return HealthResponse(status="ok", dish_count=total_count)
+async def health_check(request: Request, response: Response) -> HealthResponse:
+    """Health check with the in-memory dish count; never touches the database."""
+    readiness = _get_readiness(request)
+    if readiness is not None and not readiness.ready:
+        # Still loading (or failed to load): keep load balancers from routing here.
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return HealthResponse(status=readiness.state, dish_count=0)
+    return HealthResponse(status="ok", dish_count=_in_memory_dish_count(request))
+
+
+@router.get("/livez", include_in_schema=False)
+async def liveness(request: Request, response: Response) -> Dict[str, Any]:
+    """Liveness: the event loop answers. Fails only if the catalog can never load."""
+    readiness = _get_readiness(request)
+    if readiness is not None and readiness.state == FAILED:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": FAILED, "error": readiness.error}
+    return {"status": "alive"}
+
+
+@router.get("/readyz", include_in_schema=False)
+async def readiness_check(request: Request, response: Response) -> Dict[str, Any]:
+    """Readiness from in-memory state plus a cached, rate-limited database ping.
+
+    Reads are served from memory, so an unreachable database only degrades the
+    report; it does not take the replica out of rotation.
+    """
+    readiness = _get_readiness(request)
+    ready = readiness is None or readiness.ready
+    catalog = _get_dataset_catalog(request)
+    body: Dict[str, Any] = {
+        "status": "ok" if ready else (readiness.state if readiness else "starting"),
+        "catalog": {
+            "state": readiness.state if readiness else "ready",
+            "error": readiness.error if readiness else None,
+            "load_seconds": readiness.load_seconds if readiness else None,
+            "version": _get_catalog_sync(request).version_tag,
+            "feature_maps": {key: len(dataset) for key, dataset in _get_feature_maps(request).items()},
+            "datasets": len(catalog.datasets) if catalog is not None else 0,
+        },
+    }
+
+    ping = _get_db_ping(request)
+    if ping is None:
+        body["database"] = None
+    else:
+        if ready and ping.due():
+            await run_in_threadpool(ping.check)
+        body["database"] = ping.report()
+        if ready and ping.last_error is not None:
+            body["status"] = "degraded"
+
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return body
@@ -1,5 +1,16 @@
 """Database connection and utilities."""
 
-from .connection import get_db_connection, close_db_connection, init_db_pool, close_db_pool
+from .connection import get_db_connection, close_db_connection, init_db_pool, close_db_pool, pool_stats
+from .health import DatabasePing
+from .schema import NORMALIZED_NAME_COLUMN, tables_with_column
 
-__all__ = ["get_db_connection", "close_db_connection", "init_db_pool", "close_db_pool"]
+__all__ = [
+    "get_db_connection",
+    "close_db_connection",
+    "init_db_pool",
+    "close_db_pool",
+    "pool_stats",
+    "DatabasePing",
+    "NORMALIZED_NAME_COLUMN",
+    "tables_with_column",
+]
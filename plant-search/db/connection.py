@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import logging
 import os
+import threading
 from contextlib import contextmanager
 from typing import Any, Dict, Generator, Optional
 
@@ -10,8 +12,15 @@ import psycopg2
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
 
-# Global connection pool
-_connection_pool: Optional[psycopg2.pool.SimpleConnectionPool] = None
+logger = logging.getLogger(__name__)
+
+# Global connection pool; threaded because the readiness ping and startup load
+# borrow connections from worker threads while the event loop uses it too.
+_connection_pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+
+# Connections currently checked out through get_db_connection.
+_checked_out = 0
+_checked_out_lock = threading.Lock()
 
 
 def get_db_config() -> Dict[str, Any]:
@@ -33,17 +42,19 @@ def init_db_pool(min_conn: int = 1, max_conn: int = 20) -> None:
         return
     
     config = get_db_config()
-    print(f"[DB] Initializing connection pool to {config['host']}:{config['port']}/{config['database']}")
+    logger.info(
+        "initializing connection pool to %s:%s/%s", config["host"], config["port"], config["database"]
+    )
     
     try:
-        _connection_pool = psycopg2.pool.SimpleConnectionPool(
+        _connection_pool = psycopg2.pool.ThreadedConnectionPool(
             min_conn,
             max_conn,
             **config
         )
-        print(f"[DB] Connection pool initialized successfully ({min_conn}-{max_conn} connections)")
-    except Exception as e:
-        print(f"[DB ERROR] Failed to initialize connection pool: {e}")
+        logger.info("connection pool initialized (%d-%d connections)", min_conn, max_conn)
+    except Exception:
+        logger.exception("failed to initialize connection pool")
         raise
 
 
@@ -54,7 +65,15 @@ def close_db_pool() -> None:
     if _connection_pool is not None:
         _connection_pool.closeall()
         _connection_pool = None
-        print("[DB] Connection pool closed")
+        logger.info("connection pool closed")
+
+
+def pool_stats() -> Optional[Dict[str, int]]:
+    """Connections checked out and allowed in the pool; None before init."""
+    connection_pool = _connection_pool
+    if connection_pool is None or connection_pool.closed:
+        return None
+    return {"in_use": _checked_out, "max": connection_pool.maxconn}
 
 
 @contextmanager
@@ -70,16 +89,22 @@ def get_db_connection() -> Generator[psycopg2.extensions.connection, None, None]
     if _connection_pool is None:
         init_db_pool()
     
-    conn = _connection_pool.getconn()
+    global _checked_out
+    connection_pool = _connection_pool
+    conn = connection_pool.getconn()
+    with _checked_out_lock:
+        _checked_out += 1
     
     try:
         yield conn
     except Exception as e:
         conn.rollback()
-        print(f"[DB ERROR] Transaction rolled back: {e}")
+        logger.warning("transaction rolled back: %s", e)
         raise
     finally:
-        _connection_pool.putconn(conn)
+        with _checked_out_lock:
+            _checked_out -= 1
+        connection_pool.putconn(conn)
 
 
 def close_db_connection(conn: psycopg2.extensions.connection) -> None:
@@ -0,0 +1,76 @@
+"""Cached, rate-limited database ping for readiness probes."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import psycopg2
+
+from .connection import get_db_connection, pool_stats
+
+DEFAULT_PING_INTERVAL_SECONDS = 10.0
+DEFAULT_PING_TIMEOUT_MS = 1000
+
+
+class DatabasePing:
+    """`SELECT 1` at most once per `interval` seconds, however often it is asked.
+
+    Probes read the cached result; only the first caller after the interval
+    runs the query, and concurrent callers never wait on it. The ping is also
+    skipped while every pooled connection is checked out, since borrowing one
+    would fail or compete with requests; pool saturation is reported instead.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_PING_INTERVAL_SECONDS,
+        timeout_ms: int = DEFAULT_PING_TIMEOUT_MS,
+    ) -> None:
+        self.interval = interval
+        self.timeout_ms = timeout_ms
+        self.last_ok_at: Optional[float] = None
+        self.last_checked_at: Optional[float] = None
+        self.last_latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def due(self) -> bool:
+        return self.last_checked_at is None or time.monotonic() - self.last_checked_at >= self.interval
+
+    def check(self) -> None:
+        """Ping if due; blocking, so call it from a worker thread."""
+        if not self.due() or not self._lock.acquire(blocking=False):
+            return
+        try:
+            stats = pool_stats()
+            if stats is not None and stats["in_use"] >= stats["max"]:
+                return
+            started = time.monotonic()
+            with get_db_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SET LOCAL statement_timeout = %s", (self.timeout_ms,))
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+                conn.rollback()
+            self.last_latency_ms = (time.monotonic() - started) * 1000
+            self.last_ok_at = time.monotonic()
+            self.last_error = None
+        except psycopg2.Error as exc:
+            self.last_error = f"{type(exc).__name__}: {str(exc).strip()}"
+        finally:
+            self.last_checked_at = time.monotonic()
+            self._lock.release()
+
+    def report(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        stats = pool_stats()
+        if stats is not None:
+            stats = {**stats, "saturation": round(stats["in_use"] / max(stats["max"], 1), 3)}
+        return {
+            "last_ok_seconds_ago": None if self.last_ok_at is None else round(now - self.last_ok_at, 3),
+            "latency_ms": None if self.last_latency_ms is None else round(self.last_latency_ms, 2),
+            "error": self.last_error,
+            "pool": stats,
+        }
@@ -0,0 +1,311 @@
+"""Bulk-load dishes into a dish table with COPY.
+
+Rows are streamed from a JSONL or CSV file, validated in batches against
+`api.models.DishCreate`, copied into a temporary staging table with
+`COPY ... FROM STDIN`, and merged into the target table with one
+`INSERT ... SELECT` per batch.
+
+Usage:
+    python -m db.import_catalog regional.jsonl --table dishes_vegan
+    python -m db.import_catalog regional.csv --table dishes_jain --upsert
+
+CSV files use one column per `DishCreate` field; nested fields
+(`taste_features`, `nutrition`) hold JSON, list fields hold JSON arrays or
+`;`-separated values. The full input record is kept in the `data` column so
+fields such as `ingredients` or `image` stay available to the catalog.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from pydantic import ValidationError
+
+from .connection import get_db_connection
+from .schema import NORMALIZED_NAME_COLUMN, tables_with_column
+
+DEFAULT_BATCH_SIZE = 2000
+MAX_REPORTED_ERRORS = 20
+
+STAGING_TABLE = "dish_import_staging"
+STAGING_COLUMNS = (
+    "id",
+    "name",
+    "price_range",
+    "availability",
+    "taste_features",
+    "texture_features",
+    "emotion_features",
+    "nutrition",
+    "data",
+)
+JSON_COLUMNS = {"taste_features", "texture_features", "emotion_features", "nutrition", "data"}
+CSV_JSON_FIELDS = {"taste_features", "nutrition"}
+CSV_LIST_FIELDS = {"texture_features", "emotion_features"}
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    valid: int = 0
+    invalid: int = 0
+    merged: int = 0
+    batches: int = 0
+    started_at: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.perf_counter() - self.started_at, 1e-9)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed
+
+
+def _parse_csv_list(value: str) -> List[str]:
+    text = (value or "").strip()
+    if not text:
+        return []
+    if text.startswith("["):
+        return json.loads(text)
+    return [item.strip() for item in text.split(";") if item.strip()]
+
+
+def _iter_jsonl(path: Path) -> Iterator[Tuple[int, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, exc
+
+
+def _iter_csv(path: Path) -> Iterator[Tuple[int, Any]]:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(handle)
+        for line_number, record in enumerate(reader, start=2):
+            try:
+                row: Dict[str, Any] = {
+                    key: value for key, value in record.items() if key and value not in (None, "")
+                }
+                for key in CSV_JSON_FIELDS & row.keys():
+                    row[key] = json.loads(row[key])
+                for key in CSV_LIST_FIELDS & row.keys():
+                    row[key] = _parse_csv_list(row[key])
+                yield line_number, row
+            except json.JSONDecodeError as exc:
+                yield line_number, exc
+
+
+def iter_records(path: Path, file_format: Optional[str] = None) -> Iterator[Tuple[int, Any]]:
+    """Yield `(line_number, record_or_error)` pairs without loading the whole file."""
+    resolved = file_format or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+    if resolved == "csv":
+        return _iter_csv(path)
+    return _iter_jsonl(path)
+
+
+def _default_category(table_name: str) -> str:
+    return "non-vegan" if table_name == "dishes_non_vegan" else "vegan"
+
+
+def validate_batch(
+    records: List[Tuple[int, Any]],
+    table_name: str,
+    errors: List[str],
+) -> List[Dict[str, Any]]:
+    """Validate raw records with DishCreate and convert them to staging rows."""
+    from api.models import DishCreate
+    from engine.extractor import dish_create_to_db_dict
+
+    rows: List[Dict[str, Any]] = []
+    for line_number, record in records:
+        if isinstance(record, Exception):
+            errors.append(f"line {line_number}: {record}")
+            continue
+        if not isinstance(record, dict):
+            errors.append(f"line {line_number}: expected an object")
+            continue
+        try:
+            dish = DishCreate(**{"category": _default_category(table_name), **record})
+        except (ValidationError, TypeError) as exc:
+            errors.append(f"line {line_number}: {exc}".replace("\n", " "))
+            continue
+
+        dish_dict = dish_create_to_db_dict(dish)
+        dish_dict["data"] = {**record, **dish_dict["data"]}
+        rows.append(dish_dict)
+    return rows
+
+
+def _rows_to_copy_buffer(rows: List[Dict[str, Any]]) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            [
+                json.dumps(row[column], ensure_ascii=False, default=str) if column in JSON_COLUMNS else row[column]
+                for column in STAGING_COLUMNS
+            ]
+        )
+    buffer.seek(0)
+    return buffer
+
+
+def _create_staging_table(cursor) -> None:
+    cursor.execute(
+        f"""
+        CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+            id TEXT,
+            name TEXT,
+            price_range TEXT,
+            availability TEXT,
+            taste_features JSONB,
+            texture_features JSONB,
+            emotion_features JSONB,
+            nutrition JSONB,
+            data JSONB
+        ) ON COMMIT DELETE ROWS
+        """
+    )
+
+
+def _merge_query(table_name: str, indexed: bool, upsert: bool) -> str:
+    columns = ", ".join(STAGING_COLUMNS)
+    deduped = f"""
+        SELECT DISTINCT ON (trim(regexp_replace(lower(name), '[^a-z0-9]+', ' ', 'g'))) {columns}
+        FROM {STAGING_TABLE}
+        ORDER BY trim(regexp_replace(lower(name), '[^a-z0-9]+', ' ', 'g')), id
+    """
+    if indexed:
+        if upsert:
+            updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in STAGING_COLUMNS if column != "id")
+            conflict = f"ON CONFLICT ({NORMALIZED_NAME_COLUMN}) DO UPDATE SET {updates}"
+        else:
+            conflict = f"ON CONFLICT ({NORMALIZED_NAME_COLUMN}) DO NOTHING"
+        return f"""
+            INSERT INTO {table_name} ({columns})
+            {deduped}
+            {conflict}
+        """
+    return f"""
+        INSERT INTO {table_name} ({columns})
+        SELECT {columns} FROM ({deduped}) AS incoming
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {table_name} existing WHERE LOWER(existing.name) = LOWER(incoming.name)
+        )
+    """
+
+
+def iter_batches(records: Iterator[Tuple[int, Any]], batch_size: int) -> Iterator[List[Tuple[int, Any]]]:
+    batch: List[Tuple[int, Any]] = []
+    for item in records:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_catalog(
+    path: Path,
+    table_name: str,
+    *,
+    file_format: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    upsert: bool = False,
+    dry_run: bool = False,
+) -> ImportStats:
+    stats = ImportStats(started_at=time.perf_counter())
+    errors: List[str] = []
+
+    def validated_batches() -> Iterator[List[Dict[str, Any]]]:
+        for batch in iter_batches(iter_records(path, file_format), batch_size):
+            error_count = len(errors)
+            rows = validate_batch(batch, table_name, errors)
+            stats.read += len(batch)
+            stats.valid += len(rows)
+            stats.invalid += len(errors) - error_count
+            stats.batches += 1
+            yield rows
+
+    def report_progress() -> None:
+        print(
+            f"[IMPORT] batch {stats.batches}: read={stats.read} valid={stats.valid} "
+            f"invalid={stats.invalid} merged={stats.merged} ({stats.rows_per_second:.0f} rows/s)"
+        )
+
+    if dry_run:
+        for _ in validated_batches():
+            report_progress()
+    else:
+        indexed = bool(tables_with_column([table_name], NORMALIZED_NAME_COLUMN))
+        if upsert and not indexed:
+            raise SystemExit(
+                f"--upsert needs the {NORMALIZED_NAME_COLUMN} column on {table_name}; run python -m db.migrate"
+            )
+        merge_query = _merge_query(table_name, indexed, upsert)
+        copy_query = f"COPY {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                _create_staging_table(cursor)
+                conn.commit()
+
+                for rows in validated_batches():
+                    if rows:
+                        cursor.copy_expert(copy_query, _rows_to_copy_buffer(rows))
+                        cursor.execute(merge_query)
+                        stats.merged += max(cursor.rowcount, 0)
+                        conn.commit()
+                    report_progress()
+
+    for message in errors[:MAX_REPORTED_ERRORS]:
+        print(f"[IMPORT] invalid {message}", file=sys.stderr)
+    if len(errors) > MAX_REPORTED_ERRORS:
+        print(f"[IMPORT] ... {len(errors) - MAX_REPORTED_ERRORS} more invalid rows", file=sys.stderr)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from engine.extractor import CATEGORY_TABLES
+
+    parser = argparse.ArgumentParser(description="Bulk-import dishes into a plant-search dish table.")
+    parser.add_argument("path", type=Path, help="JSONL or CSV file with one dish per row")
+    parser.add_argument("--table", required=True, choices=sorted(CATEGORY_TABLES.values()))
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from file extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--upsert", action="store_true", help="Update existing dishes instead of skipping them")
+    parser.add_argument("--dry-run", action="store_true", help="Validate only; do not write to the database")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    stats = import_catalog(
+        args.path,
+        args.table,
+        file_format=args.format,
+        batch_size=max(1, args.batch_size),
+        upsert=args.upsert,
+        dry_run=args.dry_run,
+    )
+    print(
+        f"[IMPORT] done: read={stats.read} valid={stats.valid} invalid={stats.invalid} "
+        f"merged={stats.merged} in {stats.elapsed:.1f}s ({stats.rows_per_second:.0f} rows/s)"
+    )
+    return 0 if stats.invalid == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""Apply the SQL migrations in `db/migrations` in filename order.
+
+Usage:
+    python -m db.migrate            # apply pending migrations
+    python -m db.migrate --list     # show applied/pending state only
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import List, Optional, Set
+
+from dotenv import load_dotenv
+
+from .connection import get_db_connection
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+
+def _ensure_migrations_table(cursor) -> None:
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version TEXT PRIMARY KEY,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+        """
+    )
+
+
+def _applied_versions(cursor) -> Set[str]:
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migration_files() -> List[Path]:
+    return sorted(MIGRATIONS_DIR.glob("*.sql"))
+
+
+def apply_migrations(list_only: bool = False) -> List[str]:
+    """Apply pending migrations, each in its own transaction, and return their versions."""
+    applied_now: List[str] = []
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            _ensure_migrations_table(cursor)
+            conn.commit()
+            applied = _applied_versions(cursor)
+
+            for path in migration_files():
+                version = path.stem
+                if version in applied:
+                    print(f"[MIGRATE] {version}: already applied")
+                    continue
+                if list_only:
+                    print(f"[MIGRATE] {version}: pending")
+                    continue
+
+                print(f"[MIGRATE] {version}: applying")
+                cursor.execute(path.read_text(encoding="utf-8"))
+                cursor.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+                conn.commit()
+                applied_now.append(version)
+
+    return applied_now
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply plant-search SQL migrations.")
+    parser.add_argument("--list", action="store_true", help="Only report applied and pending migrations.")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    applied = apply_migrations(list_only=args.list)
+    if not args.list:
+        print(f"[MIGRATE] Applied {len(applied)} migration(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+-- Stored, index-backed normalized dish names.
+--
+-- `normalized_name` mirrors the API's name normalization (lower-case, runs of
+-- non-alphanumerics collapsed to one space, trimmed) so exact lookups and
+-- duplicate checks become unique-index seeks and fuzzy lookups can use pg_trgm.
+--
+-- The unique index fails if a table already holds two names that normalize to
+-- the same value. Find them first with:
+--   SELECT normalized_name, array_agg(id) FROM <table>
+--   GROUP BY normalized_name HAVING COUNT(*) > 1;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DO $$
+DECLARE
+    tbl text;
+BEGIN
+    FOREACH tbl IN ARRAY ARRAY[
+        'dishes',
+        'dishes_non_vegan',
+        'dishes_veg',
+        'dishes_vegetarian',
+        'dishes_vegan',
+        'dishes_jain',
+        'dishes_keto'
+    ]
+    LOOP
+        IF to_regclass(format('public.%I', tbl)) IS NULL THEN
+            CONTINUE;
+        END IF;
+
+        EXECUTE format(
+            'ALTER TABLE public.%I ADD COLUMN IF NOT EXISTS normalized_name text '
+            'GENERATED ALWAYS AS (trim(regexp_replace(lower(name), ''[^a-z0-9]+'', '' '', ''g''))) STORED',
+            tbl
+        );
+        EXECUTE format(
+            'CREATE UNIQUE INDEX IF NOT EXISTS %I ON public.%I (normalized_name)',
+            tbl || '_normalized_name_key',
+            tbl
+        );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS %I ON public.%I USING gin (normalized_name gin_trgm_ops)',
+            tbl || '_normalized_name_trgm',
+            tbl
+        );
+    END LOOP;
+END
+$$;
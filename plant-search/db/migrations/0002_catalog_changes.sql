@@ -0,0 +1,64 @@
+-- Change log for cross-replica cache invalidation.
+--
+-- Every insert, update and delete on a dish table appends a row to
+-- `catalog_changes` and sends an empty NOTIFY on the `catalog_changes`
+-- channel. API replicas LISTEN on that channel (or poll the table) and apply
+-- the changes after the last id they have seen to their in-memory maps.
+--
+-- The log is append-only; prune it periodically, e.g.
+--   DELETE FROM catalog_changes WHERE created_at < NOW() - INTERVAL '7 days';
+
+CREATE TABLE IF NOT EXISTS catalog_changes (
+    id BIGSERIAL PRIMARY KEY,
+    op TEXT NOT NULL CHECK (op IN ('upsert', 'delete')),
+    table_name TEXT NOT NULL,
+    dish_id TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS catalog_changes_created_at_idx ON catalog_changes (created_at);
+
+CREATE OR REPLACE FUNCTION record_catalog_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO catalog_changes (op, table_name, dish_id) VALUES ('delete', TG_TABLE_NAME, OLD.id::text);
+    ELSE
+        IF TG_OP = 'UPDATE' AND OLD.id IS DISTINCT FROM NEW.id THEN
+            INSERT INTO catalog_changes (op, table_name, dish_id) VALUES ('delete', TG_TABLE_NAME, OLD.id::text);
+        END IF;
+        INSERT INTO catalog_changes (op, table_name, dish_id) VALUES ('upsert', TG_TABLE_NAME, NEW.id::text);
+    END IF;
+    -- Identical payloads are folded into one notification per transaction.
+    PERFORM pg_notify('catalog_changes', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    tbl text;
+BEGIN
+    FOREACH tbl IN ARRAY ARRAY[
+        'dishes',
+        'dishes_non_vegan',
+        'dishes_veg',
+        'dishes_vegetarian',
+        'dishes_vegan',
+        'dishes_jain',
+        'dishes_keto'
+    ]
+    LOOP
+        IF to_regclass(format('public.%I', tbl)) IS NULL THEN
+            CONTINUE;
+        END IF;
+
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON public.%I', tbl || '_catalog_change', tbl);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE ON public.%I '
+            'FOR EACH ROW EXECUTE FUNCTION record_catalog_change()',
+            tbl || '_catalog_change',
+            tbl
+        );
+    END LOOP;
+END
+$$;
@@ -0,0 +1,15 @@
+-- Record the writing transaction on every catalog change.
+--
+-- Change ids come from a sequence when the row is inserted, but the row only
+-- becomes visible when its transaction commits, so ids do not appear in order:
+-- a long import can commit id 10 after id 11 has been read. Replicas therefore
+-- track the oldest transaction still running when they last read the log
+-- (`pg_snapshot_xmin`) and re-read every change written at or after it; a
+-- change from an older transaction was already visible then.
+--
+-- Requires PostgreSQL 13+ (`xid8`, `pg_current_xact_id`).
+
+ALTER TABLE catalog_changes
+    ADD COLUMN IF NOT EXISTS txid xid8 NOT NULL DEFAULT pg_current_xact_id();
+
+CREATE INDEX IF NOT EXISTS catalog_changes_txid_idx ON catalog_changes (txid);
@@ -0,0 +1,30 @@
+"""Schema introspection helpers used to detect optional, migration-added columns."""
+
+from __future__ import annotations
+
+from typing import Iterable, Set
+
+from .connection import get_db_connection
+
+NORMALIZED_NAME_COLUMN = "normalized_name"
+
+
+def tables_with_column(table_names: Iterable[str], column_name: str) -> Set[str]:
+    """Return the subset of `table_names` in the public schema that have `column_name`."""
+    names = list(table_names)
+    if not names:
+        return set()
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT table_name
+                FROM information_schema.columns
+                WHERE table_schema = 'public'
+                  AND column_name = %s
+                  AND table_name = ANY(%s)
+                """,
+                (column_name, names),
+            )
+            return {row[0] for row in cursor.fetchall()}
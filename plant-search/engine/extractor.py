@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import logging
+import uuid
+from datetime import datetime
 from typing import Dict, List, Any, Tuple
 
+from api.models import (
+    DishResponse, TasteFeatures, UmamiDepth, SeasoningProfile,
+    FlavorBase, TasteIntensity, Aftertaste, NutritionProfile as ApiNutrition
+)
+
 from . import DishFeatures, NutritionProfile, TasteProfile
 
+logger = logging.getLogger(__name__)
+
 
 def _to_lower(value: str) -> str:
     return value.lower() if isinstance(value, str) else value
@@ -78,14 +88,72 @@ def dict_to_features(dish_dict: Dict[str, Any]) -> DishFeatures:
     )
 
 
+def dish_create_to_db_dict(dish) -> Dict[str, Any]:
+    """Convert DishCreate model to dictionary for database insertion."""
+    dish_id = dish.id or str(uuid.uuid4())
+    
+    taste_features = {
+        "umami_depth": {
+            "level": dish.taste_features.umami_depth.level,
+            "source": dish.taste_features.umami_depth.source,
+        },
+        "seasoning_profile": {
+            "salt_level": dish.taste_features.seasoning_profile.salt_level,
+            "sweet_level": dish.taste_features.seasoning_profile.sweet_level,
+            "sour_level": dish.taste_features.seasoning_profile.sour_level,
+            "bitter_level": dish.taste_features.seasoning_profile.bitter_level,
+            "spice_heat": dish.taste_features.seasoning_profile.spice_heat,
+        },
+        "flavor_base": {
+            "primary": dish.taste_features.flavor_base.primary,
+            "secondary": dish.taste_features.flavor_base.secondary,
+        },
+        "taste_intensity": {
+            "overall": dish.taste_features.taste_intensity.overall,
+            "complexity": dish.taste_features.taste_intensity.complexity,
+        },
+        "aftertaste": {
+            "type": dish.taste_features.aftertaste.type,
+            "duration": dish.taste_features.aftertaste.duration,
+        },
+    }
+    
+    nutrition = {
+        "protein": dish.nutrition.protein,
+        "energy": dish.nutrition.energy,
+        "fat": dish.nutrition.fat,
+    }
+    
+    # Full data object (combines all fields)
+    data = {
+        "id": dish_id,
+        "name": dish.name,
+        "category": dish.category,
+        "taste_features": taste_features,
+        "texture_features": dish.texture_features,
+        "emotion_features": dish.emotion_features,
+        "nutrition": nutrition,
+        "price_range": dish.price_range,
+        "availability": dish.availability,
+        "created_at": datetime.now().isoformat(),
+    }
+    
+    return {
+        "id": dish_id,
+        "name": dish.name,
+        "category": dish.category,
+        "price_range": dish.price_range,
+        "availability": dish.availability,
+        "data": data,
+        "taste_features": taste_features,
+        "texture_features": dish.texture_features,
+        "emotion_features": dish.emotion_features,
+        "nutrition": nutrition,
+    }
+
+
 def dict_to_dish_response(dish_dict: Dict[str, Any]):
     """Convert a dish dictionary to DishResponse API model."""
-    from api.models import (
-        DishResponse, TasteFeatures, UmamiDepth, SeasoningProfile,
-        FlavorBase, TasteIntensity, Aftertaste, NutritionProfile as ApiNutrition
-    )
-    from datetime import datetime
-
     tf = dish_dict["taste_features"]
     
     payload = {
@@ -166,7 +234,7 @@ def load_feature_maps_from_db() -> Tuple[Dict[str, Dict[str, DishFeatures]], Dic
                 exists_row = cursor.fetchone() or {}
                 if not exists_row.get("table_ref"):
                     missing_tables[category] = True
-                    print(f"[STARTUP] Missing table '{table_name}'. Treating {category} count as 0.")
+                    logger.warning("missing table '%s'; treating %s count as 0", table_name, category)
                     continue
 
                 cursor.execute(
@@ -0,0 +1,129 @@
+"""Keeps a CatalogSync current from the `catalog_changes` feed.
+
+Imported only when the catalog comes from PostgreSQL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from db.connection import get_db_config
+
+from .catalog_sync import CHANGE_CHANNEL, FEED_MODES, LISTEN_SAFETY_POLL_SECONDS, CatalogSync
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogChangeListener:
+    """Keeps a CatalogSync current from the event loop.
+
+    `listen` mode holds a dedicated autocommit connection that LISTENs on the
+    change channel and drains as soon as a notification arrives; `poll` mode
+    drains on a fixed interval. Connecting and reading the log run on the default
+    executor so a slow or unreachable database never stalls requests; the fetched
+    changes are applied on the event loop thread, like the request handlers that
+    read the maps. At most one drain runs at a time; notifications that arrive
+    during it trigger one more.
+    """
+
+    def __init__(self, sync: CatalogSync, mode: str = "listen", poll_interval: float = 2.0) -> None:
+        self.sync = sync
+        self.mode = mode if mode in FEED_MODES else "listen"
+        self.poll_interval = poll_interval
+        self._conn: Optional[psycopg2.extensions.connection] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._drain_again = False
+
+    async def start(self) -> None:
+        if self.mode == "off" or not self.sync.feed_enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._drain_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = self._drain_task = None
+        self._disconnect()
+
+    @staticmethod
+    def _open_connection() -> psycopg2.extensions.connection:
+        conn = psycopg2.connect(**get_db_config())
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANGE_CHANNEL}")
+        return conn
+
+    async def _connect(self) -> None:
+        conn = await self._loop.run_in_executor(None, self._open_connection)
+        self._conn = conn
+        self._loop.add_reader(conn.fileno(), self._on_notify)
+        logger.info("catalog change feed: listening on '%s'", CHANGE_CHANNEL)
+
+    def _disconnect(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            if self._loop is not None:
+                self._loop.remove_reader(self._conn.fileno())
+            self._conn.close()
+        except (psycopg2.Error, OSError, ValueError):
+            pass
+        self._conn = None
+
+    def _on_notify(self) -> None:
+        # poll() only reads what is already on the socket; it does not block.
+        try:
+            self._conn.poll()
+            self._conn.notifies.clear()
+        except psycopg2.Error as exc:
+            logger.warning("catalog change feed: LISTEN connection lost: %s", exc)
+            self._disconnect()
+            return
+        self._schedule_drain()
+
+    def _schedule_drain(self) -> None:
+        if self._drain_task is not None and not self._drain_task.done():
+            self._drain_again = True
+            return
+        self._drain_task = self._loop.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while True:
+            self._drain_again = False
+            try:
+                batch = await self._loop.run_in_executor(None, self.sync.fetch)
+            except psycopg2.Error as exc:
+                logger.warning("catalog change feed: drain failed: %s", exc)
+                return
+            applied = self.sync.apply(batch)
+            if applied is None:
+                self._drain_again = True
+            elif applied:
+                logger.info("catalog change feed: applied %d change(s), version=%d", applied, self.sync.version)
+            if not self._drain_again:
+                return
+
+    async def _run(self) -> None:
+        while True:
+            if self.mode == "listen" and self._conn is None:
+                try:
+                    await self._connect()
+                except psycopg2.Error as exc:
+                    logger.warning("catalog change feed: LISTEN connect failed, polling until it recovers: %s", exc)
+            self._schedule_drain()
+            listening = self._conn is not None
+            await asyncio.sleep(LISTEN_SAFETY_POLL_SECONDS if listening else self.poll_interval)
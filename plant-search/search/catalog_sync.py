@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from engine.extractor import CATEGORY_TABLES, dict_to_features, normalize_transition_category
+
+from .dataset_loader import DatasetCatalog, dataset_dish_from_row, remove_catalog_dish, upsert_catalog_dish
+from .dish_store import DETAIL_COLUMNS, NORMALIZED_NAME_COLUMN, UNIFIED_TABLE, DishDetailStore
+
+# psycopg2 and `db` are imported where the feed touches the database, so a
+# fixture-backed API never loads them.
+if TYPE_CHECKING:
+    from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+CHANGE_TABLE = "catalog_changes"
+CHANGE_CHANNEL = "catalog_changes"
+DRAIN_BATCH_SIZE = 1000
+FEED_MODES = ("listen", "poll", "off")
+# In listen mode the table is still polled now and then, to cover
+# notifications lost while the LISTEN connection was down.
+LISTEN_SAFETY_POLL_SECONDS = 30.0
+
+CATEGORY_TABLE_CATEGORIES = {table_name: category for category, table_name in CATEGORY_TABLES.items()}
+
+
+@dataclass
+class CatalogChange:
+    change_id: int
+    op: str
+    table_name: str
+    dish_id: str
+    txid: int
+
+
+class CatalogSync:
+    """Applies dish-table changes to the in-memory maps held on `app.state`.
+
+    Writes served by this process are applied directly from the written rows.
+    When the `catalog_changes` feed is available, the same changes, plus those
+    made by other replicas or by `db.import_catalog`, are read back and applied
+    too; applying a change is idempotent.
+
+    Change ids are not committed in order, so the feed is read by transaction
+    visibility: `xmin` is the oldest transaction still running at the last read,
+    and every change written at or after it is read again until `xmin` moves past
+    it (`window` remembers which of those were applied already). `version` is the
+    highest change id applied; changes that commit below it are counted in
+    `late_changes`, which `version_tag` includes so validators still change.
+    """
+
+    def __init__(self, state: Any) -> None:
+        self.state = state
+        self.version = 0
+        self.late_changes = 0
+        self.xmin = 0
+        self.window: Dict[int, int] = {}
+        self.applied_batches = 0
+        self.feed_enabled = False
+        self.lock = threading.RLock()
+        self.instance_id = uuid.uuid4().hex[:8]
+
+    @property
+    def version_tag(self) -> str:
+        """Catalog version as used in HTTP validators.
+
+        Without the feed, `version` is a per-process write counter, so it is
+        qualified with this process's id to keep replicas from sharing tags.
+        """
+        if self.feed_enabled:
+            return f"{self.version}.{self.late_changes}" if self.late_changes else str(self.version)
+        return f"{self.instance_id}.{self.version}"
+
+    # ----- in-memory application ------------------------------------------------
+
+    def _feature_maps(self) -> Dict[str, Dict[str, Any]]:
+        feature_maps = getattr(self.state, "feature_maps", None)
+        if not isinstance(feature_maps, dict):
+            feature_maps = {}
+            self.state.feature_maps = feature_maps
+        return feature_maps
+
+    def _catalog(self) -> Optional[DatasetCatalog]:
+        catalog = getattr(self.state, "dataset_catalog", None)
+        return catalog if isinstance(catalog, DatasetCatalog) else None
+
+    def _store(self) -> Optional[DishDetailStore]:
+        store = getattr(self.state, "dish_store", None)
+        return store if isinstance(store, DishDetailStore) else None
+
+    def _feature_map_keys(self, category: str) -> List[str]:
+        # Startup aliases a missing vegetarian table to the veg map; keep the alias in step.
+        missing = getattr(self.state, "missing_feature_map_categories", set())
+        if category == "veg" and "vegetarian" in missing:
+            return ["veg", "vegetarian"]
+        return [category]
+
+    def apply_rows(self, table_name: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Upsert freshly written rows of `table_name` into every in-memory structure."""
+        feature_maps = self._feature_maps()
+        catalog = self._catalog()
+        store = self._store()
+        with self.lock:
+            for row in rows:
+                dish_id = row.get("id")
+                if not dish_id:
+                    continue
+                if table_name == UNIFIED_TABLE:
+                    data = row.get("data") if isinstance(row.get("data"), dict) else {}
+                    category = normalize_transition_category(data.get("diet") or row.get("category"))
+                else:
+                    category = CATEGORY_TABLE_CATEGORIES[table_name]
+                    if catalog is not None:
+                        upsert_catalog_dish(catalog, dataset_dish_from_row(row, category, table_name))
+
+                features = dict_to_features({**row, "category": category})
+                for key in self._feature_map_keys(category):
+                    feature_maps.setdefault(key, {})[dish_id] = features
+                if store is not None:
+                    store.upsert(table_name, row)
+
+    def remove_ids(self, table_name: str, dish_ids: Iterable[str]) -> None:
+        """Drop deleted rows of `table_name` from every in-memory structure."""
+        feature_maps = self._feature_maps()
+        catalog = self._catalog()
+        store = self._store()
+        with self.lock:
+            for dish_id in dish_ids:
+                if table_name == UNIFIED_TABLE:
+                    # Unified-table dishes may live in any category map.
+                    for dataset in feature_maps.values():
+                        if isinstance(dataset, dict):
+                            dataset.pop(dish_id, None)
+                else:
+                    category = CATEGORY_TABLE_CATEGORIES[table_name]
+                    for key in self._feature_map_keys(category):
+                        feature_maps.get(key, {}).pop(dish_id, None)
+                    if catalog is not None:
+                        remove_catalog_dish(catalog, table_name, dish_id)
+                if store is not None:
+                    store.remove(table_name, dish_id)
+
+    async def record_local_write(
+        self,
+        table_name: str,
+        rows: Iterable[Dict[str, Any]] = (),
+        deleted_ids: Iterable[str] = (),
+    ) -> None:
+        """Apply a write served by this process and advance the catalog version.
+
+        Runs on the event loop. With the feed enabled, the change log is read on
+        the default executor so that `version` reaches the write's change id; if
+        that read fails, `late_changes` is bumped instead, so validators still
+        change before a later drain catches up.
+        """
+        self.apply_rows(table_name, rows)
+        self.remove_ids(table_name, deleted_ids)
+        if not self.feed_enabled:
+            with self.lock:
+                self.version += 1
+            return
+        import psycopg2
+
+        loop = asyncio.get_running_loop()
+        try:
+            while self.apply(await loop.run_in_executor(None, self.fetch)) is None:
+                pass
+        except psycopg2.Error as exc:
+            logger.warning("catalog change drain after local write failed: %s", exc)
+            with self.lock:
+                self.late_changes += 1
+
+    # ----- change feed ------------------------------------------------------------
+
+    def initialize(self) -> None:
+        """Enable the feed if `catalog_changes` exists and start from the current snapshot.
+
+        Call this before the in-memory maps are loaded so that no change made
+        during loading is skipped (re-applying one is harmless).
+        """
+        from db import get_db_connection
+
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_schema = 'public' AND table_name = %s AND column_name = 'txid'
+                    """,
+                    (CHANGE_TABLE,),
+                )
+                if cursor.fetchone() is None:
+                    logger.warning(
+                        "catalog change feed disabled: %s.txid missing (run python -m db.migrate)", CHANGE_TABLE
+                    )
+                    self.feed_enabled = False
+                    return
+                cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text")
+                xmin = int(cursor.fetchone()[0])
+                cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {CHANGE_TABLE}")
+                version = int(cursor.fetchone()[0])
+                # Visible now, so the maps about to be loaded already include them.
+                cursor.execute(f"SELECT id, txid::text FROM {CHANGE_TABLE} WHERE txid >= %s::xid8", (str(xmin),))
+                window = {int(change_id): int(txid) for change_id, txid in cursor.fetchall()}
+        with self.lock:
+            self.xmin, self.version, self.window = xmin, version, window
+        self.feed_enabled = True
+
+    def _select_columns(self, table_name: str) -> str:
+        columns = f"{DETAIL_COLUMNS}, data"
+        if table_name == UNIFIED_TABLE:
+            columns += ", category, created_at"
+        if table_name in getattr(self.state, "normalized_name_tables", set()):
+            columns += f", {NORMALIZED_NAME_COLUMN}"
+        return columns
+
+    def _fetch_rows(self, cursor: RealDictCursor, table_name: str, dish_ids: List[str]) -> List[Dict[str, Any]]:
+        from psycopg2 import sql
+
+        query = sql.SQL("SELECT {columns} FROM {table} WHERE id IN %s").format(
+            columns=sql.SQL(self._select_columns(table_name)),
+            table=sql.Identifier(table_name),
+        )
+        cursor.execute(query, (tuple(dish_ids),))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def _read_changes(self, cursor: RealDictCursor, batch: "CatalogBatch") -> None:
+        # Only the last change per dish matters; an upsert re-reads the current row.
+        latest: Dict[Tuple[str, str], str] = {}
+        for change in batch.changes:
+            if change.table_name == UNIFIED_TABLE or change.table_name in CATEGORY_TABLE_CATEGORIES:
+                latest[(change.table_name, change.dish_id)] = change.op
+
+        upserts: Dict[str, List[str]] = defaultdict(list)
+        for (table_name, dish_id), op in latest.items():
+            if op == "upsert":
+                upserts[table_name].append(dish_id)
+            else:
+                batch.deletes[table_name].append(dish_id)
+
+        for table_name, dish_ids in upserts.items():
+            rows = self._fetch_rows(cursor, table_name, dish_ids)
+            found = {row.get("id") for row in rows}
+            batch.upserts[table_name].extend(rows)
+            batch.deletes[table_name].extend(dish_id for dish_id in dish_ids if dish_id not in found)
+
+    def fetch(self) -> "CatalogBatch":
+        """Read every newly visible change and the rows it touches; no in-memory state changes.
+
+        Safe to run on a worker thread; pass the result to `apply` on the thread
+        that owns the maps.
+        """
+        batch = CatalogBatch(generation=self.applied_batches)
+        if not self.feed_enabled:
+            return batch
+        from db import get_db_connection
+        from psycopg2.extras import RealDictCursor
+
+        after_id = 0
+        while True:
+            with get_db_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    if batch.next_xmin is None:
+                        # Taken before the first page: anything this read misses
+                        # belongs to a transaction at or after it.
+                        cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text AS xmin")
+                        batch.next_xmin = int(cursor.fetchone()["xmin"])
+                    cursor.execute(
+                        f"""
+                        SELECT id, op, table_name, dish_id, txid::text AS txid
+                        FROM {CHANGE_TABLE}
+                        WHERE txid >= %s::xid8 AND id > %s
+                        ORDER BY id
+                        LIMIT %s
+                        """,
+                        (str(self.xmin), after_id, DRAIN_BATCH_SIZE),
+                    )
+                    rows = cursor.fetchall()
+                    page = CatalogBatch(
+                        changes=[
+                            CatalogChange(
+                                change_id=row["id"],
+                                op=row["op"],
+                                table_name=row["table_name"],
+                                dish_id=row["dish_id"],
+                                txid=int(row["txid"]),
+                            )
+                            for row in rows
+                            if row["id"] not in self.window
+                        ]
+                    )
+                    if page.changes:
+                        self._read_changes(cursor, page)
+            batch.extend(page)
+            if len(rows) < DRAIN_BATCH_SIZE:
+                return batch
+            after_id = rows[-1]["id"]
+
+    def apply(self, batch: "CatalogBatch") -> Optional[int]:
+        """Apply a fetched batch to the maps; returns the number of changes applied.
+
+        Returns None, applying nothing, if another batch was applied after this one
+        was fetched: its rows may be older than those already in the maps, so fetch
+        again.
+        """
+        if batch.next_xmin is None:
+            return 0
+        applied = 0
+        with self.lock:
+            if batch.generation != self.applied_batches:
+                return None
+            self.applied_batches += 1
+            for table_name, rows in batch.upserts.items():
+                self.apply_rows(table_name, rows)
+            for table_name, dish_ids in batch.deletes.items():
+                self.remove_ids(table_name, dish_ids)
+            for change in batch.changes:
+                applied += 1
+                self.window[change.change_id] = change.txid
+                if change.change_id < self.version:
+                    self.late_changes += 1
+                else:
+                    self.version = change.change_id
+            # Every transaction older than `next_xmin` had finished and was visible
+            # to the fetch, so its changes never need reading again.
+            self.xmin = max(self.xmin, batch.next_xmin)
+            self.window = {change_id: txid for change_id, txid in self.window.items() if txid >= self.xmin}
+        return applied
+
+
+@dataclass
+class CatalogBatch:
+    changes: List[CatalogChange] = field(default_factory=list)
+    upserts: Dict[str, List[Dict[str, Any]]] = field(default_factory=lambda: defaultdict(list))
+    deletes: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+    next_xmin: Optional[int] = None
+    generation: int = 0
+
+    def extend(self, page: "CatalogBatch") -> None:
+        self.changes.extend(page.changes)
+        for table_name, rows in page.upserts.items():
+            self.upserts[table_name].extend(rows)
+        for table_name, dish_ids in page.deletes.items():
+            self.deletes[table_name].extend(dish_ids)
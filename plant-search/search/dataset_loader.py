@@ -1,12 +1,12 @@
 from __future__ import annotations
 
+import bisect
+import heapq
 import re
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from psycopg2.extras import RealDictCursor
-
-from db import get_db_connection
 from engine.extractor import CATEGORY_TABLES, TRANSITION_CATEGORY_KEYS
 
 
@@ -37,6 +37,19 @@ class DatasetCatalog:
     dishes_by_dataset: Dict[str, List[DatasetDish]]
     dishes_by_name: Dict[str, Dict[str, DatasetDish]]
     dataset_to_category: Dict[str, str]
+    dishes_by_id: Dict[str, Dict[str, DatasetDish]] = field(default_factory=dict)
+    # dataset -> (field, value) -> dishes, each list in catalog order
+    dishes_by_bucket: Dict[str, Dict[Tuple[str, str], List[DatasetDish]]] = field(default_factory=dict)
+
+
+# Fields with a precomputed per-dataset bucket; `category` needs none since a
+# dataset holds a single category.
+BUCKET_FIELDS = ("protein", "price_range")
+
+
+def catalog_sort_key(dish: DatasetDish) -> Tuple[str, str]:
+    """Catalog order: case-insensitive name, then id, so every key is unique."""
+    return (dish.name.lower(), dish.dish_id)
 
 
 def _normalize_name(value: str) -> str:
@@ -80,11 +93,74 @@ def _extract_ingredients(data_payload: Any) -> List[str]:
     return values
 
 
-def load_dataset_catalog_from_db() -> DatasetCatalog:
+def dataset_dish_from_row(row: Dict[str, Any], category: str, table_name: str) -> DatasetDish:
+    nutrition = row.get("nutrition") or {}
+    return DatasetDish(
+        dish_id=row.get("id") or "",
+        name=row.get("name") or "",
+        category=category,
+        dataset=table_name,
+        table_name=table_name,
+        price_range=row.get("price_range") or "",
+        protein=str(nutrition.get("protein") or "").lower(),
+        availability=row.get("availability") or "",
+        ingredients=_extract_ingredients(row.get("data")),
+    )
+
+
+def build_dataset_catalog(tables: Iterable[Tuple[str, str, Iterable[Dict[str, Any]]]]) -> DatasetCatalog:
+    """Build a catalog from `(category, table_name, rows)` triples, in dataset order."""
     datasets: List[DatasetOption] = []
     dishes_by_dataset: Dict[str, List[DatasetDish]] = {}
     dishes_by_name: Dict[str, Dict[str, DatasetDish]] = {}
     dataset_to_category: Dict[str, str] = {}
+    dishes_by_id: Dict[str, Dict[str, DatasetDish]] = {}
+    dishes_by_bucket: Dict[str, Dict[Tuple[str, str], List[DatasetDish]]] = {}
+
+    for category, table_name, rows in tables:
+        dataset_key = table_name
+        dataset_to_category[dataset_key] = category
+        dishes_by_dataset[dataset_key] = []
+        dishes_by_name[dataset_key] = {}
+        dishes_by_id[dataset_key] = {}
+
+        for row in rows:
+            dish = dataset_dish_from_row(row, category, table_name)
+            if not dish.dish_id or not dish.name:
+                continue
+            dishes_by_dataset[dataset_key].append(dish)
+            normalized_name = row.get("normalized_name") or _normalize_name(dish.name)
+            dishes_by_name[dataset_key][normalized_name] = dish
+            dishes_by_id[dataset_key][dish.dish_id] = dish
+
+        dishes_by_dataset[dataset_key].sort(key=catalog_sort_key)
+        dishes_by_bucket[dataset_key] = _build_buckets(dishes_by_dataset[dataset_key])
+
+        datasets.append(
+            DatasetOption(
+                category=category,
+                dataset=dataset_key,
+                table_name=table_name,
+                dish_count=len(dishes_by_dataset[dataset_key]),
+            )
+        )
+
+    return DatasetCatalog(
+        datasets=datasets,
+        dishes_by_dataset=dishes_by_dataset,
+        dishes_by_name=dishes_by_name,
+        dataset_to_category=dataset_to_category,
+        dishes_by_id=dishes_by_id,
+        dishes_by_bucket=dishes_by_bucket,
+    )
+
+
+def load_dataset_catalog_from_db() -> DatasetCatalog:
+    from db import NORMALIZED_NAME_COLUMN, get_db_connection, tables_with_column
+    from psycopg2.extras import RealDictCursor
+
+    tables: List[Tuple[str, str, List[Dict[str, Any]]]] = []
+    normalized_tables = tables_with_column(CATEGORY_TABLES.values(), NORMALIZED_NAME_COLUMN)
 
     with get_db_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
@@ -95,55 +171,122 @@ def load_dataset_catalog_from_db() -> DatasetCatalog:
                 if not exists_row.get("table_ref"):
                     continue
 
+                normalized_column = NORMALIZED_NAME_COLUMN if table_name in normalized_tables else "NULL"
                 cursor.execute(
                     f"""
-                    SELECT id, name, price_range, availability, nutrition, data
+                    SELECT id, name, price_range, availability, nutrition, data,
+                           {normalized_column} AS normalized_name
                     FROM {table_name}
                     ORDER BY name
                     """
                 )
-                rows = cursor.fetchall()
-
-                dataset_key = table_name
-                dataset_to_category[dataset_key] = category
-                dishes_by_dataset[dataset_key] = []
-                dishes_by_name[dataset_key] = {}
-
-                for row in rows:
-                    nutrition = row.get("nutrition") or {}
-                    dish = DatasetDish(
-                        dish_id=row.get("id") or "",
-                        name=row.get("name") or "",
-                        category=category,
-                        dataset=dataset_key,
-                        table_name=table_name,
-                        price_range=row.get("price_range") or "",
-                        protein=str(nutrition.get("protein") or "").lower(),
-                        availability=row.get("availability") or "",
-                        ingredients=_extract_ingredients(row.get("data")),
-                    )
-                    if not dish.dish_id or not dish.name:
-                        continue
-                    dishes_by_dataset[dataset_key].append(dish)
-                    dishes_by_name[dataset_key][_normalize_name(dish.name)] = dish
-
-                datasets.append(
-                    DatasetOption(
-                        category=category,
-                        dataset=dataset_key,
-                        table_name=table_name,
-                        dish_count=len(dishes_by_dataset[dataset_key]),
-                    )
-                )
+                tables.append((category, table_name, cursor.fetchall()))
 
-    return DatasetCatalog(
-        datasets=datasets,
-        dishes_by_dataset=dishes_by_dataset,
-        dishes_by_name=dishes_by_name,
-        dataset_to_category=dataset_to_category,
-    )
+    return build_dataset_catalog(tables)
 
 
 def find_dish_in_dataset(catalog: DatasetCatalog, dataset: str, dish_name: str) -> Optional[DatasetDish]:
     dataset_map = catalog.dishes_by_name.get(dataset, {})
     return dataset_map.get(_normalize_name(dish_name))
+
+
+def _set_dataset_count(catalog: DatasetCatalog, dataset: str) -> None:
+    for option in catalog.datasets:
+        if option.dataset == dataset:
+            option.dish_count = len(catalog.dishes_by_dataset.get(dataset, []))
+
+
+def _bucket_keys(dish: DatasetDish) -> List[Tuple[str, str]]:
+    return [(field_name, getattr(dish, field_name)) for field_name in BUCKET_FIELDS]
+
+
+def _build_buckets(pool: List[DatasetDish]) -> Dict[Tuple[str, str], List[DatasetDish]]:
+    buckets: Dict[Tuple[str, str], List[DatasetDish]] = {}
+    for dish in pool:
+        for key in _bucket_keys(dish):
+            buckets.setdefault(key, []).append(dish)
+    return buckets
+
+
+def _remove_sorted(pool: List[DatasetDish], dish: DatasetDish) -> None:
+    index = bisect.bisect_left(pool, catalog_sort_key(dish), key=catalog_sort_key)
+    if index < len(pool) and pool[index] is dish:
+        pool.pop(index)
+
+
+def remove_catalog_dish(catalog: DatasetCatalog, dataset: str, dish_id: str) -> Optional[DatasetDish]:
+    """Remove one dish from a dataset in place; returns the removed dish if present."""
+    removed = catalog.dishes_by_id.get(dataset, {}).pop(dish_id, None)
+    if removed is None:
+        return None
+
+    _remove_sorted(catalog.dishes_by_dataset.get(dataset, []), removed)
+    buckets = catalog.dishes_by_bucket.get(dataset, {})
+    for key in _bucket_keys(removed):
+        bucket = buckets.get(key)
+        if bucket is not None:
+            _remove_sorted(bucket, removed)
+            if not bucket:
+                buckets.pop(key, None)
+
+    name_map = catalog.dishes_by_name.get(dataset, {})
+    key = _normalize_name(removed.name)
+    if name_map.get(key) is removed:
+        name_map.pop(key, None)
+    _set_dataset_count(catalog, dataset)
+    return removed
+
+
+def upsert_catalog_dish(catalog: DatasetCatalog, dish: DatasetDish) -> None:
+    """Insert or replace a dish in place, keeping the dataset and its buckets in catalog order."""
+    if dish.dataset not in catalog.dishes_by_dataset:
+        return
+    remove_catalog_dish(catalog, dish.dataset, dish.dish_id)
+    bisect.insort(catalog.dishes_by_dataset[dish.dataset], dish, key=catalog_sort_key)
+    buckets = catalog.dishes_by_bucket.setdefault(dish.dataset, {})
+    for key in _bucket_keys(dish):
+        bisect.insort(buckets.setdefault(key, []), dish, key=catalog_sort_key)
+    catalog.dishes_by_name.setdefault(dish.dataset, {})[_normalize_name(dish.name)] = dish
+    catalog.dishes_by_id.setdefault(dish.dataset, {})[dish.dish_id] = dish
+    _set_dataset_count(catalog, dish.dataset)
+
+
+def _candidate_pool(
+    catalog: DatasetCatalog,
+    dataset: str,
+    filters: Dict[str, str],
+) -> List[DatasetDish]:
+    buckets = catalog.dishes_by_bucket.get(dataset, {})
+    pools = [catalog.dishes_by_dataset.get(dataset, [])]
+    pools.extend(buckets.get((field_name, value), []) for field_name, value in filters.items())
+    return min(pools, key=len)
+
+
+def iter_catalog_dishes(
+    catalog: DatasetCatalog,
+    datasets: Iterable[str],
+    *,
+    protein: Optional[str] = None,
+    price_range: Optional[str] = None,
+    after: Optional[Tuple[str, str]] = None,
+) -> Iterator[DatasetDish]:
+    """Yield the matching dishes of `datasets` in catalog order.
+
+    Each dataset contributes its smallest matching bucket, entered by bisection
+    at `after` (a `catalog_sort_key`), and the streams are merged lazily, so a
+    page costs about its own size rather than the size of the catalog.
+    """
+    filters = {
+        field_name: value
+        for field_name, value in (("protein", protein), ("price_range", price_range))
+        if value is not None
+    }
+    streams = []
+    for dataset in datasets:
+        pool = _candidate_pool(catalog, dataset, filters)
+        start = bisect.bisect_right(pool, after, key=catalog_sort_key) if after is not None else 0
+        streams.append(islice(pool, start, None))
+
+    for dish in heapq.merge(*streams, key=catalog_sort_key):
+        if all(getattr(dish, field_name) == value for field_name, value in filters.items()):
+            yield dish
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+from engine.extractor import CATEGORY_TABLES, TRANSITION_CATEGORY_KEYS
+
+UNIFIED_TABLE = "dishes"
+# Same column as db.schema.NORMALIZED_NAME_COLUMN, repeated so that building a
+# store (e.g. from a fixture) never imports the database layer.
+NORMALIZED_NAME_COLUMN = "normalized_name"
+
+DETAIL_COLUMNS = (
+    "id, name, price_range, availability, "
+    "taste_features, texture_features, emotion_features, nutrition"
+)
+
+
+@dataclass
+class DishDetail:
+    """Detail row for one dish, without the (potentially large) `data` payload."""
+
+    dish_id: str
+    table_name: str
+    rank: int
+    row: Dict[str, Any]
+    normalized_name: str = ""
+    data: Optional[Dict[str, Any]] = None
+    data_loaded: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.row.get("name") or ""
+
+
+@dataclass
+class DishDetailStore:
+    """In-memory index of dish detail rows keyed by normalized name and by id.
+
+    Rows from the unified `dishes` table rank ahead of the category tables, in
+    the same order `GET /dish/{name}` used to query them. The `data` column is
+    only stored for the unified table and is fetched lazily by primary key.
+    """
+
+    table_ranks: Dict[str, int]
+    by_key: Dict[Tuple[str, str], DishDetail] = field(default_factory=dict)
+    by_name: Dict[str, List[DishDetail]] = field(default_factory=dict)
+    by_id: Dict[str, List[DishDetail]] = field(default_factory=dict)
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+    def lookup(self, name: str, skip_tables: Collection[str] = ()) -> Optional[DishDetail]:
+        """Resolve a requested dish name the same way the SQL lookup did."""
+        candidates = self.by_name.get(_normalize_name(name))
+        if candidates and skip_tables:
+            candidates = [entry for entry in candidates if entry.table_name not in skip_tables]
+        if not candidates:
+            return None
+        best_rank = candidates[0].rank
+        lowered = name.strip().lower()
+        for entry in candidates:
+            if entry.rank != best_rank:
+                break
+            if entry.name.lower() == lowered:
+                return entry
+        return candidates[0]
+
+    def get_by_id(self, dish_id: str) -> Optional[DishDetail]:
+        matches = self.by_id.get(dish_id)
+        return matches[0] if matches else None
+
+    def upsert(self, table_name: str, row: Dict[str, Any]) -> Optional[DishDetail]:
+        """Insert or replace a row after a write to `table_name`."""
+        rank = self.table_ranks.get(table_name)
+        dish_id = row.get("id") or ""
+        if rank is None or not dish_id or not row.get("name"):
+            return None
+
+        detail_row = {key: value for key, value in row.items() if key not in {"data", NORMALIZED_NAME_COLUMN}}
+        # Category tables have no created_at; like the SQL lookup's NOW(), use the
+        # time the row was read, so it stays fixed while the row is unchanged.
+        detail_row.setdefault("created_at", datetime.now())
+        entry = DishDetail(
+            dish_id=dish_id,
+            table_name=table_name,
+            rank=rank,
+            row=detail_row,
+            normalized_name=row.get(NORMALIZED_NAME_COLUMN) or _normalize_name(row["name"]),
+        )
+        if table_name != UNIFIED_TABLE:
+            entry.data_loaded = True
+        elif "data" in row:
+            entry.data = row["data"]
+            entry.data_loaded = True
+
+        with self.lock:
+            self._discard(table_name, dish_id)
+            self.by_key[(table_name, dish_id)] = entry
+            bucket = self.by_name.setdefault(entry.normalized_name, [])
+            bucket.append(entry)
+            bucket.sort(key=lambda item: (item.rank, item.name))
+            id_bucket = self.by_id.setdefault(dish_id, [])
+            id_bucket.append(entry)
+            id_bucket.sort(key=lambda item: item.rank)
+        return entry
+
+    def remove(self, table_name: str, dish_id: str) -> bool:
+        with self.lock:
+            return self._discard(table_name, dish_id)
+
+    def load_data(self, entry: DishDetail) -> Optional[Dict[str, Any]]:
+        """Return the `data` payload for an entry, fetching it by id at most once."""
+        if entry.data_loaded:
+            return entry.data
+        from db import get_db_connection
+        from psycopg2.extras import RealDictCursor
+
+        with get_db_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(f"SELECT data FROM {UNIFIED_TABLE} WHERE id = %s", (entry.dish_id,))
+                row = cursor.fetchone() or {}
+        entry.data = row.get("data")
+        entry.data_loaded = True
+        return entry.data
+
+    def _discard(self, table_name: str, dish_id: str) -> bool:
+        entry = self.by_key.pop((table_name, dish_id), None)
+        if not entry:
+            return False
+        _drop_from_bucket(self.by_name, entry.normalized_name, entry)
+        _drop_from_bucket(self.by_id, dish_id, entry)
+        return True
+
+
+def _drop_from_bucket(index: Dict[str, List[DishDetail]], key: str, entry: DishDetail) -> None:
+    bucket = [item for item in index.get(key, []) if item is not entry]
+    if bucket:
+        index[key] = bucket
+    else:
+        index.pop(key, None)
+
+
+def _normalize_name(value: str) -> str:
+    normalized = re.sub(r"[^a-z0-9]+", " ", (value or "").strip().lower())
+    return re.sub(r"\s+", " ", normalized).strip()
+
+
+def dish_tables() -> List[str]:
+    """All dish tables in lookup precedence order: unified table, then category tables."""
+    return [UNIFIED_TABLE, *(CATEGORY_TABLES[category] for category in TRANSITION_CATEGORY_KEYS)]
+
+
+def load_dish_store_from_db() -> DishDetailStore:
+    from db import get_db_connection, tables_with_column
+    from psycopg2.extras import RealDictCursor
+
+    tables = dish_tables()
+    store = DishDetailStore(table_ranks={table: rank for rank, table in enumerate(tables)})
+    normalized_tables = tables_with_column(tables, NORMALIZED_NAME_COLUMN)
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            for table_name in tables:
+                cursor.execute("SELECT to_regclass(%s) AS table_ref", (f"public.{table_name}",))
+                exists_row = cursor.fetchone() or {}
+                if not exists_row.get("table_ref"):
+                    continue
+
+                columns = DETAIL_COLUMNS
+                if table_name == UNIFIED_TABLE:
+                    columns += ", category, created_at"
+                if table_name in normalized_tables:
+                    columns += f", {NORMALIZED_NAME_COLUMN}"
+
+                cursor.execute(
+                    f"""
+                    SELECT {columns}
+                    FROM {table_name}
+                    ORDER BY name
+                    """
+                )
+
+                for row in cursor.fetchall():
+                    store.upsert(table_name, dict(row))
+
+    return store
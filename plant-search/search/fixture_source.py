@@ -0,0 +1,85 @@
+"""Load the in-memory catalog from a JSONL fixture instead of PostgreSQL.
+
+Selected with `PLANT_SEARCH_DATA_SOURCE=fixture` (file in
+`PLANT_SEARCH_FIXTURE_PATH`), for local runs and load tests that should not
+touch the database. Each line is one dish row as stored in its table, plus a
+`table` key naming that table (`dishes` or a category table):
+
+    {"table": "dishes_vegan", "id": "...", "name": "...", "price_range": "...",
+     "availability": "...", "taste_features": {...}, "texture_features": [...],
+     "emotion_features": [...], "nutrition": {...}, "data": {...}}
+
+Only reads are served from a fixture; `/dish/add` and DELETE still need the
+database.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+from engine import DishFeatures
+from engine.extractor import CATEGORY_TABLES, TRANSITION_CATEGORY_KEYS, dict_to_features
+
+from .dataset_loader import DatasetCatalog, build_dataset_catalog
+from .dish_store import DishDetailStore, dish_tables
+
+
+@dataclass
+class FixtureCatalog:
+    feature_maps: Dict[str, Dict[str, DishFeatures]]
+    category_counts: Dict[str, int]
+    total_count: int
+    missing_categories: List[str]
+    dataset_catalog: DatasetCatalog
+    dish_store: DishDetailStore
+
+
+def load_fixture_catalog(path: Path) -> FixtureCatalog:
+    rows_by_table: Dict[str, List[Dict[str, Any]]] = {}
+    with Path(path).open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            table_name = row.pop("table", None)
+            if not table_name:
+                raise ValueError(f"{path}:{line_number}: row has no 'table'")
+            rows_by_table.setdefault(table_name, []).append(row)
+
+    feature_maps: Dict[str, Dict[str, DishFeatures]] = {key: {} for key in TRANSITION_CATEGORY_KEYS}
+    category_counts: Dict[str, int] = {key: 0 for key in TRANSITION_CATEGORY_KEYS}
+    missing_categories: List[str] = []
+    catalog_tables = []
+    for category in TRANSITION_CATEGORY_KEYS:
+        table_name = CATEGORY_TABLES[category]
+        if table_name not in rows_by_table:
+            missing_categories.append(category)
+            continue
+        rows = sorted(rows_by_table[table_name], key=lambda row: row.get("name") or "")
+        category_counts[category] = len(rows)
+        for row in rows:
+            if row.get("id"):
+                feature_maps[category][row["id"]] = dict_to_features({**row, "category": category})
+        catalog_tables.append((category, table_name, rows))
+
+    # Same fallback as load_feature_maps_from_db.
+    if "vegetarian" in missing_categories and feature_maps.get("veg"):
+        feature_maps["vegetarian"] = dict(feature_maps["veg"])
+
+    tables = dish_tables()
+    store = DishDetailStore(table_ranks={table: rank for rank, table in enumerate(tables)})
+    for table_name in tables:
+        for row in rows_by_table.get(table_name, []):
+            store.upsert(table_name, row)
+
+    return FixtureCatalog(
+        feature_maps=feature_maps,
+        category_counts=category_counts,
+        total_count=sum(category_counts.values()),
+        missing_categories=missing_categories,
+        dataset_catalog=build_dataset_catalog(catalog_tables),
+        dish_store=store,
+    )
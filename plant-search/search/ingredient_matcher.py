@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from difflib import SequenceMatcher
 from typing import List, Tuple
 
 
@@ -9,6 +8,8 @@ def _similar(a: str, b: str) -> bool:
         return False
     if a == b:
         return True
+    from difflib import SequenceMatcher
+
     return SequenceMatcher(None, a, b).ratio() >= 0.86
 
 
@@ -1,26 +1,35 @@
 from __future__ import annotations
 
+from time import perf_counter
 from typing import Any, Dict, List
 
 from engine import DishFeatures
 from engine.scorer import score_all
+from telemetry import record, span, timed
 
 from .ingredient_matcher import ingredient_similarity
 
 
+@timed("rank")
 def rank_with_ingredients(
     source_features: DishFeatures,
     source_ingredients: List[str],
     candidate_features: Dict[str, DishFeatures],
     candidate_ingredients: Dict[str, List[str]],
 ) -> List[Dict[str, Any]]:
-    base_scores = score_all(source_features, candidate_features)
+    with span("score"):
+        base_scores = score_all(source_features, candidate_features)
     max_base = max((item["score"] for item in base_scores.values()), default=0)
 
+    # ingredient_similarity runs once per candidate; sum its time here rather
+    # than opening a span per call.
+    ingredient_seconds = 0.0
     rows: List[Dict[str, Any]] = []
     for dish_id, payload in base_scores.items():
         base_score = float(payload["score"])
+        started = perf_counter()
         ingredient_score, matched = ingredient_similarity(source_ingredients, candidate_ingredients.get(dish_id, []))
+        ingredient_seconds += perf_counter() - started
 
         if max_base > 0:
             base_norm = base_score / max_base
@@ -38,5 +47,7 @@ def rank_with_ingredients(
             }
         )
 
+    record("ingredient_similarity", ingredient_seconds)
+
     rows.sort(key=lambda item: (-item["similarity"], -item["base_score"], item["dish_id"]))
     return rows
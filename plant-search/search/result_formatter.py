@@ -38,3 +38,38 @@ def build_search_results(
         )
 
     return results
+
+
+def _clean_strings(values: List[Any]) -> List[str]:
+    return [value.strip() for value in values if isinstance(value, str) and value.strip()]
+
+
+def build_bridge_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rows from `build_search_results` in the shape offramp's search bridge returns.
+
+    The bridge forwards `/search?shape=bridge` bodies without re-encoding them, so
+    the aliases it used to add itself (`dish_name`, `price`, `similarity_score`)
+    are emitted here.
+    """
+    bridged: List[Dict[str, Any]] = []
+    for row in results:
+        similarity = row.get("similarity", row["score"])
+        bridged.append(
+            {
+                "dish_id": row["dish_id"],
+                "name": row["name"],
+                "dish_name": row["name"],
+                "protein": row["protein"],
+                "price_range": row["price_range"],
+                "price": row["price_range"],
+                "availability": row["availability"],
+                "score": row["score"],
+                "similarity": similarity,
+                "similarity_score": similarity,
+                "matched_ingredients": _clean_strings(row.get("matched_ingredients") or []),
+                "reasons": _clean_strings(row.get("reasons") or []),
+                "from_dataset": row.get("from_dataset"),
+                "to_dataset": row.get("to_dataset"),
+            }
+        )
+    return bridged
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from difflib import SequenceMatcher
 from typing import List
 
 from .dataset_loader import DatasetDish
@@ -10,6 +9,8 @@ def rank_suggestions(term: str, dishes: List[DatasetDish], limit: int = 10) -> L
     needle = term.strip().lower()
     if len(needle) < 2:
         return []
+    # difflib is imported on first use to keep it out of the API's cold start.
+    from difflib import SequenceMatcher
 
     scored = []
     for dish in dishes:
@@ -0,0 +1,33 @@
+"""Request timing spans and Prometheus metrics for the plant-search service."""
+
+from .metrics import (
+    REGISTRY,
+    SEARCH_CANDIDATES,
+    SOURCE_LOOKUPS,
+    CallbackMetric,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+)
+from .logs import SampledLog, configure_logging, shutdown_logging
+from .middleware import TimingMiddleware
+from .timing import RequestTimings, current_timings, record, span, timed
+
+__all__ = [
+    "REGISTRY",
+    "SEARCH_CANDIDATES",
+    "SOURCE_LOOKUPS",
+    "CallbackMetric",
+    "Counter",
+    "Histogram",
+    "MetricsRegistry",
+    "RequestTimings",
+    "SampledLog",
+    "TimingMiddleware",
+    "configure_logging",
+    "current_timings",
+    "record",
+    "shutdown_logging",
+    "span",
+    "timed",
+]
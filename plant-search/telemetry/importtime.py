@@ -0,0 +1,118 @@
+"""Report where `import api.main` spends its time, and fail when over budget.
+
+Usage:
+    python -m telemetry.importtime                      # top packages by cumulative time
+    python -m telemetry.importtime --budget-ms 800      # exit 1 if the import takes longer
+    python -m telemetry.importtime --module api.routes --top 40
+
+The import runs in a fresh interpreter under `python -X importtime`, with
+`PLANT_SEARCH_DATA_SOURCE=fixture` so no database is touched. It also exits 1
+when a module that should only load on first use (psycopg2, `db`, difflib) was
+imported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+# Imported by the postgres load path, the database routes and name matching;
+# a fixture-backed `import api.main` must not load them.
+DEFERRED_MODULES = ("psycopg2", "db", "difflib")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Parse the `import time: self [us] | cumulative | imported package` lines."""
+    timings: List[ImportTiming] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        # Nested imports are indented by two spaces per level under their importer.
+        depth = (len(name) - len(stripped) - 1) // 2
+        timings.append(ImportTiming(stripped, int(fields[0]), int(fields[1]), depth))
+    return timings
+
+
+def measure(module: str) -> List[ImportTiming]:
+    env = {**os.environ, "PLANT_SEARCH_DATA_SOURCE": "fixture"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVICE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def by_top_level_package(timings: List[ImportTiming]) -> Dict[str, int]:
+    """Self time summed per top-level package, so nested imports are attributed to their owner."""
+    totals: Dict[str, int] = {}
+    for timing in timings:
+        package = timing.module.split(".", 1)[0]
+        totals[package] = totals.get(package, 0) + timing.self_us
+    return totals
+
+
+def eager_imports(timings: List[ImportTiming], modules: Sequence[str]) -> List[str]:
+    """Those of `modules` (top-level names) that the measured import loaded."""
+    imported = {timing.module.split(".", 1)[0] for timing in timings}
+    return [module for module in modules if module in imported]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget report for the plant-search API.")
+    parser.add_argument("--module", default="api.main", help="Module to import (default: api.main)")
+    parser.add_argument("--top", type=int, default=20, help="Packages to list (default: 20)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail when the import takes longer")
+    parser.add_argument(
+        "--deferred",
+        nargs="*",
+        default=list(DEFERRED_MODULES),
+        help="Modules that must not be imported (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    timings = measure(args.module)
+    total_us = sum(timing.self_us for timing in timings)
+    packages = sorted(by_top_level_package(timings).items(), key=lambda item: item[1], reverse=True)
+
+    print(f"[IMPORTS] import {args.module}: {total_us / 1000:.1f} ms across {len(timings)} modules")
+    print(f"{'package':<28}{'ms':>10}{'share':>9}")
+    for package, self_us in packages[: args.top]:
+        print(f"{package:<28}{self_us / 1000:>10.1f}{self_us / max(total_us, 1):>9.1%}")
+
+    status = 0
+    eager = eager_imports(timings, args.deferred)
+    if eager:
+        print(f"[IMPORTS] imported eagerly: {', '.join(eager)}")
+        status = 1
+    if args.budget_ms is not None and total_us / 1000 > args.budget_ms:
+        print(f"[IMPORTS] over budget: {total_us / 1000:.1f} ms > {args.budget_ms:.0f} ms")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+"""Structured logging through a background queue, plus sampling for hot events.
+
+`configure_logging()` installs a `QueueHandler` on the root logger; a
+`QueueListener` thread formats records and writes them out, so request
+threads only enqueue. Configuration comes from the environment:
+
+    LOG_LEVEL   root level (default INFO)
+    LOG_FORMAT  `json` (one object per line, default) or `text`
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+# Attributes every LogRecord has; anything else was passed through `extra`.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+_LAZY_ARG_TYPES = (str, int, float, bool, type(None))
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread.
+
+    The stock handler formats in `prepare()`, i.e. on the request thread.
+    Records whose arguments are immutable scalars are queued as they are;
+    anything else is rendered now, before the caller can mutate it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(arg, _LAZY_ARG_TYPES) for arg in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging() -> None:
+    """Route the root logger (and uvicorn's loggers) through a background queue. Idempotent."""
+    global _listener
+    if _listener is not None:
+        return
+
+    level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").strip().upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+
+    output = logging.StreamHandler(sys.stderr)
+    if os.getenv("LOG_FORMAT", "json").strip().lower() == "text":
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    else:
+        output.setFormatter(JsonFormatter())
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _DeferredQueueHandler(log_queue)
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        if uvicorn_logger.handlers:
+            uvicorn_logger.handlers = [handler]
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class SampledLog:
+    """Emit one in every `every` occurrences of an event, counted per event name.
+
+    The level check comes first, so a disabled level costs nothing. Counts are
+    not locked; under concurrency a sample may occasionally shift by one.
+    """
+
+    def __init__(self, logger: logging.Logger, every: int) -> None:
+        self.logger = logger
+        self.every = max(1, every)
+        self._counts: Dict[str, int] = {}
+
+    def log(self, level: int, event: str, msg: str, **fields: Any) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        if self.every > 1:
+            count = self._counts.get(event, 0) + 1
+            self._counts[event] = count
+            if count % self.every != 1:
+                return
+        self.logger.log(level, msg, extra={"event": event, "sample_every": self.every, **fields})
+
+    def info(self, event: str, msg: str, **fields: Any) -> None:
+        self.log(logging.INFO, event, msg, **fields)
@@ -0,0 +1,64 @@
+"""ASGI middleware that times requests, exports spans and adds `Server-Timing`."""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Any, Dict
+
+from .metrics import REQUEST_SECONDS, STAGE_SECONDS
+from .timing import RequestTimings, activate, deactivate
+
+
+def _route_label(scope: Dict[str, Any]) -> str:
+    # Label by route template, never by raw path, to keep series bounded.
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    endpoint = scope.get("endpoint")
+    return getattr(endpoint, "__name__", None) or "unmatched"
+
+
+class TimingMiddleware:
+    def __init__(self, app: Any, server_timing: bool = True) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = activate(timings)
+        started = perf_counter()
+        response_started_at = None
+        status_code = 500
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            nonlocal response_started_at, status_code
+            if message["type"] == "http.response.start":
+                response_started_at = perf_counter()
+                status_code = message["status"]
+                if self.server_timing:
+                    header = timings.server_timing(response_started_at - started)
+                    message = {
+                        **message,
+                        "headers": [
+                            *message.get("headers", []),
+                            (b"server-timing", header.encode("latin-1")),
+                            # Lets cross-origin pages (the Next.js app) read the timings.
+                            (b"timing-allow-origin", b"*"),
+                        ],
+                    }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            deactivate(token)
+            route = _route_label(scope)
+            elapsed = (response_started_at or perf_counter()) - started
+            REQUEST_SECONDS.observe(elapsed, route=route, method=scope["method"], status=str(status_code))
+            for stage, seconds in timings.stages.items():
+                STAGE_SECONDS.observe(seconds, route=route, stage=stage)
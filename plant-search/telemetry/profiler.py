@@ -0,0 +1,107 @@
+"""On-demand profiling of a live worker: stack sampling and allocation diffs.
+
+Both profilers run on a helper thread for a fixed duration while the worker
+keeps serving requests, and only one profile runs at a time per process.
+"""
+
+from __future__ import annotations
+
+import linecache
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List
+
+MAX_PROFILE_SECONDS = 60.0
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when another profile is already running in this process."""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _collapse(frame, thread_name: str) -> str:
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+def sample_stacks(seconds: float, interval: float = DEFAULT_SAMPLE_INTERVAL) -> Counter:
+    """Sample every thread's stack for `seconds`; returns collapsed stack -> sample count.
+
+    Python-level only: time spent in C code shows up under its calling frame.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("a profile is already running")
+    try:
+        own_id = threading.get_ident()
+        counts: Counter = Counter()
+        deadline = time.perf_counter() + min(seconds, MAX_PROFILE_SECONDS)
+        while time.perf_counter() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                counts[_collapse(frame, names.get(thread_id, f"thread-{thread_id}"))] += 1
+            time.sleep(interval)
+        return counts
+    finally:
+        _profile_lock.release()
+
+
+def format_collapsed(counts: Counter) -> str:
+    """Render samples in the collapsed format read by flamegraph.pl and speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+def allocation_diff(seconds: float, top: int = 25, frames: int = 1) -> Dict[str, Any]:
+    """Compare tracemalloc snapshots taken `seconds` apart and report the top-N sites.
+
+    The diff shows memory still held at the end of the window; `peak_bytes`
+    also covers short-lived allocations such as per-request score dicts.
+    Tracing is started for the duration only, unless it was already running.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("a profile is already running")
+    started_here = not tracemalloc.is_tracing()
+    try:
+        if started_here:
+            tracemalloc.start(max(1, frames))
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        time.sleep(min(seconds, MAX_PROFILE_SECONDS))
+        after = tracemalloc.take_snapshot()
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+        _profile_lock.release()
+
+    key_type = "traceback" if frames > 1 else "lineno"
+    ignored = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, linecache.__file__)]
+    stats = after.filter_traces(ignored).compare_to(before.filter_traces(ignored), key_type)
+    top_stats = [
+        {
+            "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "source": linecache.getline(stat.traceback[0].filename, stat.traceback[0].lineno).strip(),
+            "size_diff": stat.size_diff,
+            "size": stat.size,
+            "count_diff": stat.count_diff,
+            "count": stat.count,
+        }
+        for stat in stats[: max(1, top)]
+    ]
+    return {"current_bytes": current_bytes, "peak_bytes": peak_bytes, "top": top_stats}
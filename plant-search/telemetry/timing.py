@@ -0,0 +1,83 @@
+"""Per-request span timings carried in a context variable.
+
+The timing middleware activates a `RequestTimings` for each HTTP request;
+`span`/`timed` add elapsed time to it under a stage name. Outside a request
+(CLI tools, startup loading) they cost one context-variable lookup and
+record nothing.
+"""
+
+from __future__ import annotations
+
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from time import perf_counter
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+
+class RequestTimings:
+    __slots__ = ("stages",)
+
+    def __init__(self) -> None:
+        # Insertion order is the order stages first ran in.
+        self.stages: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Render a `Server-Timing` header value (durations in milliseconds)."""
+        entries = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in self.stages.items()]
+        entries.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("plant_search_request_timings", default=None)
+
+
+def activate(timings: RequestTimings) -> Token:
+    return _current.set(timings)
+
+
+def deactivate(token: Token) -> None:
+    _current.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def record(stage: str, seconds: float) -> None:
+    """Add an externally measured duration, e.g. one summed over a hot loop."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(stage, perf_counter() - started)
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """Decorator form of `span` for functions with several return paths."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator